@@ -1,12 +1,18 @@
 import tkinter as tk
 from tkinter import messagebox, ttk, filedialog
-from PIL import Image, ImageTk
+from PIL import ImageTk
 from fhe_art_engine import FHEArtGenerator
+from progress_compositor import ProgressCompositor
+from frame_pipeline import FramePipeline
+from render_farm import RenderFarm
 import random
 import threading
 import time
 import os
 
+# Sanat görüntüsünün pencere içindeki boyutu; kompozitör doğrudan bu boyutta çizer
+DISPLAY_SIZE = (600, 600)
+
 class FHEArtApp:
     def __init__(self, root):
         self.root = root
@@ -18,8 +24,14 @@ class FHEArtApp:
         self.center_window()
         
         # Ana değişkenler
-        self.art_generator = FHEArtGenerator()
+        # pyplot iş parçacığı güvenli değil; çizim tek bir ısınmış worker sürecinde
+        self.render_farm = RenderFarm(workers=1).start(wait=False)
+        self.art_generator = FHEArtGenerator(render_farm=self.render_farm)
         self.encrypted_pieces = []
+        self.compositor = None
+        self.art_photo = None
+        # Kareler ayrı bir iş parçacığında çizilir, root.after ile geri gelir
+        self.frame_pipeline = FramePipeline(self._post_frame, DISPLAY_SIZE)
         self.revealed_count = 0
         self.total_pieces = 16
         self.current_theme = "space"
@@ -294,26 +306,41 @@ class FHEArtApp:
             messagebox.showerror("Hata", f"Sanat oluşturulurken hata: {str(e)}")
     
     def _generate_art_thread(self):
-        """Sanat oluşturma thread'i"""
+        """Sanat oluşturma thread'i
+        
+        Yeni durum yerel değişkenlerde kurulur; uygulama durumu yalnızca ana
+        thread'de, _update_ui_after_generation içinde tek adımda değiştirilir.
+        """
         try:
+            theme = self.current_theme
+            
             # Yeni encryption key
             self.art_generator.reset_encryption()
             
-            # Sanat oluştur
-            art_path = self.art_generator.generate_base_art(self.current_theme)
+            # Sanat oluştur (bellekte)
+            art_img = self.art_generator.render_base_art(theme)
             
             # Parçalara ayır
-            self.encrypted_pieces = self.art_generator.encrypt_art_pieces(art_path)
-            self.revealed_count = 0
+            encrypted_pieces = self.art_generator.encrypt_art_pieces(art_img)
+            compositor = ProgressCompositor(self.art_generator, encrypted_pieces,
+                                            size=DISPLAY_SIZE)
             
             # UI'yi güncelle (ana thread'de)
-            self.root.after(0, self._update_ui_after_generation)
+            self.root.after(0, lambda: self._update_ui_after_generation(encrypted_pieces, compositor))
             
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Hata", str(e)))
+            # Render farm zaman aşımı ya da ısınma hatası dahil; yükleniyor mesajı kalmasın
+            message = str(e) or type(e).__name__
+            self.root.after(0, lambda: self._show_generation_error(message))
     
-    def _update_ui_after_generation(self):
-        """Sanat oluşturulduktan sonra UI'yi güncelle"""
+    def _update_ui_after_generation(self, encrypted_pieces, compositor):
+        """Sanat oluşturulduktan sonra durumu kur ve UI'yi güncelle"""
+        self.animation_active = False
+        self.encrypted_pieces = encrypted_pieces
+        self.compositor = compositor
+        self.total_pieces = len(encrypted_pieces)
+        self.revealed_count = 0
+        
         self.update_art_display()
         self.update_progress()
         self.update_stats()
@@ -324,6 +351,10 @@ class FHEArtApp:
                            f"🎨 {self.current_theme.capitalize()} temalı sanat eseri oluşturuldu!\n"
                            f"🔐 {self.total_pieces} parça FHE ile şifrelendi.")
     
+    def _show_generation_error(self, message):
+        self.update_fhe_info(f"❌ Sanat oluşturulamadı:\n{message}")
+        messagebox.showerror("Hata", message)
+    
     def show_loading(self, message):
         """Loading mesajı göster"""
         self.update_fhe_info(f"⏳ {message}\nLütfen bekleyin...")
@@ -336,12 +367,11 @@ class FHEArtApp:
                                "Yeni bir sanat eseri oluşturabilirsiniz.")
             return
         
-        # Şifresi çözülmemiş parçaları bul
-        hidden_pieces = [i for i, p in enumerate(self.encrypted_pieces) 
-                        if not p['is_revealed']]
+        # Şifresi çözülmemiş rastgele bir parça seç
+        piece_index = (self.encrypted_pieces.random_hidden()
+                       if self.encrypted_pieces else None)
         
-        if hidden_pieces:
-            piece_index = random.choice(hidden_pieces)
+        if piece_index is not None:
             success = self.art_generator.reveal_piece(self.encrypted_pieces, piece_index)
             
             if success:
@@ -420,20 +450,43 @@ class FHEArtApp:
         messagebox.showinfo("Görev Tamamlandı!", completion_text)
     
     def update_art_display(self):
-        """Sanat eserini güncelle"""
-        if not self.encrypted_pieces:
-            return
-            
+        """Sanat eserinin yeniden çizilmesini iste
+        
+        Çizim kare iş parçacığında yapılır; art arda gelen istekler tek kareye
+        katlanır ve kare _apply_frame ile ana thread'de uygulanır.
+        """
+        if self.compositor is not None:
+            self.frame_pipeline.notify(self.compositor)
+    
+    def _post_frame(self, compositor, box, region):
+        """Kare iş parçacığından gelen kareyi ana thread'e aktar"""
+        try:
+            self.root.after(0, lambda: self._apply_frame(compositor, box, region))
+        except (RuntimeError, tk.TclError):
+            # Pencere kapanmış
+            self.frame_pipeline.close()
+    
+    def _apply_frame(self, compositor, box, region):
+        """Çizilmiş bölgeyi tek PhotoImage'a kopyala (ana thread)"""
         try:
-            progress_img = self.art_generator.generate_progress_image(self.encrypted_pieces)
-            # Görüntüyü uygun boyuta getir
-            display_size = (600, 600)
-            progress_img = progress_img.resize(display_size, Image.Resampling.LANCZOS)
+            # Bu arada yeni sanat kurulduysa eski kompozitörün karesi atılır
+            if compositor is not self.compositor:
+                return
             
-            self.art_photo = ImageTk.PhotoImage(progress_img)
-            self.art_label.configure(image=self.art_photo)
+            if self.art_photo is None:
+                self.art_photo = ImageTk.PhotoImage(region)
+                self.art_label.configure(image=self.art_photo)
+            elif box == (0, 0) + DISPLAY_SIZE:
+                self.art_photo.paste(region)
+            else:
+                # Değişen bölge küçük bir Tk görüntüsüne aktarılıp yerine kopyalanır
+                region_photo = ImageTk.PhotoImage(region)
+                self.root.tk.call(str(self.art_photo), 'copy', str(region_photo),
+                                  '-to', box[0], box[1])
         except Exception as e:
             print(f"Görüntü güncellenirken hata: {e}")
+        finally:
+            self.frame_pipeline.frame_applied()
     
     def update_progress(self):
         """İlerlemeyi güncelle"""
@@ -488,7 +541,7 @@ class FHEArtApp:
             )
             
             if file_path:
-                progress_img = self.art_generator.generate_progress_image(self.encrypted_pieces, (1200, 1200))
+                progress_img = self.compositor.render((1200, 1200))
                 progress_img.save(file_path, quality=95)
                 
                 messagebox.showinfo("Başarılı", 
@@ -515,6 +568,7 @@ def main():
         # Pencere kapatma event'i
         def on_closing():
             if messagebox.askokcancel("Çıkış", "Uygulamadan çıkmak istediğinizden emin misiniz?"):
+                app.frame_pipeline.close()
                 root.destroy()
         
         root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -0,0 +1,201 @@
+"""
+Oluşturulmuş temel sanat eserleri için içerik adresli önbellek.
+
+Anahtar (tema, arka uç, çözünürlük, tohum) bilgisinden türetilir. Bellekte
+bayt bütçeli bir LRU tutulur; istenirse ikinci katman olarak diske yazılır.
+Rastgele temaların tohumlu çizimleri tek seferliktir (yalnızca session geri
+yüklenirken yeniden okunur); ana LRU'yu ve diski doldurmasınlar diye ayrı,
+küçük bir bellek katmanında tutulur.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from PIL import Image
+
+
+class ArtCache:
+    """Bayt bütçeli LRU + opsiyonel disk katmanı"""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, disk_dir=None,
+                 disk_max_bytes=None, one_off_max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self.one_off_max_bytes = one_off_max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._one_off = OrderedDict()
+        self._one_off_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(theme, backend, size, seed=None):
+        """(tema, arka uç, boyut, tohum) için içerik adresli anahtar"""
+        width, height = size
+        raw = f"{theme}|{backend}|{width}x{height}|{seed}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _image_bytes(img):
+        return img.width * img.height * len(img.getbands())
+
+    def get(self, key, one_off=False):
+        """Önbellekten al; yoksa None. Dönen görüntü paylaşılır, değiştirilmemeli.
+
+        one_off=True tohumlu tek seferlik çizimler içindir: yalnızca küçük
+        katmanda aranır, diske bakılmaz.
+        """
+        entries = self._one_off if one_off else self._entries
+        with self._lock:
+            img = entries.get(key)
+            if img is not None:
+                entries.move_to_end(key)
+                self.hits += 1
+                return img
+            if one_off:
+                self.misses += 1
+                return None
+
+        img = self._read_disk(key)
+        with self._lock:
+            if img is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._insert(key, img)
+        return img
+
+    def put(self, key, img, one_off=False):
+        if one_off:
+            with self._lock:
+                self._insert_one_off(key, img)
+            return
+        with self._lock:
+            self._insert(key, img)
+        self._write_disk(key, img)
+
+    def get_or_render(self, key, render, one_off=False):
+        img = self.get(key, one_off)
+        if img is None:
+            img = render()
+            self.put(key, img, one_off)
+        return img
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self._one_off.clear()
+            self._one_off_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'one_off_entries': len(self._one_off),
+                'one_off_bytes': self._one_off_bytes,
+                'hit_rate': (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                'disk_dir': self.disk_dir,
+            }
+
+    def _insert(self, key, img):
+        size = self._image_bytes(img)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._bytes -= self._image_bytes(self._entries.pop(key))
+        self._entries[key] = img
+        self._bytes += size
+
+        # En eski kullanılanları bütçeye sığana kadar çıkar
+        while self._bytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= self._image_bytes(old)
+            self.evictions += 1
+
+    def _insert_one_off(self, key, img):
+        # Çıkarılan tohumlu çizim gerekirse aynı tohumla yeniden çizilir
+        size = self._image_bytes(img)
+        if size > self.one_off_max_bytes:
+            return
+        if key in self._one_off:
+            self._one_off_bytes -= self._image_bytes(self._one_off.pop(key))
+        self._one_off[key] = img
+        self._one_off_bytes += size
+        while self._one_off_bytes > self.one_off_max_bytes:
+            _, old = self._one_off.popitem(last=False)
+            self._one_off_bytes -= self._image_bytes(old)
+            self.evictions += 1
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f"{key}.png")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with Image.open(path) as img:
+                img.load()
+                os.utime(path)
+                return img.copy()
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key, img):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+        # Yarım yazılmış dosya okunmasın diye önce geçici dosyaya yaz
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            img.save(tmp_path, format='PNG', compress_level=1)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self._trim_disk()
+
+    def _trim_disk(self):
+        if not self.disk_max_bytes:
+            return
+        files = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith('.png'):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
@@ -0,0 +1,567 @@
+"""
+FHE Sanat web uygulamasının ASGI sürümü.
+
+web_art_generator ile aynı /api/* uçlarını, aynı session deposu ve
+yardımcılarla sunar. Sanat üretimi, şifreleme ve tüm PNG/WebP kodlamaları
+(tam kare ve parça deltaları) bir süreç havuzunda çalışır. Session kilidi
+altında yalnızca parça açma ve kompozitörün artımlı kare güncellemesi
+iş parçacıklarında yapılır; böylece ağır üretimler sıradayken istatistik,
+sıfırlama ve indirme istekleri olay döngüsünü bekletmez. Üretilen tuval ve
+şifreli parçalar worker'dan pickle ile değil, paylaşımlı bellek halkasındaki
+bir yuva üzerinden alınır; session'a kurulurken tek kopyayla yuvadan çıkarılır.
+
+Çalıştırma: uvicorn asgi_app:app
+Birden fazla worker (--workers N) yalnızca paylaşılan bir session arka ucuyla
+çalışır; varsayılan memory:// her worker'a ayrı session verir:
+    FHE_SESSION_BACKEND=sqlite:///sessions.db uvicorn asgi_app:app --workers 4
+"""
+
+import asyncio
+import contextlib
+import json
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from starlette.applications import Starlette
+from starlette.responses import HTMLResponse, JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+import image_encoder
+import render_jobs
+import web_art_generator as web
+from fhe_art_engine import FHEArtGenerator, encrypt_pixels, sprite_cache_stats
+from generation_queue import QueueFull
+from fhe_raster import BASE_ART_SIZE
+from piece_set import PieceSet
+from shm_ring import SharedRing
+
+# CPU işleri için süreç sayısı (0 -> çekirdek sayısı)
+CPU_WORKERS = int(os.environ.get('FHE_CPU_WORKERS', '0')) or os.cpu_count()
+
+# Tuval + şifreli parçalar için paylaşımlı bellek yuvası sayısı (0 -> pickle ile taşı);
+# yuva yalnızca aktarım süresince tutulur, aynı anda süren üretim sayısını karşılamalı
+SHM_RING_SLOTS = int(os.environ.get('FHE_SHM_RING_SLOTS', '4'))
+SHM_SLOT_BYTES = 2 * BASE_ART_SIZE * BASE_ART_SIZE * 3
+
+_pool = None
+_ring = None
+_warm_up_task = None
+# Sanat önbelleği worker başınadır; her işin döndürdüğü son sayaçlar pid'e göre
+_worker_caches = {}
+# Havuz kurulup worker'lar ısındığında kurulur; /api/ready bunu raporlar
+server_ready = asyncio.Event()
+warm_up_error = None
+
+
+def cpu_pool():
+    """Süreç havuzunu ilk kullanımda kur"""
+    global _pool
+    if _pool is None:
+        # fork, olay döngüsü ve janitor iş parçacıkları varken güvenli değil
+        _pool = ProcessPoolExecutor(max_workers=CPU_WORKERS,
+                                    mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+
+
+async def run_cpu(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(cpu_pool(), fn, *args)
+
+
+def shm_ring():
+    """Paylaşımlı bellek halkasını ilk kullanımda kur (kapalıysa None)"""
+    global _ring
+    if _ring is None and SHM_RING_SLOTS > 0:
+        _ring = SharedRing(SHM_RING_SLOTS, SHM_SLOT_BYTES)
+    return _ring
+
+
+def note_cache_report(report):
+    """Worker'ın döndürdüğü (pid, stats) önbellek raporunu sakla"""
+    pid, stats = report
+    _worker_caches[pid] = stats
+
+
+def worker_cache_stats():
+    """Havuzdaki worker önbelleklerinin toplam sayaçları"""
+    totals = {'workers': len(_worker_caches), 'entries': 0, 'bytes': 0, 'max_bytes': 0,
+              'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0,
+              'one_off_entries': 0, 'one_off_bytes': 0}
+    for stats in _worker_caches.values():
+        for name in totals:
+            if name != 'workers':
+                totals[name] += stats[name]
+    lookups = totals['hits'] + totals['disk_hits'] + totals['misses']
+    totals['hit_rate'] = (totals['hits'] + totals['disk_hits']) / lookups if lookups else 0.0
+    totals['disk_dir'] = web.art_cache.disk_dir
+    return totals
+
+
+async def encode_frame(img, fmt, profile):
+    """Kareyi süreç havuzunda kodla; süre/boyut sayaçları bu süreçte tutulur"""
+    data, seconds = await run_cpu(render_jobs.encode_image, img, fmt, profile)
+    image_encoder.record(profile, fmt, seconds, len(data), img.width * img.height)
+    return data
+
+
+def keep_image(img):
+    """reveal yanıtlarında görüntüyü kodlamadan bırak (encode_images havuzda kodlar)"""
+    return img
+
+
+async def encode_images(response):
+    """reveal yanıtındaki görüntüleri süreç havuzunda PNG data URI'sine çevir"""
+    targets = [response] if response.get('image') is not None else []
+    if 'delta' in response:
+        targets.append(response['delta'])
+    targets.extend(response.get('deltas', ()))
+    encoded = await asyncio.gather(*(encode_frame(target['image'], 'png', 'interactive')
+                                     for target in targets))
+    for target, data in zip(targets, encoded):
+        target['image'] = image_encoder.data_uri(data, 'png')
+    return response
+
+
+async def render_art(theme, seed, grid, key, backend):
+    """Sanatı süreç havuzunda çiz ve şifrele; (temel dizi, şifreli dizi) döndür
+
+    Boş yuva varsa worker sonuçları yuvaya yazar; buradan session'a ait dizilere
+    bir kez kopyalanır ve yuva hemen bırakılır. Session yuvayı ömrü boyunca
+    tutsaydı halka ilk birkaç session'dan sonra tükenirdi. Halka dolu ya da
+    kapalıysa sonuçlar pickle ile taşınır (ring.misses).
+    """
+    ring = shm_ring()
+    slot = ring.acquire() if ring else None
+    if slot is None:
+        base, encrypted, report = await run_cpu(render_jobs.render_pieces, theme, seed,
+                                                grid, key, backend)
+        note_cache_report(report)
+        return base, encrypted
+
+    try:
+        kind, base, encrypted, report = await run_cpu(render_jobs.render_pieces_shared, theme,
+                                                      seed, grid, key, backend, slot.address,
+                                                      slot.capacity)
+        note_cache_report(report)
+        if kind == 'shared':
+            base_shape, encrypted_shape = base, encrypted
+            base = slot.ndarray(base_shape).copy()
+            encrypted = slot.ndarray(encrypted_shape, offset=base.nbytes).copy()
+        return base, encrypted
+    finally:
+        slot.release()
+
+
+def get_session_id(request):
+    return request.headers.get('X-Session-ID', 'default-session')
+
+
+def error_response(message, status_code=500):
+    return JSONResponse({'success': False, 'error': message}, status_code=status_code)
+
+
+def etag_matches(header, etag):
+    """If-None-Match başlığı verilen güçlü ETag'i içeriyor mu"""
+    if not header:
+        return False
+    tags = [tag.strip() for tag in header.split(',')]
+    return '*' in tags or f'"{etag}"' in tags
+
+
+async def index(request):
+    """Ana sayfa"""
+    with open(os.path.join('templates', 'art_gallery.html'), encoding='utf-8') as f:
+        return HTMLResponse(f.read())
+
+
+async def generate_art(request):
+    """Yeni sanat eseri oluştur (çizim + şifreleme süreç havuzunda)"""
+    try:
+        session_id = get_session_id(request)
+        data = await request.json()
+        theme = data.get('theme', 'zama_classic')
+
+        grid = web.parse_grid(data.get('grid', 4))
+        if grid is None:
+            return error_response(f'Izgara 1-{web.MAX_GRID} aralığında olmalı!', 400)
+
+        session = await asyncio.to_thread(web.sessions.get_or_create, session_id)
+        art_gen = session.generator
+        # Anahtar session kilidi altında, eserle birlikte kurulur
+        key = art_gen.new_encryption_key()
+        backend = art_gen.render_backend
+
+        async def render():
+            seed = web.draw_seed(theme)
+            base, encrypted = await render_art(theme, seed, grid, key, backend)
+            return base, encrypted, seed, key, grid
+
+        # Aynı eserin uçuştaki üretimi (rastgele temalarda tohumuyla) paylaşılır;
+        # takipçi yalnızca kendi anahtarıyla yeniden şifreler
+        base, encrypted, seed, leader_key, leader_grid = await web.generation_queue.run_async(
+            web.generation_key(theme, backend), render)
+        if (leader_key, leader_grid) != (key, grid):
+            encrypted = await asyncio.to_thread(
+                encrypt_pixels, FHEArtGenerator.split_tiles(base, *grid), key)
+
+        def install():
+            pieces = PieceSet(FHEArtGenerator.split_tiles(base, *grid), encrypted)
+            with session.lock:
+                art_gen.reset_encryption(key)
+                response = web.install_art(session_id, session, theme, seed, grid, pieces, key)
+                frame = session.data['compositor'].render() if data.get('mode') != 'url' else None
+            web.sessions.touch(session)
+            return response, frame
+
+        response, frame = await asyncio.to_thread(install)
+        if frame is not None:
+            response['image'] = image_encoder.data_uri(
+                await encode_frame(frame, 'png', 'interactive'))
+        return JSONResponse(response)
+
+    except QueueFull as e:
+        return JSONResponse({
+            'success': False,
+            'error': f'Sunucu yoğun, {e.retry_after} saniye sonra tekrar deneyin!',
+            'retry_after': e.retry_after
+        }, status_code=429, headers={'Retry-After': str(e.retry_after)})
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def reveal_piece(request):
+    """Rastgele bir parça çöz"""
+    try:
+        data = await _json_body(request)
+        payload, status = await asyncio.to_thread(web.reveal_piece_payload,
+                                                  get_session_id(request), data, keep_image)
+        return JSONResponse(await encode_images(payload), status_code=status)
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def reveal_multiple(request):
+    """Birden fazla parçayı tek adımda çöz ve tek kare çiz"""
+    try:
+        data = await _json_body(request)
+        payload, status = await asyncio.to_thread(web.reveal_multiple_payload,
+                                                  get_session_id(request), data, keep_image)
+        return JSONResponse(await encode_images(payload), status_code=status)
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def get_image(request):
+    """Kareyi ham PNG/WebP baytları olarak sun; kodlama süreç havuzunda"""
+    session_id = request.path_params['session_id']
+    version = request.path_params['version']
+
+    # ?format= yoksa biçim Accept başlığından seçilir
+    fmt = image_encoder.negotiate(request.headers.get('accept'),
+                                  request.query_params.get('format'))
+    try:
+        size = int(request.query_params.get('size', web.FRAME_SIZE))
+    except ValueError:
+        size = None
+    error = web.frame_args_error(fmt, size)
+    if error:
+        explicit = fmt or 'format' in request.query_params
+        return JSONResponse(error, status_code=400 if explicit else 406)
+
+    session = await asyncio.to_thread(web.sessions.get, session_id)
+    if session is None:
+        return error_response('Aktif session bulunamadı!', 404)
+
+    etag = web.frame_etag(session.data, version, size, fmt)
+    headers = {'ETag': f'"{etag}"', 'Cache-Control': 'private, no-cache', 'Vary': 'Accept'}
+    if etag_matches(request.headers.get('if-none-match'), etag):
+        return Response(status_code=304, headers=headers)
+
+    def lookup():
+        with session.lock:
+            session_info = session.data
+            data = session_info['encoded_frames'].get(etag)
+            if data is not None or version != session_info['version']:
+                return data, None, web.image_url(session_id, session_info)
+            return None, session_info['compositor'].render((size, size)), None
+
+    data, frame, current_url = await asyncio.to_thread(lookup)
+    if data is None and frame is None:
+        return JSONResponse({
+            'success': False,
+            'error': 'Bu sürüm artık mevcut değil!',
+            'image_url': current_url
+        }, status_code=404)
+
+    if data is None:
+        started = time.perf_counter()
+        data = await encode_frame(frame, fmt, 'interactive')
+        headers['Server-Timing'] = f'frame;dur={(time.perf_counter() - started) * 1000:.1f}'
+
+        def store():
+            with session.lock:
+                web.store_encoded_frame(session.data, etag, data)
+            web.sessions.touch(session)
+
+        await asyncio.to_thread(store)
+
+    return Response(data, media_type=web.IMAGE_FORMATS[fmt], headers=headers)
+
+
+async def reveal_stream(request):
+    """Otomatik çözme: SSE akışı; bekleme olay döngüsünde, iş parçacığı tutmadan"""
+    session_id = request.path_params['session_id']
+    if await asyncio.to_thread(web.sessions.get, session_id) is None:
+        return error_response('Aktif session bulunamadı!', 404)
+
+    params = request.query_params
+    try:
+        interval = float(params.get('interval', 3.0))
+        batch = int(params.get('batch', 1))
+        client_version = int(params['version']) if 'version' in params else None
+    except ValueError:
+        return error_response('Geçersiz akış parametresi!', 400)
+    # nan sınırlamadan geçer (karşılaştırmalar False döner)
+    if not math.isfinite(interval):
+        return error_response('Geçersiz akış parametresi!', 400)
+    interval = min(max(interval, web.STREAM_MIN_INTERVAL), web.STREAM_MAX_INTERVAL)
+    batch = min(max(batch, 1), web.MAX_DELTA_TILES)
+
+    def tick(version):
+        session = web.sessions.get(session_id)
+        if session is None:
+            return None, 'session_closed'
+        with session.lock:
+            encrypted_pieces = session.data['encrypted_pieces']
+            if not len(encrypted_pieces) or encrypted_pieces.is_complete:
+                return None, 'completed'
+            response = web.reveal_batch(session_id, session, batch, 'delta', version,
+                                        keep_image)
+        web.sessions.touch(session)
+        return response, None if response else 'completed'
+
+    async def stream():
+        version = client_version
+        yield f"retry: {int(interval * 1000)}\n\n"
+        while True:
+            # Geri basınç: bir sonraki tik önceki olay yazıldıktan sonra planlanır
+            next_tick = time.monotonic() + interval
+            while (wait := next_tick - time.monotonic()) > 0:
+                await asyncio.sleep(min(wait, web.STREAM_HEARTBEAT))
+                if next_tick > time.monotonic():
+                    yield ": keep-alive\n\n"
+
+            response, reason = await asyncio.to_thread(tick, version)
+            if response is None:
+                yield web.sse_event('end', {'reason': reason})
+                return
+            version = response['version']
+            yield web.sse_event('reveal', await encode_images(response))
+            if response['completed']:
+                yield web.sse_event('end', {'reason': 'completed'})
+                return
+
+    return StreamingResponse(stream(), media_type='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
+
+async def get_stats(request):
+    """Mevcut istatistikleri al"""
+    def read_stats():
+        session = web.sessions.get(get_session_id(request))
+        if session is None:
+            return None
+        with session.lock:
+            return dict(session.data['stats'])
+
+    stats = await asyncio.to_thread(read_stats)
+    if stats is None:
+        return JSONResponse({'success': False, 'error': 'Aktif session bulunamadı!'})
+    return JSONResponse({'success': True, 'stats': stats})
+
+
+async def cache_stats(request):
+    """Sanat önbelleği isabet/ıska sayaçları (havuz worker'larının toplamı)"""
+    return JSONResponse({
+        'success': True,
+        'cache': worker_cache_stats(),
+        'shm_ring': _ring.stats() if _ring else None,
+        'generation': web.generation_queue.stats(),
+        'sprites': sprite_cache_stats()
+    })
+
+
+async def encoder_stats(request):
+    """Profil/biçim başına kodlama süresi ve çıktı boyutu"""
+    return JSONResponse({'success': True, 'encoders': image_encoder.stats()})
+
+
+async def session_stats(request):
+    """Canlı session sayısı, tutulan bayt ve tahliye sayaçları"""
+    return JSONResponse({'success': True, 'sessions': web.sessions.stats()})
+
+
+async def download_art(request):
+    """Sanat eserini bellekten indir (kodlama süreç havuzunda, sonuç session'da saklanır)"""
+    try:
+        session = await asyncio.to_thread(web.sessions.get, get_session_id(request))
+        if session is None:
+            return error_response('Aktif session bulunamadı!', 400)
+
+        fmt = image_encoder.negotiate(request.headers.get('accept'),
+                                      request.query_params.get('format'))
+        try:
+            size = int(request.query_params.get('size', web.DOWNLOAD_SIZE))
+        except ValueError:
+            size = None
+        error = web.frame_args_error(fmt, size)
+        if error:
+            explicit = fmt or 'format' in request.query_params
+            return JSONResponse(error, status_code=400 if explicit else 406)
+
+        def lookup():
+            with session.lock:
+                session_info = session.data
+                stats = dict(session_info['stats'])
+                etag = web.frame_etag(session_info, session_info['version'], size, fmt, 'download')
+                data = session_info['encoded_frames'].get(etag)
+                frame = None
+                if data is None and not etag_matches(request.headers.get('if-none-match'), etag):
+                    frame = session_info['compositor'].render((size, size))
+            return stats, etag, data, frame
+
+        stats, etag, data, frame = await asyncio.to_thread(lookup)
+        headers = {
+            'ETag': f'"{etag}"',
+            'Cache-Control': 'private, no-cache',
+            'Vary': 'Accept',
+            'Content-Disposition': web.content_disposition(web.download_name(stats, fmt))
+        }
+        if etag_matches(request.headers.get('if-none-match'), etag):
+            return Response(status_code=304, headers=headers)
+
+        if data is None:
+            # İndirmeler hız yerine boyut için kodlanır
+            data = await encode_frame(frame, fmt, 'download')
+
+            def store():
+                with session.lock:
+                    web.store_encoded_frame(session.data, etag, data)
+                web.sessions.touch(session)
+
+            await asyncio.to_thread(store)
+
+        return Response(data, media_type=web.IMAGE_FORMATS[fmt], headers=headers)
+    except Exception as e:
+        return error_response(str(e))
+
+
+async def ready(request):
+    """Hazır olma yoklaması; havuz ısınana kadar 503 + Retry-After
+
+    Isınma başarısız olduysa 503 hatayla birlikte kalıcı olarak döner.
+    """
+    if warm_up_error is not None:
+        return JSONResponse({'success': False, 'ready': False, 'error': warm_up_error},
+                            status_code=503)
+    if not server_ready.is_set():
+        return JSONResponse({'success': False, 'ready': False}, status_code=503,
+                            headers={'Retry-After': '1'})
+    return JSONResponse({'success': True, 'ready': True})
+
+
+async def warm_up():
+    """Havuzu kur, her worker'a bir ısınma işi ver; bitince hazır ol
+
+    Başarısız ısınmada hazır olunmaz: hata warm_up_error'da kalır, __main__
+    ile başlatıldıysa süreç Flask sürümündeki gibi sıfır olmayan kodla kapanır.
+    """
+    global warm_up_error
+    started = time.monotonic()
+    port = os.environ.get('FHE_ANNOUNCE_READY')
+    try:
+        reports = await asyncio.gather(*(run_cpu(render_jobs.warm_up, web.WARMUP_THEMES)
+                                         for _ in range(CPU_WORKERS)))
+        for report in reports:
+            note_cache_report(report)
+    except Exception as e:
+        warm_up_error = str(e) or type(e).__name__
+        print(f"❌ Isınma başarısız: {warm_up_error}")
+        if port:
+            web.exit_after_failed_warm_up()
+        return
+    server_ready.set()
+
+    # __main__ ile başlatıldıysa launcher'ın beklediği hazır satırını yaz
+    if port:
+        await asyncio.to_thread(web.announce_listening, int(port), started)
+
+
+async def reset_session(request):
+    """Session'ı sıfırla"""
+    await asyncio.to_thread(web.sessions.remove, get_session_id(request))
+    return JSONResponse({'success': True, 'message': 'Session sıfırlandı!'})
+
+
+async def _json_body(request):
+    body = await request.body()
+    try:
+        return json.loads(body) if body else {}
+    except ValueError:
+        return {}
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    global _pool, _ring, _warm_up_task, warm_up_error
+    web.create_templates()
+    server_ready.clear()
+    warm_up_error = None
+    _warm_up_task = asyncio.create_task(warm_up())
+    yield
+    _warm_up_task.cancel()
+    _warm_up_task = None
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+        _worker_caches.clear()
+    if _ring is not None:
+        _ring.close()
+        _ring = None
+
+
+app = Starlette(
+    routes=[
+        Route('/', index),
+        Route('/api/generate_art', generate_art, methods=['POST']),
+        Route('/api/reveal_piece', reveal_piece, methods=['POST']),
+        Route('/api/image/{session_id}/{version:int}', get_image, methods=['GET']),
+        Route('/api/reveal_multiple', reveal_multiple, methods=['POST']),
+        Route('/api/reveal_stream/{session_id}', reveal_stream, methods=['GET']),
+        Route('/api/get_stats', get_stats, methods=['GET']),
+        Route('/api/cache_stats', cache_stats, methods=['GET']),
+        Route('/api/encoder_stats', encoder_stats, methods=['GET']),
+        Route('/api/session_stats', session_stats, methods=['GET']),
+        Route('/api/ready', ready, methods=['GET']),
+        Route('/api/download_art', download_art, methods=['GET']),
+        Route('/api/reset_session', reset_session, methods=['POST']),
+    ],
+    lifespan=lifespan,
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    print("🎨 FHE Sanat Web Uygulaması (ASGI) Başlatılıyor...")
+    port = int(os.environ.get('FHE_PORT', '8000'))
+    print(f"📱 Tarayıcınızda http://localhost:{port} adresini açın")
+    print(f"⚙️ CPU işleri {CPU_WORKERS} süreçte çalışacak")
+
+    # Isınma bitip sunucu yanıt verince FHE_READY satırı yazılır (demo_launcher ile aynı protokol)
+    os.environ['FHE_ANNOUNCE_READY'] = str(port)
+    uvicorn.run('asgi_app:app', host='0.0.0.0', port=port)
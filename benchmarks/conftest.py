@@ -0,0 +1,102 @@
+"""
+Benchmark paketi için ortak fixture'lar.
+
+Depo kökü import yoluna eklenir; modüller paket olarak kurulmadan import
+edilir. Temel sanat raster arka ucuyla ve sabit tohumla bir kez çizilir ki
+şifreleme/ilerleme ölçümleri çizim süresinden bağımsız olsun.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Web modülü import edilmeden önce: çizim istek iş parçacığında, önbellek bellekte
+os.environ.setdefault('FHE_RENDER_WORKERS', '0')
+os.environ.pop('FHE_ART_CACHE_DIR', None)
+
+from fhe_art_engine import FHEArtGenerator  # noqa: E402
+from fhe_raster import BASE_ART_SIZE  # noqa: E402
+
+
+@pytest.fixture
+def generator():
+    """Sabit anahtarlı, önbelleksiz generator"""
+    random.seed(0)
+    art_gen = FHEArtGenerator()
+    art_gen.encryption_key = 4242
+    return art_gen
+
+
+@pytest.fixture(scope='session')
+def base_art():
+    """BASE_ART_SIZE boyutunda, tohumlu tek temel sanat görüntüsü"""
+    return FHEArtGenerator().render_base_art('zama_classic', 'raster',
+                                             size=BASE_ART_SIZE, seed=0)
+
+
+class ArtSession:
+    """Test istemcisi üzerinden tek bir web session'ı sürer"""
+
+    def __init__(self, client, session_id, grid=16):
+        self.client = client
+        self.headers = {'X-Session-ID': session_id}
+        self.session_id = session_id
+        self.grid = grid
+        self.version = 0
+        self.revealed = 0
+        self.total = 0
+
+    def post(self, url, payload=None):
+        response = self.client.post(url, json=payload or {}, headers=self.headers)
+        assert response.status_code == 200, response.get_data(as_text=True)[:200]
+        return response.get_json()
+
+    def get(self, url, **kwargs):
+        response = self.client.get(url, headers={**self.headers, **kwargs.pop('headers', {})},
+                                   **kwargs)
+        assert response.status_code in (200, 304), response.get_data(as_text=True)[:200]
+        return response
+
+    def generate(self, theme='zama_classic', mode='url'):
+        data = self.post('/api/generate_art', {'theme': theme, 'grid': self.grid, 'mode': mode})
+        self.track(data)
+        return data
+
+    def track(self, data):
+        self.version = data.get('version', self.version)
+        self.revealed = data['stats']['revealed']
+        self.total = data['stats']['total']
+
+    def ensure_hidden(self, count=1):
+        """En az count gizli parça kalsın; yoksa yeni sanat oluştur"""
+        if self.total - self.revealed < count:
+            self.generate()
+
+    def reveal(self, mode='url'):
+        self.ensure_hidden()
+        data = self.post('/api/reveal_piece', {'mode': mode, 'version': self.version})
+        self.track(data)
+        return data
+
+
+@pytest.fixture(scope='session')
+def web_app():
+    import web_art_generator
+
+    web_art_generator.app.testing = True
+    return web_art_generator
+
+
+@pytest.fixture
+def art_session(web_app, request):
+    """Benchmark başına ayrı session; üretilmiş 16x16 sanatla başlar"""
+    session = ArtSession(web_app.app.test_client(), f"bench-{request.node.name}")
+    session.generate()
+    yield session
+    session.post('/api/reset_session')
@@ -0,0 +1,65 @@
+"""
+Sanat motorunun sıcak yolları: temel sanat çizimi, parçalama, piksel
+şifreleme ve ilerleme görüntüsü.
+"""
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from fhe_art_engine import RENDER_BACKENDS  # noqa: E402
+from fhe_raster import THEME_LIMITS  # noqa: E402
+
+GRIDS = (4, 16, 64, 256, (8, 12))
+IMAGE_SIZES = (64, 256, 1024, 1455)
+REVEALED_FRACTIONS = (0.0, 0.5, 1.0)
+
+
+@pytest.mark.benchmark(group='generate_base_art')
+@pytest.mark.parametrize('backend', RENDER_BACKENDS)
+@pytest.mark.parametrize('theme', sorted(THEME_LIMITS))
+def test_generate_base_art(benchmark, generator, tmp_path, theme, backend):
+    # Çizim + PNG kaydı; önbellek yok, her tur baştan çizer
+    output_path = str(tmp_path / 'base_art.png')
+    result = benchmark.pedantic(generator.generate_base_art, args=(theme, backend, output_path),
+                                rounds=3, iterations=1, warmup_rounds=1)
+    assert result == output_path
+
+
+@pytest.mark.benchmark(group='render_base_art')
+@pytest.mark.parametrize('backend', RENDER_BACKENDS)
+def test_render_base_art(benchmark, generator, backend):
+    # Web yolunun kullandığı bellek içi çizim (PNG'siz)
+    img = benchmark.pedantic(generator.render_base_art, args=('zama_classic', backend),
+                             rounds=3, iterations=1, warmup_rounds=1)
+    assert img.size[0] > 0
+
+
+@pytest.mark.benchmark(group='encrypt_art_pieces')
+@pytest.mark.parametrize('grid', GRIDS, ids=str)
+def test_encrypt_art_pieces(benchmark, generator, base_art, grid):
+    pieces = benchmark(generator.encrypt_art_pieces, base_art, grid)
+    rows, cols = grid if isinstance(grid, tuple) else (int(grid ** 0.5),) * 2
+    assert len(pieces) == rows * cols
+
+
+@pytest.mark.benchmark(group='encrypt_image_data')
+@pytest.mark.parametrize('size', IMAGE_SIZES)
+def test_encrypt_image_data(benchmark, generator, size):
+    pixels = np.random.default_rng(0).integers(0, 256, (size, size, 3), dtype=np.uint8)
+    encrypted = benchmark(generator._encrypt_image_data, pixels)
+    assert encrypted.shape == pixels.shape
+
+
+@pytest.mark.benchmark(group='generate_progress_image')
+@pytest.mark.parametrize('grid', (16, 256))
+@pytest.mark.parametrize('fraction', REVEALED_FRACTIONS, ids=lambda f: f"{f:.0%}")
+def test_generate_progress_image(benchmark, generator, base_art, grid, fraction):
+    pieces = generator.encrypt_art_pieces(base_art, grid)
+    mask = np.zeros(len(pieces), dtype=bool)
+    mask[np.random.default_rng(0).permutation(len(pieces))[:int(len(pieces) * fraction)]] = True
+    pieces.set_revealed(mask)
+
+    img = benchmark(generator.generate_progress_image, pieces, (800, 800))
+    assert img.size == (800, 800)
@@ -0,0 +1,92 @@
+"""
+Flask uç noktaları, test istemcisi üzerinden (ağ yığını olmadan).
+
+Her benchmark kendi session'ını kullanır. Zamanlanmayan hazırlık adımları
+(yeni sanat, parça açma) pedantic setup içinde yapılır.
+"""
+
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+from fhe_raster import THEME_LIMITS  # noqa: E402
+
+
+@pytest.mark.benchmark(group='http_generate_art')
+@pytest.mark.parametrize('mode', ('full', 'url'))
+@pytest.mark.parametrize('theme', sorted(THEME_LIMITS))
+def test_generate_art(benchmark, art_session, theme, mode):
+    # Deterministik temalar ilk turdan sonra sanat önbelleğinden gelir
+    data = benchmark.pedantic(art_session.generate, args=(theme, mode),
+                              rounds=5, iterations=1, warmup_rounds=1)
+    assert ('image' in data) == (mode == 'full')
+
+
+@pytest.mark.benchmark(group='http_reveal_piece')
+@pytest.mark.parametrize('mode', ('full', 'delta', 'url'))
+def test_reveal_piece(benchmark, art_session, mode):
+    def setup():
+        art_session.ensure_hidden()
+        return (mode,), {}
+
+    data = benchmark.pedantic(art_session.reveal, setup=setup, rounds=50, warmup_rounds=2)
+    assert data['success']
+    assert ('image' in data, 'delta' in data) == (mode == 'full', mode == 'delta')
+
+
+@pytest.mark.benchmark(group='http_reveal_multiple')
+@pytest.mark.parametrize('count', (5, 64))
+def test_reveal_multiple(benchmark, art_session, count):
+    def reveal():
+        data = art_session.post('/api/reveal_multiple', {'count': count, 'mode': 'url'})
+        art_session.track(data)
+        return data
+
+    def setup():
+        art_session.ensure_hidden(count)
+        return (), {}
+
+    data = benchmark.pedantic(reveal, setup=setup, rounds=20, warmup_rounds=1)
+    assert len(data['revealed_pieces']) == count
+
+
+@pytest.mark.benchmark(group='http_image')
+@pytest.mark.parametrize('fmt', ('png', 'webp'))
+@pytest.mark.parametrize('cached', (False, True), ids=('miss', 'hit'))
+def test_get_image(benchmark, art_session, fmt, cached):
+    # miss: her turdan önce bir parça açılır, kare yeni sürüm için kodlanır
+    def setup():
+        if not cached:
+            art_session.reveal()
+        return (f"/api/image/{art_session.session_id}/{art_session.version}",), \
+            {'query_string': {'format': fmt}}
+
+    response = benchmark.pedantic(art_session.get, setup=setup, rounds=20, warmup_rounds=1)
+    assert response.mimetype == f"image/{fmt}"
+
+
+@pytest.mark.benchmark(group='http_image')
+def test_get_image_not_modified(benchmark, art_session):
+    url = f"/api/image/{art_session.session_id}/{art_session.version}"
+    etag = art_session.get(url).headers['ETag']
+    response = benchmark(art_session.get, url, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+
+
+@pytest.mark.benchmark(group='http_download_art')
+@pytest.mark.parametrize('fmt', ('png', 'jpeg'))
+@pytest.mark.parametrize('cached', (False, True), ids=('miss', 'hit'))
+def test_download_art(benchmark, art_session, fmt, cached):
+    def setup():
+        if not cached:
+            art_session.reveal()
+        return ('/api/download_art',), {'query_string': {'format': fmt}}
+
+    response = benchmark.pedantic(art_session.get, setup=setup, rounds=5, warmup_rounds=1)
+    assert response.mimetype == f"image/{fmt}"
+
+
+@pytest.mark.benchmark(group='http_stats')
+def test_get_stats(benchmark, art_session):
+    response = benchmark(art_session.get, '/api/get_stats')
+    assert response.get_json()['success']
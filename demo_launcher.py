@@ -7,6 +7,7 @@ Zama Creator Program
 Hızlı demo için tüm-in-one launcher
 """
 
+import importlib.util
 import os
 import sys
 import subprocess
@@ -14,13 +15,22 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 import webbrowser
 import threading
-import time
+from collections import deque
+
+# web_art_generator.READY_MARKER ile aynı; sunucu dinleyip ısındığında bu satırı yazar
+WEB_READY_MARKER = 'FHE_READY'
+WEB_READY_TIMEOUT = 120
+WEB_LOG_LINES = 200
 
 class FHEArtLauncher:
     def __init__(self):
         self.root = tk.Tk()
         self.setup_ui()
         self.web_process = None
+        self.web_url = "http://localhost:5000"
+        self.web_ready = False
+        # Sunucu çıktısının son satırları (hata mesajında gösterilir)
+        self.web_log = deque(maxlen=WEB_LOG_LINES)
         
     def setup_ui(self):
         """Launcher arayüzü"""
@@ -134,18 +144,18 @@ class FHEArtLauncher:
         self.check_dependencies()
     
     def check_dependencies(self):
-        """Gerekli kütüphaneleri kontrol et"""
+        """Gerekli kütüphaneleri kontrol et
+        
+        Paketler import edilmez, yalnızca bulunup bulunmadıkları sorulur;
+        matplotlib/numpy/flask yükleme maliyeti demoyu başlatan sürece kalır.
+        """
         dependencies = ['matplotlib', 'PIL', 'numpy', 'flask']
         
         for dep in dependencies:
-            try:
-                if dep == 'PIL':
-                    import PIL
-                else:
-                    __import__(dep)
+            if importlib.util.find_spec(dep) is not None:
                 status = "✅"
                 color = "#27AE60"
-            except ImportError:
+            else:
                 status = "❌"
                 color = "#E74C3C"
             
@@ -200,27 +210,37 @@ class FHEArtLauncher:
         if self.web_process and self.web_process.poll() is None:
             messagebox.showinfo("Bilgi", 
                                "🌐 Web uygulaması zaten çalışıyor!\n\n"
-                               "http://localhost:5000 adresini kontrol edin.")
+                               f"{self.web_url} adresini kontrol edin.")
             return
         
         self.show_loading("Web uygulaması başlatılıyor...")
         
         try:
-            # Flask uygulamasını arka planda başlat
+            # Flask uygulamasını arka planda başlat; çıktı satır satır okunur
+            env = dict(os.environ, PYTHONUNBUFFERED='1')
             self.web_process = subprocess.Popen(
                 [sys.executable, 'web_art_generator.py'], 
                 cwd=os.path.dirname(os.path.abspath(__file__)),
                 stdout=subprocess.PIPE, 
-                stderr=subprocess.PIPE
+                stderr=subprocess.STDOUT,
+                text=True,
+                encoding='utf-8',
+                errors='replace',
+                env=env
             )
+            self.web_ready = False
+            self.web_log.clear()
             
-            # 3 saniye bekle ve tarayıcıyı aç
-            threading.Thread(target=self.open_browser_delayed, daemon=True).start()
+            # Boru dolup sunucuyu bloklamasın diye çıktı sürekli boşaltılır;
+            # tarayıcı hazır satırı gelince açılır
+            threading.Thread(target=self.drain_web_logs, args=(self.web_process,),
+                             daemon=True).start()
+            self.root.after(WEB_READY_TIMEOUT * 1000, self.check_web_ready, self.web_process)
             
             messagebox.showinfo("Başarılı", 
                                "🌐 Web uygulaması başlatıldı!\n\n"
-                               "Tarayıcınız otomatik olarak açılacak.\n"
-                               "Manuel: http://localhost:5000")
+                               "Sunucu hazır olunca tarayıcınız otomatik olarak açılacak.\n"
+                               f"Manuel: {self.web_url}")
             
         except FileNotFoundError:
             messagebox.showerror("Hata", 
@@ -228,10 +248,44 @@ class FHEArtLauncher:
         except Exception as e:
             messagebox.showerror("Hata", f"Web uygulaması başlatılamadı:\n{str(e)}")
     
-    def open_browser_delayed(self):
-        """Tarayıcıyı gecikmeli aç"""
-        time.sleep(3)
-        webbrowser.open("http://localhost:5000")
+    def drain_web_logs(self, process):
+        """Sunucu çıktısını okuyup konsola aktar; hazır satırında tarayıcıyı aç"""
+        for line in process.stdout:
+            line = line.rstrip()
+            self.web_log.append(line)
+            print(f"[web] {line}")
+            
+            if line.startswith(WEB_READY_MARKER) and not self.web_ready:
+                parts = line.split()
+                url = parts[1] if len(parts) > 1 else self.web_url
+                self.root.after(0, self.on_web_ready, process, url)
+        
+        # Çıktı kapandı: süreç bitti
+        returncode = process.wait()
+        if process is self.web_process and not self.web_ready:
+            self.root.after(0, self.on_web_failed, returncode)
+    
+    def on_web_ready(self, process, url):
+        """Sunucu dinliyor ve ısındı (ana thread)"""
+        if process is not self.web_process or self.web_ready:
+            return
+        self.web_ready = True
+        self.web_url = url
+        webbrowser.open(url)
+    
+    def on_web_failed(self, returncode):
+        """Sunucu hazır olmadan kapandı (ana thread)"""
+        tail = "\n".join(list(self.web_log)[-8:])
+        messagebox.showerror("Hata", 
+                            f"❌ Web uygulaması hazır olmadan kapandı (kod {returncode}).\n\n"
+                            f"{tail}")
+    
+    def check_web_ready(self, process):
+        """Zaman aşımı: süreç çalışıyor ama hâlâ hazır değil"""
+        if process is self.web_process and not self.web_ready and process.poll() is None:
+            messagebox.showwarning("Uyarı", 
+                                  f"⏱️ Web uygulaması {WEB_READY_TIMEOUT} saniyede hazır olmadı.\n\n"
+                                  f"Manuel: {self.web_url}")
     
     def run_quick_test(self):
         """Hızlı test çalıştır"""
@@ -556,7 +610,7 @@ EXPOSE 5000
 
 # Sağlık kontrolü
 HEALTHCHECK --interval=30s --timeout=10s --start-period=60s --retries=3 \
-  CMD curl -f http://localhost:5000/ || exit 1
+  CMD curl -f http://localhost:5000/api/ready || exit 1
 
 # Varsayılan komut
 CMD ["python", "web_art_generator.py"]
@@ -1,16 +1,198 @@
-import matplotlib.pyplot as plt
 import numpy as np
 from PIL import Image, ImageDraw
 import random
 import os
+import sys
+import threading
+from collections import OrderedDict
+from fhe_raster import BASE_ART_SIZE, MPL_DPI, THEME_LIMITS, ZamaRasterizer
+from piece_set import PieceSet, revealed_mask
+
+# Desteklenen çizim arka uçları
+RENDER_BACKENDS = ('matplotlib', 'raster')
+
+# İlerleme görüntüsünün alt imzası
+FOOTER_TEXT = "🔐 FHE Crypto Art - Zama Creator Program"
+
+# Çıktısı random çekilişlere bağlı temalar (önbellek için tohum gerekir)
+RANDOMIZED_THEMES = ('zama_vision',)
+
+# pyplot yalnızca matplotlib arka ucu ilk kez çizdiğinde yüklenir (_load_pyplot)
+plt = None
+FigureCanvasAgg = None
+
+def _load_pyplot():
+    """pyplot'u ilk kullanımda yükle; arka uç seçilmemişse Agg'yi zorla
+    
+    Motor figürleri ekrana hiç göstermez, yalnızca Agg tuvaline çizer. Çağıran
+    pyplot'u önceden yüklediyse ya da MPLBACKEND verdiyse seçimine dokunulmaz;
+    aksi halde GUI arka ucu (ve tkinter) yüklenmez, başsız ortamda da çalışır.
+    """
+    global plt, FigureCanvasAgg
+    if plt is None:
+        import matplotlib
+        if 'matplotlib.pyplot' not in sys.modules and not os.environ.get('MPLBACKEND'):
+            matplotlib.use('Agg')
+        import matplotlib.pyplot as pyplot
+        from matplotlib.backends.backend_agg import FigureCanvasAgg as canvas_class
+        plt, FigureCanvasAgg = pyplot, canvas_class
+    return plt
+
+# Kilitli parça sprite'ları için süreç genelinde bayt bütçesi (ArtCache gibi LRU)
+SPRITE_CACHE_BYTES = int(os.environ.get('FHE_SPRITE_CACHE_MB', '64')) * 1024 * 1024
+_sprites = OrderedDict()
+_sprite_bytes = 0
+_sprite_lock = threading.Lock()
+
+def _cached_sprite(key, draw):
+    """key için sprite'ı önbellekten al ya da draw() ile çizip bütçeye ekle"""
+    global _sprite_bytes
+    with _sprite_lock:
+        tile = _sprites.get(key)
+        if tile is not None:
+            _sprites.move_to_end(key)
+            return tile
+    
+    tile = draw()
+    size = tile.width * tile.height * 3
+    if size > SPRITE_CACHE_BYTES:
+        return tile
+    with _sprite_lock:
+        if key not in _sprites:
+            _sprites[key] = tile
+            _sprite_bytes += size
+        while _sprite_bytes > SPRITE_CACHE_BYTES:
+            _, old = _sprites.popitem(last=False)
+            _sprite_bytes -= old.width * old.height * 3
+    return tile
+
+def _draw_locked_tile_base(tile_size):
+    # Kilit simgesi tüm parçalarda aynıdır; boyut başına bir kez çizilir
+    piece_width, piece_height = tile_size
+    tile = Image.new('RGB', tile_size, color='black')
+    draw = ImageDraw.Draw(tile)
+    draw.rectangle([0, 0, piece_width, piece_height], 
+                  fill='#2c3e50', outline='#34495e', width=2)
+    
+    center_x = piece_width // 2
+    center_y = piece_height // 2
+    
+    lock_size = min(piece_width, piece_height) // 4
+    draw.rectangle([center_x - lock_size//2, center_y - lock_size//3,
+                  center_x + lock_size//2, center_y + lock_size//3],
+                  fill='#7f8c8d', outline='#95a5a6', width=2)
+    return tile
+
+def _draw_locked_tile(tile_size, piece_id):
+    piece_width, piece_height = tile_size
+    lock_size = min(piece_width, piece_height) // 4
+    
+    base = _cached_sprite(('base', tile_size), lambda: _draw_locked_tile_base(tile_size))
+    tile = base.copy()
+    ImageDraw.Draw(tile).text((piece_width // 2, piece_height // 2 + lock_size), 
+                              f"#{piece_id:02d}", 
+                              fill='#bdc3c7', anchor='mm')
+    return tile
+
+def locked_tile_sprite(tile_size, piece_id):
+    """(parça boyutu, parça no) için kilitli parça görüntüsü; salt okunur paylaşılır
+    
+    Sprite'lar SPRITE_CACHE_BYTES (FHE_SPRITE_CACHE_MB) bütçeli bir LRU'da
+    tutulur; bütçeden çıkanlar gerektiğinde yeniden çizilir.
+    """
+    return _cached_sprite((tuple(tile_size), piece_id),
+                          lambda: _draw_locked_tile(tuple(tile_size), piece_id))
+
+def sprite_cache_stats():
+    with _sprite_lock:
+        return {'entries': len(_sprites), 'bytes': _sprite_bytes,
+                'max_bytes': SPRITE_CACHE_BYTES}
+
+def _as_uint8(arr):
+    # Yalnızca düşük bayt sonuca etki eder; uint8'e indirgemek sonucu değiştirmez
+    arr = np.asarray(arr)
+    return arr if arr.dtype == np.uint8 else arr.astype(np.uint8)
+
+def encrypt_pixels(arr, key, out=None):
+    """((p ^ key) + key) % 256 şifresini uint8 üzerinde tek geçişte uygula
+    
+    Tek bir parça, bütün görüntü ya da (satır, sütun, h, w, c) parça yığını
+    verilebilir. out verilirse sonuç oraya yazılır (out=arr ile yerinde).
+    """
+    k = np.uint8(key & 0xFF)
+    arr = _as_uint8(arr)
+    out = np.bitwise_xor(arr, k, out=out)
+    # uint8 toplama 256'da taşar; % 256 ile bit düzeyinde aynı
+    return np.add(out, k, out=out)
+
+def decrypt_pixels(arr, key, out=None):
+    """encrypt_pixels işleminin tersi: ((c - key) % 256) ^ key"""
+    k = np.uint8(key & 0xFF)
+    arr = _as_uint8(arr)
+    out = np.subtract(arr, k, out=out)
+    return np.bitwise_xor(out, k, out=out)
 
 class FHEArtGenerator:
-    def __init__(self):
+    def __init__(self, render_backend='matplotlib', art_cache=None, render_farm=None):
+        if render_backend not in RENDER_BACKENDS:
+            raise ValueError(f"Unknown render backend: {render_backend}")
         self.art_pieces = []
         self.encryption_key = random.randint(1000, 9999)
+        self.render_backend = render_backend
+        self.art_cache = art_cache
+        self.render_farm = render_farm
+    
+    def generate_base_art(self, theme="zama_classic", backend=None,
+                          output_path='base_art.png'):
+        """Sanatı oluştur ve PNG dosyası olarak kaydet (dosya yolu döner)"""
+        self.render_base_art(theme, backend).save(output_path)
+        return output_path
+    
+    def render_base_art(self, theme="zama_classic", backend=None, as_array=False,
+                        size=None, seed=None):
+        """Sanatı diske yazmadan bellekte oluştur (PIL.Image ya da NumPy dizisi)
+        
+        art_cache tanımlıysa aynı (tema, boyut, tohum) için önbellekten döner;
+        dönen görüntü paylaşılır, yerinde değiştirilmemelidir. render_farm
+        tanımlıysa çizim ısınmış worker süreçlerinde yapılır.
+        """
+        backend = backend or self.render_backend
+        if backend not in RENDER_BACKENDS:
+            raise ValueError(f"Unknown render backend: {backend}")
+        
+        size = size or BASE_ART_SIZE
+        if isinstance(size, int):
+            size = (size, size)
+        
+        # Bilinmeyen temalar klasik temaya düşer; önbellekte aynı kaydı paylaşır
+        if theme not in THEME_LIMITS:
+            theme = 'zama_classic'
+        
+        def render():
+            if self.render_farm is not None:
+                return self.render_farm.render(theme, size, seed, backend)
+            rng = random.Random(seed) if seed is not None else random
+            if backend == 'raster':
+                # pyplot durumu olmadan doğrudan PIL tuvaline çiz
+                return ZamaRasterizer(size).render(theme, rng)
+            return self._render_matplotlib(theme, size, rng)
+        
+        randomized = theme in RANDOMIZED_THEMES
+        if self.art_cache is None or (randomized and seed is None):
+            img = render()
+        else:
+            # Tohumlu rastgele çizimler ana LRU'yu ve diski doldurmaz
+            key = self.art_cache.make_key(theme, backend, size,
+                                          seed if randomized else None)
+            img = self.art_cache.get_or_render(key, render, one_off=randomized)
+        
+        return np.asarray(img) if as_array else img
     
-    def generate_base_art(self, theme="zama_classic"):
-        fig, ax = plt.subplots(figsize=(10, 10))
+    def _render_matplotlib(self, theme, size=(BASE_ART_SIZE, BASE_ART_SIZE), rng=random):
+        # Eksen alanı BASE_ART_SIZE pikseldir; dpi'ı istenen boyuta ölçekle
+        dpi = MPL_DPI * max(size) / BASE_ART_SIZE
+        _load_pyplot()
+        fig, ax = plt.subplots(figsize=(10, 10), dpi=dpi)
     
         if theme == "zama_classic":
             self._create_zama_classic_art(ax)
@@ -19,16 +201,29 @@ class FHEArtGenerator:
         elif theme == "zama_geometric":
             self._create_zama_geometric_art(ax)
         elif theme == "zama_vision":
-            self._create_zama_vision_art(ax)
+            self._create_zama_vision_art(ax, rng)
         else:
             self._create_zama_classic_art(ax)
         
         plt.axis('off')
         plt.tight_layout()
-        plt.savefig('base_art.png', dpi=150, bbox_inches='tight', 
-                   facecolor='white', transparent=False, pad_inches=0)
-        plt.close()
-        return 'base_art.png'
+        
+        # savefig(bbox_inches='tight', pad_inches=0) ile aynı kırpma, PNG'siz
+        canvas = FigureCanvasAgg(fig)
+        canvas.draw()
+        bbox = fig.get_tightbbox(canvas.get_renderer())
+        rgba = np.asarray(canvas.buffer_rgba())
+        height = rgba.shape[0]
+        left = int(round(bbox.x0 * fig.dpi))
+        right = int(round(bbox.x1 * fig.dpi))
+        top = height - int(round(bbox.y1 * fig.dpi))
+        bottom = height - int(round(bbox.y0 * fig.dpi))
+        img = Image.fromarray(rgba[top:bottom, left:right, :3])
+        plt.close(fig)
+        
+        if img.size != tuple(size):
+            img = img.resize(size, Image.Resampling.LANCZOS)
+        return img
     
     def _create_zama_classic_art(self, ax):
         ax.set_facecolor('#FFD700')
@@ -74,14 +269,14 @@ class FHEArtGenerator:
         # Parlama efektleri
         self._add_sparkle_effects(ax)
 
-    def _create_zama_vision_art(self, ax):
+    def _create_zama_vision_art(self, ax, rng=random):
         ax.set_facecolor('#FFC107')
         
         # Futuristik ağ
         self._draw_fhe_network(ax)
         
         # Dağıtık şifreleme
-        self._draw_distributed_encryption(ax)
+        self._draw_distributed_encryption(ax, rng)
         
         # Teknoloji ızgara deseni
         self._draw_tech_grid_pattern(ax)
@@ -164,10 +359,10 @@ class FHEArtGenerator:
                             facecolor='white', edgecolor='#FFD700', linewidth=2)
             ax.add_patch(node)
 
-    def _draw_distributed_encryption(self, ax):
+    def _draw_distributed_encryption(self, ax, rng=random):
         for _ in range(15):
-            x = random.uniform(0.1, 0.9)
-            y = random.uniform(0.1, 0.9)
+            x = rng.uniform(0.1, 0.9)
+            y = rng.uniform(0.1, 0.9)
             
             # Şifreli blok
             block = plt.Rectangle((x-0.025, y-0.015), 0.05, 0.03,
@@ -192,42 +387,63 @@ class FHEArtGenerator:
             ax.plot([0, 1], [y_pos, y_pos], color='white', 
                    linewidth=0.5, alpha=0.3)
 
-    def encrypt_art_pieces(self, image_path, pieces=16):
-        if not os.path.exists(image_path):
-            raise FileNotFoundError(f"Art file not found: {image_path}")
-            
-        img = Image.open(image_path)
-        width, height = img.size
-        
-        piece_width = width // 4
-        piece_height = height // 4
-        
-        encrypted_pieces = []
-        
-        for i in range(4):
-            for j in range(4):
-                left = j * piece_width
-                upper = i * piece_height
-                right = (j + 1) * piece_width
-                lower = (i + 1) * piece_height
-                
-                piece = img.crop((left, upper, right, lower))
-                
-                encrypted_data = self._encrypt_image_data(piece)
-                encrypted_pieces.append({
-                    'position': (i, j),
-                    'encrypted_data': encrypted_data,
-                    'original_piece': piece,
-                    'is_revealed': False,
-                    'piece_id': len(encrypted_pieces)
-                })
-                
-        return encrypted_pieces
-    
-    def _encrypt_image_data(self, image_piece):
-        arr = np.array(image_piece)
-        encrypted = ((arr.astype(int) ^ self.encryption_key) + self.encryption_key) % 256
-        return encrypted.astype(np.uint8)
+    def encrypt_art_pieces(self, image, pieces=16):
+        """Görüntüyü parçalara ayır; dosya yolu, PIL.Image ya da NumPy dizisi kabul eder
+        
+        pieces bir tam kare (16 -> 4x4) ya da (satır, sütun) ızgarası olabilir.
+        Parçalar tek bir reshape ile (satır, sütun, h, w, kanal) görünümü olarak
+        ayrılır ve bir PieceSet içinde döner; her indeks eski sözlük alanlarını
+        ('position', 'original_piece', 'is_revealed', ...) okunabilir tutar.
+        """
+        rows, cols = self._parse_grid(pieces)
+        img = self._load_image(image)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGB')
+        tiles = self.split_tiles(np.asarray(img), rows, cols)
+        
+        # Tüm parçalar tek seferde şifrelenir
+        encrypted = self._encrypt_image_data(tiles)
+        return PieceSet(tiles, encrypted)
+    
+    @staticmethod
+    def split_tiles(arr, rows, cols):
+        """(H, W, C) diziyi kopyasız (rows, cols, h, w, C) görünümüne böl"""
+        height, width, channels = arr.shape
+        piece_height = height // rows
+        piece_width = width // cols
+        if piece_height == 0 or piece_width == 0:
+            raise ValueError(f"Grid {rows}x{cols} is too fine for a {width}x{height} image")
+        
+        # Kalan kenar pikselleri (eski img.crop davranışı gibi) atılır
+        arr = arr[:rows * piece_height, :cols * piece_width]
+        return arr.reshape(rows, piece_height, cols, piece_width, channels).swapaxes(1, 2)
+    
+    @staticmethod
+    def _parse_grid(pieces):
+        if isinstance(pieces, (tuple, list)):
+            rows, cols = (int(n) for n in pieces)
+        else:
+            rows = cols = int(round(int(pieces) ** 0.5))
+            if rows * cols != int(pieces):
+                raise ValueError(f"pieces must be a perfect square or a (rows, cols) grid, got {pieces}")
+        if rows < 1 or cols < 1:
+            raise ValueError(f"Invalid grid: {rows}x{cols}")
+        return rows, cols
+    
+    def _load_image(self, image):
+        if isinstance(image, Image.Image):
+            return image
+        if isinstance(image, np.ndarray):
+            return Image.fromarray(image)
+        if not os.path.exists(image):
+            raise FileNotFoundError(f"Art file not found: {image}")
+        return Image.open(image)
+    
+    def _encrypt_image_data(self, image_piece, out=None):
+        return encrypt_pixels(np.asarray(image_piece), self.encryption_key, out)
+    
+    def _decrypt_image_data(self, encrypted_data, out=None):
+        return decrypt_pixels(encrypted_data, self.encryption_key, out)
     
     def reveal_piece(self, encrypted_pieces, piece_index):
         if 0 <= piece_index < len(encrypted_pieces):
@@ -236,50 +452,68 @@ class FHEArtGenerator:
                 return True
         return False
     
+    def reveal_many(self, piece_set, selection=1):
+        """Birden fazla parçayı tek vektörel adımda aç
+        
+        selection bir sayıysa o kadar rastgele gizli parça, bir indeks dizisiyse
+        o parçalar açılır. Yeni açılan parça indekslerini döndürür.
+        """
+        if isinstance(selection, (int, np.integer)):
+            if selection < 0:
+                raise ValueError(f"Reveal count must be non-negative, got {selection}")
+            selection = piece_set.sample_hidden(selection)
+        return piece_set.reveal_many(selection)
+    
     def generate_progress_image(self, encrypted_pieces, original_size=(800, 800)):
         img = Image.new('RGB', original_size, color='black')
-        draw = ImageDraw.Draw(img)
         
-        piece_width = original_size[0] // 4
-        piece_height = original_size[1] // 4
+        rows, cols = self._grid_shape(encrypted_pieces)
+        piece_width = original_size[0] // cols
+        piece_height = original_size[1] // rows
         
         for piece in encrypted_pieces:
             i, j = piece['position']
-            left = j * piece_width
-            upper = i * piece_height
-            right = (j + 1) * piece_width
-            lower = (i + 1) * piece_height
-            
-            if piece['is_revealed']:
-                if 'original_piece' in piece:
-                    resized_piece = piece['original_piece'].resize((piece_width, piece_height))
-                    img.paste(resized_piece, (left, upper))
-                else:
-                    color = self._get_piece_color(piece['piece_id'])
-                    draw.rectangle([left, upper, right, lower], 
-                                  fill=color, outline='white', width=2)
-            else:
-                draw.rectangle([left, upper, right, lower], 
-                              fill='#2c3e50', outline='#34495e', width=2)
-                
-                center_x = left + piece_width // 2
-                center_y = upper + piece_height // 2
-                
-                lock_size = min(piece_width, piece_height) // 4
-                draw.rectangle([center_x - lock_size//2, center_y - lock_size//3,
-                              center_x + lock_size//2, center_y + lock_size//3],
-                              fill='#7f8c8d', outline='#95a5a6', width=2)
-                
-                draw.text((center_x, center_y + lock_size), 
-                         f"#{piece['piece_id']:02d}", 
-                         fill='#bdc3c7', anchor='mm')
-        
-        draw.text((10, original_size[1] - 30), 
-                 "🔐 FHE Crypto Art - Zama Creator Program", 
-                 fill='#7f8c8d')
+            tile = self._render_tile(piece, (piece_width, piece_height))
+            img.paste(tile, (j * piece_width, i * piece_height))
         
+        self._draw_footer(img)
         return img
     
+    def _grid_shape(self, encrypted_pieces):
+        if isinstance(encrypted_pieces, PieceSet) and len(encrypted_pieces):
+            return encrypted_pieces.grid
+        rows = max((p['position'][0] for p in encrypted_pieces), default=3) + 1
+        cols = max((p['position'][1] for p in encrypted_pieces), default=3) + 1
+        return rows, cols
+    
+    def _render_tile(self, piece, tile_size):
+        """Tek bir parçanın o anki görünümünü tile_size boyutunda çiz"""
+        piece_width, piece_height = tile_size
+        
+        if piece['is_revealed'] and 'original_piece' in piece:
+            original = piece['original_piece']
+            if isinstance(original, np.ndarray):
+                original = Image.fromarray(original)
+            return original.resize(tile_size)
+        
+        if not piece['is_revealed']:
+            # Kilitli parçalar önceden çizilmiş sprite'lardan gelir (paylaşılır)
+            return locked_tile_sprite(tuple(tile_size), piece['piece_id'])
+        
+        tile = Image.new('RGB', tile_size, color='black')
+        draw = ImageDraw.Draw(tile)
+        color = self._get_piece_color(piece['piece_id'])
+        draw.rectangle([0, 0, piece_width, piece_height], 
+                      fill=color, outline='white', width=2)
+        return tile
+    
+    def _draw_footer(self, img):
+        """Alt imzayı çiz; kapladığı kutuyu döndürür"""
+        draw = ImageDraw.Draw(img)
+        position = (10, img.size[1] - 30)
+        draw.text(position, FOOTER_TEXT, fill='#7f8c8d')
+        return draw.textbbox(position, FOOTER_TEXT)
+    
     def _get_piece_color(self, piece_id):
         colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', 
                  '#FECA57', '#FF9FF3', '#54A0FF', '#5F27CD']
@@ -287,7 +521,7 @@ class FHEArtGenerator:
     
     def get_encryption_stats(self, encrypted_pieces):
         total_pieces = len(encrypted_pieces)
-        revealed_pieces = sum(1 for piece in encrypted_pieces if piece['is_revealed'])
+        revealed_pieces = int(np.count_nonzero(revealed_mask(encrypted_pieces)))
         
         return {
             'total_pieces': total_pieces,
@@ -297,9 +531,13 @@ class FHEArtGenerator:
             'encryption_key': self.encryption_key
         }
     
-    def reset_encryption(self):
-        """Şifreleme anahtarını sıfırla"""
-        self.encryption_key = random.randint(1000, 9999)
+    def new_encryption_key(self):
+        """Generator'ın anahtarını değiştirmeden yeni bir anahtar üret"""
+        return random.randint(1000, 9999)
+    
+    def reset_encryption(self, key=None):
+        """Şifreleme anahtarını sıfırla (key verilirse onu kullan)"""
+        self.encryption_key = key if key is not None else self.new_encryption_key()
         print(f"🔑 Yeni şifreleme anahtarı: {self.encryption_key}")
 
 # Test fonksiyonu
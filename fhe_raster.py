@@ -0,0 +1,288 @@
+"""
+Zama temaları için matplotlib'siz raster çizici.
+
+FHEArtGenerator.generate_base_art(..., backend='raster') bu modülü kullanır.
+Geometri, matplotlib sürümüyle birebir aynı veri koordinatlarından çizilir;
+böylece çıktı görsel olarak eşdeğerdir, ancak pyplot durumu oluşturulmaz.
+"""
+
+import importlib.util
+import math
+import os
+import random
+from functools import lru_cache
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+# matplotlib 10x10 inç figür, 150 dpi, tight bbox -> 1455x1455 piksel eksen alanı
+MPL_DPI = 150
+BASE_ART_SIZE = 1455
+
+# Temaların matplotlib'de otomatik ölçeklenen eksen sınırları (xlim == ylim)
+THEME_LIMITS = {
+    'zama_classic': (0.0, 1.0),
+    'zama_minimal': (0.0, 1.0),
+    'zama_geometric': (0.115, 0.885),
+    'zama_vision': (-0.05, 1.05),
+}
+
+# matplotlib çizim sırası: patch'ler < çizgiler/işaretler < metinler
+_ZORDER_PATCH = 1
+_ZORDER_LINE = 2
+_ZORDER_TEXT = 3
+
+_FONT_FILE = 'DejaVuSans-Bold.ttf'
+
+
+@lru_cache(maxsize=None)
+def _font_path():
+    """DejaVu Sans Bold yolunu bul (sistem, yoksa matplotlib paketi)"""
+    try:
+        ImageFont.truetype(_FONT_FILE, 10)
+        return _FONT_FILE
+    except OSError:
+        pass
+
+    # matplotlib'i import etmeden paketle gelen fontu bul
+    spec = importlib.util.find_spec('matplotlib')
+    if spec and spec.submodule_search_locations:
+        for location in spec.submodule_search_locations:
+            path = os.path.join(location, 'mpl-data', 'fonts', 'ttf', _FONT_FILE)
+            if os.path.exists(path):
+                return path
+    return None
+
+
+@lru_cache(maxsize=64)
+def _load_font(size_px):
+    path = _font_path()
+    if path:
+        return ImageFont.truetype(path, size_px)
+    try:
+        return ImageFont.load_default(size=size_px)
+    except TypeError:
+        # Pillow < 10.1
+        return ImageFont.load_default()
+
+
+def _rgba(color, alpha=1.0):
+    r, g, b = ImageColor.getrgb(color)[:3]
+    return (r, g, b, int(round(alpha * 255)))
+
+
+class _Canvas:
+    """Veri koordinatlarını piksele çeviren, zorder'a göre çizen tuval"""
+
+    def __init__(self, size, limits):
+        self.width, self.height = size
+        self.x0, self.x1 = limits
+        self.y0, self.y1 = limits
+        # 1 punto kaç piksel (matplotlib 150 dpi referansına göre)
+        self.pt = min(size) / BASE_ART_SIZE * MPL_DPI / 72
+        self._ops = []
+
+    def px(self, x, y):
+        return ((x - self.x0) / (self.x1 - self.x0) * self.width,
+                (self.y1 - y) / (self.y1 - self.y0) * self.height)
+
+    def lw(self, points):
+        return max(1, int(round(points * self.pt)))
+
+    def rectangle(self, xy, w, h, facecolor=None, edgecolor=None, linewidth=1.0):
+        x, y = xy
+        left, bottom = self.px(x, y)
+        right, top = self.px(x + w, y + h)
+        self._ops.append((_ZORDER_PATCH, self._draw_rectangle,
+                          (left, top, right, bottom, facecolor, edgecolor, linewidth)))
+
+    def circle(self, center, radius, facecolor=None, edgecolor=None, linewidth=1.0):
+        cx, cy = center
+        left, bottom = self.px(cx - radius, cy - radius)
+        right, top = self.px(cx + radius, cy + radius)
+        self._ops.append((_ZORDER_PATCH, self._draw_circle,
+                          (left, top, right, bottom, facecolor, edgecolor, linewidth)))
+
+    def polygon(self, points, facecolor=None, edgecolor=None, linewidth=1.0):
+        pixels = [self.px(x, y) for x, y in points]
+        self._ops.append((_ZORDER_PATCH, self._draw_polygon,
+                          (pixels, facecolor, edgecolor, linewidth)))
+
+    def line(self, xs, ys, color, linewidth=1.5, alpha=1.0):
+        pixels = [self.px(x, y) for x, y in zip(xs, ys)]
+        self._ops.append((_ZORDER_LINE, self._draw_line,
+                          (pixels, color, linewidth, alpha)))
+
+    def star(self, xy, color, markersize, alpha=1.0):
+        self._ops.append((_ZORDER_LINE, self._draw_star,
+                          (self.px(*xy), color, markersize, alpha)))
+
+    def text(self, xy, text, fontsize, color, ha='left', va='baseline'):
+        anchor = {'left': 'l', 'center': 'm', 'right': 'r'}[ha] + \
+                 {'baseline': 's', 'center': 'm', 'top': 't', 'bottom': 'b'}[va]
+        self._ops.append((_ZORDER_TEXT, self._draw_text,
+                          (self.px(*xy), text, fontsize, color, anchor)))
+
+    def render(self, background='white'):
+        img = Image.new('RGB', (self.width, self.height), color=background)
+        draw = ImageDraw.Draw(img, 'RGBA')
+        # sorted() kararlıdır: aynı zorder'da ekleme sırası korunur
+        for _, fn, args in sorted(self._ops, key=lambda op: op[0]):
+            fn(draw, *args)
+        return img
+
+    # matplotlib kenar çizgisini şeklin sınırına ortalar; PIL ise içe çizer.
+    # Bu yüzden kenar, çizgi kalınlığının yarısı kadar genişletilmiş kutuya çizilir.
+    def _draw_rectangle(self, draw, left, top, right, bottom, facecolor, edgecolor, linewidth):
+        if facecolor:
+            draw.rectangle([left, top, right, bottom], fill=_rgba(facecolor))
+        if edgecolor:
+            width = self.lw(linewidth)
+            half = width / 2
+            draw.rectangle([left - half, top - half, right + half, bottom + half],
+                           outline=_rgba(edgecolor), width=width)
+
+    def _draw_circle(self, draw, left, top, right, bottom, facecolor, edgecolor, linewidth):
+        if facecolor:
+            draw.ellipse([left, top, right, bottom], fill=_rgba(facecolor))
+        if edgecolor:
+            width = self.lw(linewidth)
+            half = width / 2
+            draw.ellipse([left - half, top - half, right + half, bottom + half],
+                         outline=_rgba(edgecolor), width=width)
+
+    def _draw_polygon(self, draw, pixels, facecolor, edgecolor, linewidth):
+        if facecolor:
+            draw.polygon(pixels, fill=_rgba(facecolor))
+        if edgecolor:
+            draw.line(pixels + pixels[:1], fill=_rgba(edgecolor),
+                      width=self.lw(linewidth), joint='curve')
+
+    def _draw_line(self, draw, pixels, color, linewidth, alpha):
+        draw.line(pixels, fill=_rgba(color, alpha), width=self.lw(linewidth))
+
+    def _draw_star(self, draw, center, color, markersize, alpha):
+        # matplotlib '*' işareti: 5 köşeli yıldız, çap = markersize
+        cx, cy = center
+        outer = markersize * self.pt / 2
+        inner = outer * 0.381966
+        points = []
+        for k in range(10):
+            angle = math.pi / 2 + k * math.pi / 5
+            r = outer if k % 2 == 0 else inner
+            points.append((cx + r * math.cos(angle), cy - r * math.sin(angle)))
+        fill = _rgba(color, alpha)
+        draw.polygon(points, fill=fill)
+        draw.line(points + points[:1], fill=fill, width=self.lw(1.0), joint='curve')
+
+    def _draw_text(self, draw, xy, text, fontsize, color, anchor):
+        font = _load_font(max(1, int(round(fontsize * self.pt))))
+        draw.text(xy, text, fill=_rgba(color), font=font, anchor=anchor)
+
+
+class ZamaRasterizer:
+    """Zama temalarını doğrudan NumPy/PIL tuvaline çizen arka uç"""
+
+    def __init__(self, size=BASE_ART_SIZE):
+        if isinstance(size, int):
+            size = (size, size)
+        self.size = tuple(size)
+
+    def render(self, theme="zama_classic", rng=random):
+        """Temayı çiz ve RGB PIL görüntüsü döndür"""
+        if theme not in THEME_LIMITS:
+            theme = 'zama_classic'
+        canvas = _Canvas(self.size, THEME_LIMITS[theme])
+
+        if theme == "zama_minimal":
+            self._create_zama_minimal_art(canvas)
+        elif theme == "zama_geometric":
+            self._create_zama_geometric_art(canvas)
+        elif theme == "zama_vision":
+            self._create_zama_vision_art(canvas, rng)
+        else:
+            self._create_zama_classic_art(canvas)
+
+        # Eksen kapalı olduğu için matplotlib arka plan rengini çizmez
+        return canvas.render(background='white')
+
+    def _create_zama_classic_art(self, c):
+        c.text((0.5, 0.5), 'ZAMA', 60, 'black', ha='center', va='center')
+
+        lock_positions = [(0.2, 0.7), (0.8, 0.7), (0.2, 0.3), (0.8, 0.3)]
+        for x, y in lock_positions:
+            c.rectangle((x-0.05, y-0.05), 0.1, 0.08,
+                        facecolor='black', edgecolor='white', linewidth=2)
+            c.circle((x, y+0.03), 0.03, edgecolor='white', linewidth=3)
+
+    def _create_zama_minimal_art(self, c):
+        c.rectangle((0.45, 0.45), 0.1, 0.1,
+                    facecolor='black', edgecolor='white', linewidth=3)
+        c.text((0.5, 0.3), 'ZAMA FHE', 30, 'black', ha='center', va='center')
+
+    def _create_zama_geometric_art(self, c):
+        self._draw_central_zama_cube(c, (0.5, 0.5), 0.18)
+        self._draw_surrounding_fhe_elements(c)
+        self._add_sparkle_effects(c)
+
+    def _create_zama_vision_art(self, c, rng=random):
+        self._draw_fhe_network(c)
+        self._draw_distributed_encryption(c, rng)
+        self._draw_tech_grid_pattern(c)
+
+    def _draw_central_zama_cube(self, c, center, size):
+        x, y = center
+
+        c.polygon([(x-size/2, y), (x, y+size/2), (x+size/2, y), (x, y-size/2)],
+                  facecolor='#FFE082', edgecolor='black', linewidth=2)
+        c.polygon([(x-size/2, y), (x, y-size/2), (x, y-size*1.2), (x-size/2, y-size*0.7)],
+                  facecolor='#FFCC02', edgecolor='black', linewidth=2)
+        c.polygon([(x, y-size/2), (x+size/2, y), (x+size/2, y-size*0.7), (x, y-size*1.2)],
+                  facecolor='#FFB300', edgecolor='black', linewidth=2)
+
+        c.text((x-size/8, y-size/4), 'Z', int(size*80), 'black')
+
+    def _draw_surrounding_fhe_elements(self, c):
+        positions = [(0.2, 0.8), (0.8, 0.8), (0.2, 0.2), (0.8, 0.2)]
+        symbols = ['Enc()', 'f()', 'Dec()', 'FHE']
+
+        for (x, y), symbol in zip(positions, symbols):
+            c.rectangle((x-0.05, y-0.03), 0.1, 0.06,
+                        facecolor='white', edgecolor='#FFD700', linewidth=2)
+            c.text((x, y), symbol, 12, '#424242', ha='center', va='center')
+
+    def _add_sparkle_effects(self, c):
+        sparkle_positions = [(0.15, 0.85), (0.85, 0.85),
+                             (0.15, 0.15), (0.85, 0.15)]
+
+        for pos in sparkle_positions:
+            c.star(pos, 'white', markersize=18, alpha=0.9)
+            c.star(pos, '#FFD700', markersize=12)
+
+    def _draw_fhe_network(self, c):
+        c.circle((0.5, 0.5), 0.08, facecolor='#FFD700', edgecolor='black', linewidth=3)
+        c.text((0.5, 0.5), 'FHE', 14, 'black', ha='center', va='center')
+
+        for k in range(8):
+            angle = 2 * math.pi * k / 8
+            x_node = 0.5 + 0.25 * math.cos(angle)
+            y_node = 0.5 + 0.25 * math.sin(angle)
+
+            c.line([0.5, x_node], [0.5, y_node], '#FFD700', linewidth=2, alpha=0.8)
+            c.circle((x_node, y_node), 0.03,
+                     facecolor='white', edgecolor='#FFD700', linewidth=2)
+
+    def _draw_distributed_encryption(self, c, rng=random):
+        # FHEArtGenerator ile aynı random çekiliş sırası: aynı tohum -> aynı bloklar
+        for _ in range(15):
+            x = rng.uniform(0.1, 0.9)
+            y = rng.uniform(0.1, 0.9)
+
+            c.rectangle((x-0.025, y-0.015), 0.05, 0.03,
+                        facecolor='#424242', edgecolor='#FFD700', linewidth=1)
+            c.circle((x, y), 0.008, facecolor='#FFD700')
+
+    def _draw_tech_grid_pattern(self, c):
+        for i in range(0, 10):
+            pos = i * 0.1
+            c.line([pos, pos], [0, 1], 'white', linewidth=0.5, alpha=0.3)
+            c.line([0, 1], [pos, pos], 'white', linewidth=0.5, alpha=0.3)
@@ -0,0 +1,84 @@
+"""
+Masaüstü uygulaması için ana iş parçacığı dışında kare üretimi.
+
+Tk geri çağrıları yalnızca "durum değişti" bildirimi gönderir. Tek bir çizim
+iş parçacığı bu bildirimleri birleştirir: bekleyen en son kompozitörü alır,
+değişen bölgeyi çizer ve sonucu deliver ile teslim eder. Bir sonraki kare,
+önceki kare arayüze uygulanana (frame_applied) ve en az bir ekran yenileme
+aralığı geçene kadar üretilmez; hızlı açma patlamalarında ara kareler
+kuyrukta birikmek yerine tek kareye katlanır.
+"""
+
+import threading
+import time
+
+# Ekran yenileme aralığı (60 Hz)
+FRAME_INTERVAL = 1 / 60
+
+
+class FramePipeline:
+    """Birleştiren tek yuvalı kuyruk + çizim iş parçacığı"""
+
+    def __init__(self, deliver, size, frame_interval=FRAME_INTERVAL):
+        self.deliver = deliver
+        self.size = tuple(size)
+        self.frame_interval = frame_interval
+        self._pending = None
+        self._changed = threading.Condition()
+        self._applied = threading.Event()
+        self._applied.set()
+        self._closed = False
+        self.frames = 0
+        self.notifications = 0
+        self._thread = threading.Thread(target=self._run, name='frame-pipeline', daemon=True)
+        self._thread.start()
+
+    def notify(self, compositor):
+        """Durum değişti; önceki bildirim henüz çizilmediyse onunla birleşir"""
+        with self._changed:
+            self._pending = compositor
+            self.notifications += 1
+            self._changed.notify()
+
+    def frame_applied(self):
+        """Arayüz teslim edilen kareyi uyguladı; sıradaki kare üretilebilir"""
+        self._applied.set()
+
+    def close(self):
+        with self._changed:
+            self._closed = True
+            self._changed.notify()
+        self._applied.set()
+
+    def _run(self):
+        last_frame = 0.0
+        while True:
+            # Arayüz önceki kareyi uygulamadan yenisi üretilmez (en fazla bir kare yolda)
+            self._applied.wait()
+            with self._changed:
+                while self._pending is None and not self._closed:
+                    self._changed.wait()
+                if self._closed:
+                    return
+
+            # Yenileme aralığı dolana kadar gelen bildirimler aynı kareye katlanır
+            delay = last_frame + self.frame_interval - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            with self._changed:
+                compositor, self._pending = self._pending, None
+
+            try:
+                canvas, box = compositor.render_changes(self.size)
+                if box is None:
+                    continue
+                # Canlı tuval bu iş parçacığında değişmeye devam eder; arayüze kopya gider
+                region = canvas.crop(box)
+            except Exception as e:
+                print(f"Kare çizilirken hata: {e}")
+                continue
+
+            self._applied.clear()
+            last_frame = time.monotonic()
+            self.frames += 1
+            self.deliver(compositor, box, region)
@@ -0,0 +1,142 @@
+"""
+Temel sanat üretimi için istek birleştiren, sınırlı üretim kuyruğu.
+
+Aynı (tema, arka uç, boyut, tohum) için uçuştaki bir üretim varsa yeni istek
+ikinci kez çizmez, lider isteğin sonucunu bekler. Aynı anda en fazla
+max_active üretim çalışır, en fazla max_waiting üretim sırada bekler; kuyruk
+doluysa QueueFull yükseltilir ve web katmanı 429 + Retry-After döner.
+Thread tabanlı (Flask) ve asyncio tabanlı (ASGI) çağıranlar için run ve
+run_async aynı sayaçları ve uçuştaki işleri paylaşır.
+"""
+
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+
+
+class QueueFull(Exception):
+    """Kuyruk dolu; retry_after saniye sonra yeniden denenmeli"""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Generation queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class GenerationQueue:
+    """Uçuştaki aynı üretimleri birleştirir, eşzamanlılığı ve kuyruğu sınırlar"""
+
+    def __init__(self, max_active=4, max_waiting=16, wait_timeout=30.0):
+        self.max_active = max_active
+        self.max_waiting = max_waiting
+        self.wait_timeout = wait_timeout
+        self._inflight = {}
+        self._admitted = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_active)
+        self._async_slots = None
+        # Retry-After tahmini için üretim süresinin üstel ortalaması
+        self._avg_seconds = 1.0
+        self.leaders = 0
+        self.coalesced = 0
+        self.rejected = 0
+
+    def run(self, key, fn):
+        """key uçuştaysa sonucunu bekle; değilse sıraya gir ve fn()'i bu iş parçacığında çalıştır"""
+        future, leader = self._admit(key)
+        if not leader:
+            try:
+                return future.result(self.wait_timeout)
+            except FutureTimeout:
+                raise QueueFull(self.retry_after()) from None
+
+        try:
+            if not self._slots.acquire(timeout=self.wait_timeout):
+                raise QueueFull(self.retry_after())
+            try:
+                started = time.monotonic()
+                result = fn()
+                self._record(time.monotonic() - started)
+            finally:
+                self._slots.release()
+        except BaseException as e:
+            self._done(key, future, error=e)
+            raise
+        self._done(key, future, result)
+        return result
+
+    async def run_async(self, key, fn):
+        """run'ın asyncio karşılığı; fn bir coroutine döndüren çağrılabilir"""
+        future, leader = self._admit(key)
+        if not leader:
+            try:
+                # shield: bekleyen takipçinin iptali liderin Future'ını iptal etmesin
+                return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)),
+                                              self.wait_timeout)
+            except asyncio.TimeoutError:
+                raise QueueFull(self.retry_after()) from None
+
+        if self._async_slots is None:
+            self._async_slots = asyncio.Semaphore(self.max_active)
+        try:
+            try:
+                await asyncio.wait_for(self._async_slots.acquire(), self.wait_timeout)
+            except asyncio.TimeoutError:
+                raise QueueFull(self.retry_after()) from None
+            try:
+                started = time.monotonic()
+                result = await fn()
+                self._record(time.monotonic() - started)
+            finally:
+                self._async_slots.release()
+        except BaseException as e:
+            self._done(key, future, error=e)
+            raise
+        self._done(key, future, result)
+        return result
+
+    def retry_after(self):
+        """Sıradaki işlerin bitmesi için tahmini bekleme (tam saniye, en az 1)"""
+        with self._lock:
+            backlog = max(self._admitted, self.max_active) / self.max_active
+            return max(1, math.ceil(self._avg_seconds * backlog))
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._inflight),
+                'max_active': self.max_active,
+                'max_waiting': self.max_waiting,
+                'leaders': self.leaders,
+                'coalesced': self.coalesced,
+                'rejected': self.rejected,
+                'avg_seconds': round(self._avg_seconds, 3),
+            }
+
+    def _admit(self, key):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            if self._admitted < self.max_active + self.max_waiting:
+                future = self._inflight[key] = Future()
+                self._admitted += 1
+                self.leaders += 1
+                return future, True
+            self.rejected += 1
+        raise QueueFull(self.retry_after())
+
+    def _done(self, key, future, result=None, error=None):
+        with self._lock:
+            self._inflight.pop(key, None)
+            self._admitted -= 1
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def _record(self, seconds):
+        with self._lock:
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * seconds
@@ -0,0 +1,129 @@
+"""
+Uç noktaya göre görüntü kodlama profilleri.
+
+Etkileşimli kareler (açma, akış, parça deltaları) hız için düşük sıkıştırma
+seviyeli PNG ya da hızlı kayıpsız WebP ile, indirmeler ise boyut için yüksek
+oranlı ayarlarla kodlanır. Biçim ?format= ile ya da Accept başlığından
+seçilir. Her (profil, biçim) için kodlama süresi ve çıktı boyutu sayılır.
+"""
+
+import base64
+import threading
+import time
+from io import BytesIO
+
+IMAGE_FORMATS = {'png': 'image/png', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+# (profil, biçim) -> PIL save() argümanları
+PROFILES = {
+    'interactive': {
+        'png': {'format': 'PNG', 'compress_level': 1},
+        'webp': {'format': 'WEBP', 'lossless': True, 'method': 2, 'quality': 0},
+        'jpeg': {'format': 'JPEG', 'quality': 85},
+    },
+    'download': {
+        'png': {'format': 'PNG', 'compress_level': 9},
+        'webp': {'format': 'WEBP', 'lossless': True, 'method': 4, 'quality': 100},
+        'jpeg': {'format': 'JPEG', 'quality': 95, 'optimize': True},
+    },
+}
+
+# Accept başlığı yoksa ya da yalnızca joker içeriyorsa öne çıkan biçim
+DEFAULT_FORMAT = 'png'
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def encode_timed(img, fmt='png', profile='interactive'):
+    """Görüntüyü profile göre kodla; (bayt, saniye) döndür, sayaçlara yazmaz"""
+    options = dict(PROFILES[profile][fmt])
+    if options['format'] == 'JPEG' and img.mode not in ('RGB', 'L'):
+        img = img.convert('RGB')
+    started = time.perf_counter()
+    img_buffer = BytesIO()
+    img.save(img_buffer, **options)
+    return img_buffer.getvalue(), time.perf_counter() - started
+
+
+def encode(img, fmt='png', profile='interactive'):
+    """Görüntüyü profile göre kodla ve süre/boyut sayaçlarına işle"""
+    data, seconds = encode_timed(img, fmt, profile)
+    record(profile, fmt, seconds, len(data), img.width * img.height)
+    return data
+
+
+def record(profile, fmt, seconds, nbytes, pixels):
+    """Başka bir süreçte yapılan kodlamayı da sayaçlara ekle"""
+    with _stats_lock:
+        entry = _stats.setdefault((profile, fmt), [0, 0.0, 0, 0])
+        entry[0] += 1
+        entry[1] += seconds
+        entry[2] += nbytes
+        entry[3] += pixels
+
+
+def data_uri(data, fmt='png'):
+    """Kodlanmış baytları base64 data URI'sine çevir"""
+    return f"data:{IMAGE_FORMATS[fmt]};base64,{base64.b64encode(data).decode()}"
+
+
+def image_to_data_uri(img, profile='interactive'):
+    """PIL görüntüsünü etkileşimli PNG data URI'sine çevir"""
+    return data_uri(encode(img, 'png', profile), 'png')
+
+
+def negotiate(accept, fmt=None):
+    """?format= değeri ya da Accept başlığından biçim seç
+
+    Eşit q değerlerinde açıkça adı geçen tür, o da eşitse sunucu sırası
+    (IMAGE_FORMATS) geçerlidir. Kabul edilebilir biçim yoksa None döner.
+    """
+    if fmt:
+        fmt = fmt.lower()
+        if fmt == 'jpg':
+            fmt = 'jpeg'
+        return fmt if fmt in IMAGE_FORMATS else None
+    if not accept:
+        return DEFAULT_FORMAT
+
+    specific, wildcard = {}, 0.0
+    for part in accept.split(','):
+        media, _, params = part.strip().partition(';')
+        media = media.strip().lower()
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media in ('*/*', 'image/*'):
+            wildcard = max(wildcard, q)
+        else:
+            specific[media] = max(specific.get(media, 0.0), q)
+
+    # Eşit q değerinde açıkça adı geçen tür, joker karakterle eşleşenden önce
+    # gelir (tarayıcılar image/webp ile birlikte image/* de gönderir)
+    best, best_rank = None, (0.0, False)
+    for name, mimetype in IMAGE_FORMATS.items():
+        explicit = mimetype in specific
+        rank = (specific[mimetype] if explicit else wildcard, explicit)
+        if rank[0] > 0 and rank > best_rank:
+            best, best_rank = name, rank
+    return best
+
+
+def stats():
+    """(profil, biçim) başına sayı, ortalama süre (ms), ortalama boyut ve bayt/piksel"""
+    with _stats_lock:
+        result = {}
+        for (profile, fmt), (count, seconds, nbytes, pixels) in sorted(_stats.items()):
+            result.setdefault(profile, {})[fmt] = {
+                'count': count,
+                'avg_ms': round(seconds * 1000 / count, 2),
+                'avg_bytes': nbytes // count,
+                'bytes_per_pixel': round(nbytes / pixels, 4) if pixels else 0.0,
+            }
+        return result
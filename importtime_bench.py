@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Giriş noktalarının soğuk başlangıç (import) süresi ölçümü.
+
+Her giriş noktası yeni bir yorumlayıcıda `python -X importtime -c "import X"`
+ile birkaç kez import edilir; modülün kümülatif import süresinin medyanı,
+en pahalı alt importlar ve yüklenmemesi gereken ağır modüller raporlanır.
+
+    python importtime_bench.py                      # tablo
+    python importtime_bench.py --save bench.json    # sonucu kaydet
+    python importtime_bench.py --baseline bench.json --threshold 25
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ENTRY_POINTS = ('fhe_art_engine', 'web_art_generator', 'asgi_app', 'art_app', 'demo_launcher')
+
+# Giriş noktası import edilirken yüklenmemesi gereken modüller
+FORBIDDEN_IMPORTS = {
+    'fhe_art_engine': ('matplotlib.pyplot', 'tkinter'),
+    'web_art_generator': ('matplotlib.pyplot', 'tkinter'),
+    'asgi_app': ('matplotlib.pyplot', 'tkinter'),
+    'art_app': ('matplotlib.pyplot',),
+    'demo_launcher': ('matplotlib', 'numpy', 'PIL', 'flask'),
+}
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def parse_importtime(stderr):
+    """-X importtime çıktısını [(modül, self_us, kümülatif_us, derinlik)] listesine çevir"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(fields[0]), int(fields[1]), depth))
+    return rows
+
+
+def measure_once(module):
+    """Modülü yeni bir yorumlayıcıda import et; ayrıştırılmış satırları döndür"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        error = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else ''
+        raise RuntimeError(f"Importing {module} failed: {error}")
+    return parse_importtime(result.stderr)
+
+
+def measure(module, repeat=5, top=5):
+    """Giriş noktasının medyan kümülatif import süresi (ms) ve ayrıntıları"""
+    totals, rows = [], []
+    for _ in range(repeat):
+        rows = measure_once(module)
+        totals.append(next(cumulative for name, _, cumulative, depth in rows
+                           if name == module and depth == 0))
+
+    loaded = {name for name, _, _, _ in rows}
+    heaviest = sorted((row for row in rows if row[0] != module),
+                      key=lambda row: row[1], reverse=True)[:top]
+    return {
+        'median_ms': round(statistics.median(totals) / 1000, 1),
+        'min_ms': round(min(totals) / 1000, 1),
+        'modules': len(loaded),
+        'heaviest': [(name, round(self_us / 1000, 1)) for name, self_us, _, _ in heaviest],
+        'forbidden': [name for name in FORBIDDEN_IMPORTS.get(module, ()) if name in loaded],
+    }
+
+
+def compare(results, baseline, threshold):
+    """Eşik yüzdesinden fazla yavaşlayan giriş noktalarını döndür"""
+    regressions = []
+    for module, result in results.items():
+        previous = baseline.get(module)
+        if not previous:
+            continue
+        limit = previous['median_ms'] * (1 + threshold / 100)
+        if result['median_ms'] > limit:
+            regressions.append((module, previous['median_ms'], result['median_ms']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start import time benchmark")
+    parser.add_argument('modules', nargs='*', default=ENTRY_POINTS)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=5)
+    parser.add_argument('--save', help="write results as JSON")
+    parser.add_argument('--baseline', help="compare against a saved JSON result")
+    parser.add_argument('--threshold', type=float, default=25.0,
+                        help="allowed slowdown over the baseline in percent")
+    args = parser.parse_args()
+
+    results = {}
+    failed = False
+    print(f"{'Giriş noktası':<20} {'medyan':>9} {'min':>9} {'modül':>6}  en pahalı importlar")
+    for module in args.modules:
+        result = results[module] = measure(module, args.repeat, args.top)
+        heaviest = ', '.join(f"{name} {ms}ms" for name, ms in result['heaviest'][:3])
+        print(f"{module:<20} {result['median_ms']:>7}ms {result['min_ms']:>7}ms "
+              f"{result['modules']:>6}  {heaviest}")
+        if result['forbidden']:
+            failed = True
+            print(f"   ❌ {module} yüklememesi gereken modülleri yükledi: "
+                  f"{', '.join(result['forbidden'])}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Sonuçlar kaydedildi: {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        for module, before, after in compare(results, baseline, args.threshold):
+            failed = True
+            print(f"   ❌ {module}: {before}ms -> {after}ms (%{args.threshold:g} eşiği aşıldı)")
+
+    if failed:
+        sys.exit(1)
+    print("✅ Soğuk başlangıç bütçesi içinde")
+
+
+if __name__ == "__main__":
+    main()
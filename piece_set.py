@@ -0,0 +1,152 @@
+"""
+Şifreli parçaların kompakt gösterimi.
+
+Parça pikselleri tek bir (satır, sütun, h, w, kanal) dizisinde, açılma
+durumu ise bir NumPy bool dizisinde tutulur. Sayımlar, rastgele gizli parça
+seçimi ve toplu açma Python döngüsü yerine vektörel işlemlerle yapılır.
+Eski sözlük listesiyle uyum için her indeks sözlük gibi okunabilen bir
+Piece görünümü döndürür.
+"""
+
+import numpy as np
+
+
+PIECE_FIELDS = ('position', 'encrypted_data', 'original_piece', 'is_revealed', 'piece_id')
+
+
+class Piece:
+    """PieceSet içindeki tek parçanın sözlük benzeri görünümü"""
+
+    __slots__ = ('_set', 'index')
+
+    def __init__(self, piece_set, index):
+        self._set = piece_set
+        self.index = index
+
+    def __getitem__(self, key):
+        piece_set, index = self._set, self.index
+        if key == 'is_revealed':
+            return bool(piece_set.revealed[index])
+        if key == 'position':
+            return piece_set.position(index)
+        if key == 'piece_id':
+            return index
+        if key == 'original_piece':
+            return piece_set.tiles[piece_set.position(index)]
+        if key == 'encrypted_data':
+            return piece_set.encrypted[piece_set.position(index)]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key != 'is_revealed':
+            raise KeyError(f"Read-only piece field: {key}")
+        self._set.revealed[self.index] = bool(value)
+
+    def __contains__(self, key):
+        return key in PIECE_FIELDS
+
+    def get(self, key, default=None):
+        return self[key] if key in PIECE_FIELDS else default
+
+    def keys(self):
+        return PIECE_FIELDS
+
+
+class PieceSet:
+    """Tek dizide parçalar + bool açılma maskesi"""
+
+    def __init__(self, tiles, encrypted, rng=None):
+        if tiles.shape != encrypted.shape:
+            raise ValueError(f"Tile and encrypted shapes differ: {tiles.shape} vs {encrypted.shape}")
+        self.tiles = tiles
+        self.encrypted = encrypted
+        self.rows, self.cols = tiles.shape[:2]
+        self.revealed = np.zeros(self.rows * self.cols, dtype=bool)
+        self.rng = rng or np.random.default_rng()
+
+    def __len__(self):
+        return len(self.revealed)
+
+    def __getitem__(self, index):
+        if not -len(self) <= index < len(self):
+            raise IndexError(f"Piece index out of range: {index}")
+        return Piece(self, index % len(self))
+
+    def __iter__(self):
+        return (Piece(self, index) for index in range(len(self)))
+
+    @property
+    def grid(self):
+        return self.rows, self.cols
+
+    @property
+    def tile_size(self):
+        """Tek parçanın (genişlik, yükseklik) boyutu"""
+        return self.tiles.shape[3], self.tiles.shape[2]
+
+    @property
+    def nbytes(self):
+        return self.tiles.nbytes + self.encrypted.nbytes
+
+    @property
+    def revealed_count(self):
+        return int(np.count_nonzero(self.revealed))
+
+    @property
+    def hidden_count(self):
+        return len(self) - self.revealed_count
+
+    @property
+    def is_complete(self):
+        return bool(self.revealed.all())
+
+    def position(self, index):
+        return divmod(int(index), self.cols)
+
+    def hidden_indices(self):
+        return np.flatnonzero(~self.revealed)
+
+    def random_hidden(self):
+        """Rastgele bir gizli parça indeksi (hepsi açıksa None)"""
+        hidden = self.hidden_indices()
+        if not len(hidden):
+            return None
+        return int(hidden[self.rng.integers(len(hidden))])
+
+    def sample_hidden(self, count):
+        """Tekrarsız en fazla count gizli parça indeksi"""
+        hidden = self.hidden_indices()
+        count = min(int(count), len(hidden))
+        return self.rng.choice(hidden, size=count, replace=False)
+
+    def reveal(self, index):
+        """Tek parçayı aç; zaten açıksa ya da indeks geçersizse False"""
+        if not 0 <= index < len(self) or self.revealed[index]:
+            return False
+        self.revealed[index] = True
+        return True
+
+    def reveal_many(self, indices):
+        """Parçaları tek adımda aç; yeni açılan indeksleri (ilk geliş sırasıyla) döndür"""
+        indices = np.asarray(indices, dtype=np.intp).ravel()
+        if indices.size and (indices.min() < 0 or indices.max() >= len(self)):
+            raise IndexError(f"Piece index out of range for {len(self)} pieces")
+        indices = indices[~self.revealed[indices]]
+        _, first = np.unique(indices, return_index=True)
+        indices = indices[np.sort(first)]
+        self.revealed[indices] = True
+        return indices
+
+    def set_revealed(self, mask):
+        """Açılma maskesini toplu olarak değiştir (ör. kayıtlı durumdan geri yükleme)"""
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != self.revealed.shape:
+            raise ValueError(f"Mask shape {mask.shape} does not match {len(self)} pieces")
+        self.revealed[:] = mask
+
+
+def revealed_mask(pieces):
+    """PieceSet ya da eski parça listesi için açılma maskesinin kopyası"""
+    if isinstance(pieces, PieceSet):
+        return pieces.revealed.copy()
+    return np.fromiter((p['is_revealed'] for p in pieces), dtype=bool, count=len(pieces))
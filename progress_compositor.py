@@ -0,0 +1,204 @@
+"""
+Parça setine bağlı, artımlı ilerleme görüntüsü oluşturucu.
+
+generate_progress_image her çağrıda tüm tuvali baştan çizer. ProgressCompositor
+ise her çıktı boyutu için son tuvali saklar ve yalnızca durumu değişen
+parçaları yeniden çizer; yeniden boyutlandırılmış parça görüntüleri de
+boyut başına önbelleğe alınır. Çıktı generate_progress_image ile birebir aynıdır.
+Tuvaller ve parça önbelleği en son kullanılan max_sizes boyutla sınırlıdır.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from piece_set import revealed_mask
+
+
+class _Frame:
+    """Belirli bir çıktı boyutu için tuval ve çizildiği andaki parça durumları"""
+
+    def __init__(self, size, tile_size, painted, footer_box):
+        self.size = size
+        self.tile_size = tile_size
+        self.canvas = Image.new('RGB', size, color='black')
+        self.painted = painted
+        self.footer_box = footer_box
+        self.footer_tiles = set()
+
+
+class ProgressCompositor:
+    """Yalnızca değişen parçaları yeniden çizen durum bilgili kompozitör"""
+
+    def __init__(self, generator, encrypted_pieces, size=(800, 800), max_sizes=3):
+        self.generator = generator
+        self.pieces = encrypted_pieces
+        self.size = tuple(size)
+        self.max_sizes = max_sizes
+        self.rows, self.cols = generator._grid_shape(encrypted_pieces)
+        # çıktı boyutu -> _Frame, en son kullanılan sonda
+        self._frames = OrderedDict()
+        # parça boyutu -> {indeks: yeniden boyutlandırılmış parça}
+        self._tile_cache = {}
+        self._tile_bytes = 0
+        self._lock = threading.Lock()
+        self.tiles_painted = 0
+
+    def render(self, size=None, copy=True):
+        """Güncel ilerleme görüntüsü; copy=False canlı tuvali döndürür"""
+        size = tuple(size or self.size)
+        with self._lock:
+            frame = self._update_frame(size)
+            return frame.canvas.copy() if copy else frame.canvas
+
+    def render_delta(self, indices, size=None):
+        """Kareyi güncelle; verilen parçalar için (indeks, kutu, kırpılmış görüntü) döndür"""
+        size = tuple(size or self.size)
+        with self._lock:
+            frame = self._update_frame(size)
+            delta = []
+            for index in indices:
+                box = self.tile_box(index, size)
+                delta.append((index, box, frame.canvas.crop(box)))
+            return delta
+
+    def render_changes(self, size=None):
+        """Canlı tuvali güncelle; (tuval, değişen bölgenin kutusu) döndür
+
+        Tuval bu boyut için ilk kez kuruluyorsa kutu tüm tuvaldir; hiçbir
+        parça değişmediyse None'dır. Tuval kopyalanmaz, yalnızca okunmalıdır.
+        """
+        size = tuple(size or self.size)
+        with self._lock:
+            frame = self._get_frame(size)
+            state = self._revealed_state()
+            if frame is None:
+                frame = self._add_frame(self._build_frame(size, state))
+                return frame.canvas, (0, 0) + size
+
+            dirty = np.flatnonzero(state != frame.painted)
+            if not len(dirty):
+                return frame.canvas, None
+            boxes = [self.tile_box(index, size) for index in self._paint(frame, dirty, state)]
+            return frame.canvas, (min(box[0] for box in boxes), min(box[1] for box in boxes),
+                                  max(box[2] for box in boxes), max(box[3] for box in boxes))
+
+    def dirty_tiles(self, size=None):
+        """Son kareden bu yana durumu değişen parça indeksleri"""
+        size = tuple(size or self.size)
+        with self._lock:
+            frame = self._get_frame(size)
+            state = self._revealed_state()
+            if frame is None:
+                return np.arange(len(self.pieces))
+            return np.flatnonzero(state != frame.painted)
+
+    def tile_box(self, index, size=None):
+        """Parçanın verilen çıktı boyutundaki (left, upper, right, lower) kutusu"""
+        width, height = size or self.size
+        tile_width, tile_height = width // self.cols, height // self.rows
+        i, j = self.pieces[index]['position']
+        left, upper = j * tile_width, i * tile_height
+        return (left, upper, left + tile_width, upper + tile_height)
+
+    def invalidate(self):
+        """Tüm tuvalleri ve parça önbelleğini bırak (ör. yeni parça seti)"""
+        with self._lock:
+            self._frames.clear()
+            self._tile_cache.clear()
+            self._tile_bytes = 0
+
+    def nbytes(self):
+        """Tuvallerin ve önbellekteki parçaların yaklaşık bellek kullanımı"""
+        with self._lock:
+            frames = sum(w * h * 3 for w, h in self._frames)
+            return frames + self._tile_bytes
+
+    def _update_frame(self, size):
+        frame = self._get_frame(size)
+        state = self._revealed_state()
+
+        if frame is None:
+            frame = self._add_frame(self._build_frame(size, state))
+        else:
+            dirty = np.flatnonzero(state != frame.painted)
+            if len(dirty):
+                self._paint(frame, dirty, state)
+        return frame
+
+    def _get_frame(self, size):
+        frame = self._frames.get(size)
+        if frame is not None:
+            self._frames.move_to_end(size)
+        return frame
+
+    def _add_frame(self, frame):
+        # En eski boyutun tuvali ve (başka tuval kullanmıyorsa) parça önbelleği bırakılır
+        self._frames[frame.size] = frame
+        while len(self._frames) > self.max_sizes:
+            _, evicted = self._frames.popitem(last=False)
+            if all(other.tile_size != evicted.tile_size for other in self._frames.values()):
+                tiles = self._tile_cache.pop(evicted.tile_size, {})
+                self._tile_bytes -= sum(tile.width * tile.height * len(tile.getbands())
+                                        for tile in tiles.values())
+        return frame
+
+    def _revealed_state(self):
+        return revealed_mask(self.pieces)
+
+    def _build_frame(self, size, state):
+        tile_size = (size[0] // self.cols, size[1] // self.rows)
+        frame = _Frame(size, tile_size, state.copy(), None)
+        for index in range(len(self.pieces)):
+            self._paste(frame, index)
+        left, upper, right, lower = self.generator._draw_footer(frame.canvas)
+        frame.footer_box = (max(0, int(left)), max(0, int(upper)),
+                            min(size[0], int(right) + 1), min(size[1], int(lower) + 1))
+        frame.footer_tiles = {index for index in range(len(self.pieces))
+                              if self._overlaps(self.tile_box(index, size), frame.footer_box)}
+        return frame
+
+    def _paint(self, frame, indices, state):
+        indices = set(indices.tolist())
+        # Alt imza parçaların üstüne yumuşatılarak çizilir; altındaki bir parça
+        # değiştiyse imzanın kapladığı tüm parçalar yeniden çizilip imza bir kez basılır
+        touches_footer = not indices.isdisjoint(frame.footer_tiles)
+        if touches_footer:
+            indices |= frame.footer_tiles
+
+        if touches_footer:
+            # Izgaranın altında kalan kenar boşluğu hiçbir parçaya ait değildir;
+            # imza oraya ikinci kez basılıp koyulaşmasın diye kutu önce siyaha döner
+            frame.canvas.paste((0, 0, 0), frame.footer_box)
+        for index in sorted(indices):
+            self._paste(frame, index)
+        if touches_footer:
+            self.generator._draw_footer(frame.canvas)
+        frame.painted[:] = state
+        return indices
+
+    def _paste(self, frame, index):
+        box = self.tile_box(index, frame.size)
+        frame.canvas.paste(self._tile(index, frame.tile_size), box[:2])
+        self.tiles_painted += 1
+
+    def _tile(self, index, tile_size):
+        piece = self.pieces[index]
+        if not piece['is_revealed']:
+            return self.generator._render_tile(piece, tile_size)
+
+        # Çözülmüş parçanın yeniden boyutlandırılmış hali boyut başına saklanır
+        tiles = self._tile_cache.setdefault(tile_size, {})
+        tile = tiles.get(index)
+        if tile is None:
+            tile = self.generator._render_tile(piece, tile_size)
+            tiles[index] = tile
+            self._tile_bytes += tile.width * tile.height * len(tile.getbands())
+        return tile
+
+    @staticmethod
+    def _overlaps(box, other):
+        return (box[0] < other[2] and other[0] < box[2] and
+                box[1] < other[3] and other[1] < box[3])
@@ -0,0 +1,329 @@
+"""
+Temel sanat çizimi için süreç havuzu ("render farm").
+
+matplotlib/PIL çizimi CPU'ya bağlıdır, GIL ile sıralanır ve pyplot'un global
+durumu iş parçacığı güvenli değildir. RenderFarm önceden başlatılmış worker
+süreçleri tutar; her worker matplotlib'i ve yazı tiplerini açılışta yükleyip
+her temayı küçük boyutta bir kez çizerek ısınır. (tema, boyut, tohum) işleri
+boştaki worker'a kendi borusundan verilir, pikseller ana süreçteki paylaşımlı
+bellek halkasının (shm_ring) bir yuvasına yazılır; böylece büyük görüntüler
+pickle edilip boru üzerinden taşınmaz.
+"""
+
+import atexit
+import collections
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from multiprocessing import shared_memory
+from multiprocessing.connection import wait
+
+import numpy as np
+from PIL import Image
+
+from fhe_raster import BASE_ART_SIZE
+from shm_ring import SharedRing, ring_view
+
+WARMUP_SIZE = 64
+
+# render() için varsayılan bekleme süresi (saniye); çizim normalde birkaç saniye sürer
+RENDER_TIMEOUT = 60
+
+# Halka yuvası varsayılan boyuttaki bir RGB tuvali alır; büyükler tek seferlik bölüte düşer
+SLOT_BYTES = BASE_ART_SIZE * BASE_ART_SIZE * 3
+
+
+def _worker_main(conn):
+    """Worker döngüsü: ısın, sonra borudan iş al ve paylaşımlı belleğe yaz"""
+    # Ağır importlar yalnızca worker'da ve bir kez
+    import matplotlib
+    matplotlib.use('Agg')
+    from fhe_art_engine import FHEArtGenerator, RENDER_BACKENDS
+    from fhe_raster import THEME_LIMITS
+
+    generator = FHEArtGenerator()
+    try:
+        for backend in RENDER_BACKENDS:
+            for theme in THEME_LIMITS:
+                generator.render_base_art(theme, backend, size=WARMUP_SIZE, seed=0)
+    except Exception as e:
+        conn.send(('failed', None, f"Warm-up failed: {e}"))
+        return
+    conn.send(('ready', None, None))
+
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        job_id, theme, size, seed, backend, (shm_name, offset) = job
+        try:
+            img = generator.render_base_art(theme, backend, size=size, seed=seed)
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            shape = (img.height, img.width, 3)
+            if offset is not None:
+                ring_view((shm_name, offset), shape)[...] = np.asarray(img)
+            else:
+                shm = shared_memory.SharedMemory(name=shm_name)
+                try:
+                    out = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+                    out[...] = np.asarray(img)
+                    del out
+                finally:
+                    shm.close()
+            conn.send(('done', job_id, None))
+        except Exception as e:
+            conn.send(('error', job_id, f"{type(e).__name__}: {e}"))
+
+
+class _Job:
+    def __init__(self, request, size, slot, shm):
+        self.request = request
+        self.size = size
+        self.slot = slot
+        self.shm = shm
+        self.future = Future()
+        self.attempts = 0
+
+
+class _Worker:
+    def __init__(self, index, process, conn):
+        self.index = index
+        self.process = process
+        self.conn = conn
+        self.ready = False
+        self.job = None
+
+
+class RenderFarm:
+    """Isınmış worker süreçleriyle (tema, boyut, tohum) çizim havuzu"""
+
+    def __init__(self, workers=None, start_method='spawn', ready_timeout=120):
+        self.workers = workers or os.cpu_count() or 1
+        self.ready_timeout = ready_timeout
+        self._ctx = multiprocessing.get_context(start_method)
+        self._procs = {}
+        self._backlog = collections.deque()
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._ready = threading.Semaphore(0)
+        self._wakeup = None
+        self._ring = None
+        self._collector = None
+        self._closed = False
+        self._startup_error = None
+        self.jobs_done = 0
+        self.jobs_failed = 0
+        self.restarts = 0
+
+    def start(self, wait=True):
+        """Worker'ları başlat; wait=True ise hepsi ısınana kadar bekle"""
+        with self._lock:
+            if self._collector is not None:
+                return self
+            self._wakeup = self._ctx.Pipe(duplex=False)
+            self._ring = SharedRing(2 * self.workers, SLOT_BYTES)
+            for index in range(self.workers):
+                self._spawn(index)
+            self._collector = threading.Thread(target=self._collect, name='render-farm',
+                                               daemon=True)
+            self._collector.start()
+            atexit.register(self.close)
+
+        if wait:
+            for _ in range(self.workers):
+                if not self._ready.acquire(timeout=self.ready_timeout):
+                    raise TimeoutError("Render workers did not become ready in time")
+                if self._startup_error:
+                    raise RuntimeError(self._startup_error)
+        return self
+
+    def submit(self, theme, size, seed=None, backend='matplotlib'):
+        """Çizim işini sıraya koy; PIL.Image döndüren bir Future verir
+
+        Worker'lar ısınamadıysa havuz bozuktur; iş ısınma hatasıyla reddedilir.
+        """
+        if self._closed:
+            raise RuntimeError("Render farm is closed")
+        if self._startup_error:
+            raise RuntimeError(self._startup_error)
+        if self._collector is None:
+            self.start(wait=False)
+        if isinstance(size, int):
+            size = (size, size)
+
+        width, height = size
+        slot = self._ring.acquire(width * height * 3)
+        if slot is not None:
+            shm, address = None, slot.address
+        else:
+            shm = shared_memory.SharedMemory(create=True, size=width * height * 3)
+            address = (shm.name, None)
+        job = _Job((next(self._ids), theme, (width, height), seed, backend, address),
+                   (width, height), slot, shm)
+        with self._lock:
+            broken = self._startup_error
+            if not broken:
+                self._backlog.append(job)
+                self._dispatch()
+        if broken:
+            # Kontrol ile sıraya koyma arasında ısınma başarısız olduysa
+            self._finish(job, error=RuntimeError(broken))
+        return job.future
+
+    def render(self, theme, size, seed=None, backend='matplotlib', timeout=RENDER_TIMEOUT):
+        future = self.submit(theme, size, seed, backend)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            raise TimeoutError(f"Render did not finish within {timeout}s") from None
+
+    def stats(self):
+        with self._lock:
+            workers = list(self._procs.values())
+            return {
+                'workers': self.workers,
+                'ready': sum(worker.ready for worker in workers),
+                'busy': sum(worker.job is not None for worker in workers),
+                'queued': len(self._backlog),
+                'jobs_done': self.jobs_done,
+                'jobs_failed': self.jobs_failed,
+                'restarts': self.restarts,
+                'startup_error': self._startup_error,
+                'ring': self._ring.stats() if self._ring else None,
+            }
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._collector is None:
+            return
+        self._wakeup[1].send(None)
+        self._collector.join(timeout=5)
+
+        with self._lock:
+            workers = list(self._procs.values())
+            jobs = list(self._backlog) + [w.job for w in workers if w.job is not None]
+            self._backlog.clear()
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            worker.process.join(timeout=5)
+            if worker.process.is_alive():
+                worker.process.terminate()
+            worker.conn.close()
+        for job in jobs:
+            self._finish(job, error=RuntimeError("Render farm closed"))
+        self._ring.close()
+
+    def _spawn(self, index):
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(target=_worker_main, args=(child_conn,),
+                                    name=f'render-worker-{index}', daemon=True)
+        process.start()
+        child_conn.close()
+        self._procs[index] = _Worker(index, process, parent_conn)
+
+    def _dispatch(self):
+        # _lock altında çağrılır: sıradaki işleri boştaki hazır worker'lara ver
+        for worker in self._procs.values():
+            if not self._backlog:
+                return
+            if worker.ready and worker.job is None:
+                worker.job = self._backlog.popleft()
+                worker.job.attempts += 1
+                try:
+                    worker.conn.send(worker.job.request)
+                except OSError:
+                    # Ölü worker; toplayıcı boruyu kapalı görünce işi yeniden sıraya koyar
+                    pass
+
+    def _collect(self):
+        # Ortak kuyruk yerine worker başına boru: ölen worker kilit tutarak
+        # diğerlerini kilitleyemez, hangi işin kaybolduğu da bellidir
+        while not self._closed:
+            with self._lock:
+                conns = {worker.conn: worker for worker in self._procs.values()}
+            for conn in wait(list(conns) + [self._wakeup[0]]):
+                worker = conns.get(conn)
+                if worker is None:
+                    return
+                try:
+                    kind, _, error = conn.recv()
+                except (EOFError, OSError):
+                    self._restart(worker)
+                    continue
+                self._handle(worker, kind, error)
+
+    def _handle(self, worker, kind, error):
+        job = None
+        failed = []
+        with self._lock:
+            if kind == 'ready':
+                worker.ready = True
+            elif kind == 'failed':
+                # Isınma hatası yeniden başlatmayla düzelmez: havuz bozuk sayılır,
+                # bekleyen ve yeni işler aynı hatayla reddedilir
+                self._startup_error = error
+                failed = list(self._backlog)
+                self._backlog.clear()
+            else:
+                job, worker.job = worker.job, None
+            self._dispatch()
+
+        if kind in ('ready', 'failed'):
+            self._ready.release()
+        elif job is not None:
+            self._finish(job, error=RuntimeError(error) if kind == 'error' else None)
+        for job in failed:
+            self._finish(job, error=RuntimeError(error))
+
+    def _restart(self, worker):
+        # Worker yeniden başlatılır; üzerindeki iş bir kez başka worker'da
+        # denenir, ikinci çöküşte başarısız sayılır
+        worker.conn.close()
+        worker.process.join(timeout=1)
+        with self._lock:
+            job, worker.job = worker.job, None
+            if self._startup_error:
+                # Bozuk havuzda yerine yenisi başlatılmaz (o da ısınamaz)
+                del self._procs[worker.index]
+            elif not self._closed:
+                self.restarts += 1
+                self._spawn(worker.index)
+                if job is not None and job.attempts < 2:
+                    self._backlog.appendleft(job)
+                    job = None
+        if job is not None:
+            error = self._startup_error or f"Render worker {worker.index} exited"
+            self._finish(job, error=RuntimeError(error))
+
+    def _finish(self, job, error=None):
+        try:
+            if error is None:
+                width, height = job.size
+                if job.slot is not None:
+                    # Görüntü önbellekte uzun yaşar; yuvayı tutmamak için tek kopya
+                    img = Image.fromarray(job.slot.ndarray((height, width, 3)))
+                else:
+                    img = Image.frombytes('RGB', (width, height), job.shm.buf[:width * height * 3])
+                self.jobs_done += 1
+                job.future.set_result(img)
+            else:
+                self.jobs_failed += 1
+                job.future.set_exception(error)
+        finally:
+            if job.slot is not None:
+                job.slot.release()
+            else:
+                job.shm.close()
+                job.shm.unlink()
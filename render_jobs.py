@@ -0,0 +1,88 @@
+"""
+Süreç havuzunda çalıştırılabilen saf CPU işleri.
+
+Buradaki fonksiyonlar yalnızca seçilebilir (picklable) argüman alır ve
+döndürür; Flask ya da session durumuna dokunmaz. Web uygulamaları bunları
+doğrudan ya da bir ProcessPoolExecutor üzerinden çağırır.
+"""
+
+import os
+
+import numpy as np
+
+import image_encoder
+from art_cache import ArtCache
+from fhe_art_engine import FHEArtGenerator
+from shm_ring import ring_view
+
+# Worker süreci başına tek generator (ve sanat önbelleği)
+_generator = None
+
+
+def _art_generator():
+    global _generator
+    if _generator is None:
+        _generator = FHEArtGenerator(art_cache=ArtCache(
+            max_bytes=int(os.environ.get('FHE_ART_CACHE_MB', '256')) * 1024 * 1024,
+            disk_dir=os.environ.get('FHE_ART_CACHE_DIR') or None,
+            disk_max_bytes=int(os.environ.get('FHE_ART_CACHE_DISK_MB', '0')) * 1024 * 1024 or None
+        ))
+    return _generator
+
+
+def cache_report():
+    """Bu worker'ın sanat önbelleği sayaçları: (pid, stats)
+
+    Önbellek worker başınadır; ana süreç raporları pid'e göre toplar.
+    """
+    return os.getpid(), _art_generator().art_cache.stats()
+
+
+def warm_up(themes):
+    """Worker'ı ısıt: importlar, yazı tipleri ve temaların önbelleğe alınması"""
+    generator = _art_generator()
+    for theme in themes:
+        generator.render_base_art(theme)
+    return cache_report()
+
+
+def render_pieces(theme, seed, grid, key, backend=None):
+    """Temel sanatı çiz ve verilen anahtarla şifrele
+
+    (temel görüntü dizisi, (satır, sütun, h, w, kanal) şifreli dizi, cache_report)
+    döndürür; çağıran taraf PieceSet'i split_tiles ile yeniden kurar.
+    """
+    generator = _art_generator()
+    generator.encryption_key = key
+    img = generator.render_base_art(theme, backend, seed=seed)
+    pieces = generator.encrypt_art_pieces(img, grid)
+    return np.asarray(img), pieces.encrypted, cache_report()
+
+
+def render_pieces_shared(theme, seed, grid, key, backend, address, capacity):
+    """render_pieces gibi, ama sonuçları verilen paylaşımlı bellek yuvasına yazar
+
+    Temel görüntü yuvanın başına, şifreli parçalar hemen arkasına yazılır ve
+    ('shared', temel şekli, şifreli şekli, cache_report) döner. Yuvaya sığmazsa
+    ('inline', temel dizisi, şifreli dizi, cache_report) döner.
+    """
+    generator = _art_generator()
+    generator.encryption_key = key
+    base = np.asarray(generator.render_base_art(theme, backend, seed=seed))
+    tiles = FHEArtGenerator.split_tiles(base, *grid)
+    if base.nbytes + tiles.size * base.itemsize > capacity:
+        return 'inline', base, generator._encrypt_image_data(tiles), cache_report()
+
+    shared_base = ring_view(address, base.shape)
+    shared_base[...] = base
+    encrypted = ring_view(address, tiles.shape, offset=base.nbytes)
+    generator._encrypt_image_data(tiles, out=encrypted)
+    return 'shared', base.shape, tiles.shape, cache_report()
+
+
+def encode_image(img, fmt='png', profile='interactive'):
+    """Görüntüyü profile göre kodla; (bayt, saniye) döndür
+
+    Süre/boyut sayaçları çağıran süreçte image_encoder.record ile tutulur.
+    """
+    return image_encoder.encode_timed(img, fmt, profile)
@@ -0,0 +1,284 @@
+"""
+Web session durumu için takılabilir depolama arka uçları.
+
+Arka uçlar canlı nesneleri değil, session'ın kompakt JSON durumunu (anahtar,
+ızgara, açılma bit haritası, eser parametreleri) saklar. Bellek arka ucu tek
+süreç içindir; SQLite ve Redis protokolü konuşan arka uçlar aynı portun
+arkasındaki birden fazla worker sürecinin session'ları paylaşmasını sağlar.
+"""
+
+import abc
+import base64
+import socket
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse, unquote
+
+import numpy as np
+
+
+def pack_bitmap(flags):
+    """Bool dizisini base64 bit haritasına çevir"""
+    packed = np.packbits(np.asarray(flags, dtype=bool))
+    return base64.b64encode(packed.tobytes()).decode('ascii')
+
+
+def unpack_bitmap(text, count):
+    """pack_bitmap çıktısını count uzunluğunda bool dizisine geri çevir"""
+    packed = np.frombuffer(base64.b64decode(text), dtype=np.uint8)
+    return np.unpackbits(packed, count=count).astype(bool)
+
+
+class SessionBackend(abc.ABC):
+    """Session id -> JSON durum metni; kayıtlar ttl saniye sonra düşer
+
+    Alt sınıflar load, save, delete ve sweep'i tanımlamak zorundadır.
+    """
+
+    def __init__(self, ttl=1800):
+        self.ttl = ttl
+
+    @abc.abstractmethod
+    def load(self, session_id):
+        """Durum metnini döndür (yoksa ya da süresi dolmuşsa None)"""
+
+    @abc.abstractmethod
+    def save(self, session_id, state):
+        """Durum metnini yaz ve süresini yenile"""
+
+    def touch(self, session_id):
+        """Durumu değiştirmeden süresini yenile"""
+        state = self.load(session_id)
+        if state is not None:
+            self.save(session_id, state)
+
+    @abc.abstractmethod
+    def delete(self, session_id):
+        """Kaydı sil (yoksa sessizce geç)"""
+
+    @abc.abstractmethod
+    def sweep(self):
+        """Süresi dolan kayıtları temizle; temizlenen kayıt sayısını döndür"""
+
+    def close(self):
+        pass
+
+    def _expires(self):
+        return time.time() + self.ttl if self.ttl else float('inf')
+
+
+class MemoryBackend(SessionBackend):
+    """Tek süreçlik sözlük arka ucu"""
+
+    def __init__(self, ttl=1800):
+        super().__init__(ttl)
+        self._states = {}
+        self._lock = threading.Lock()
+
+    def load(self, session_id):
+        with self._lock:
+            entry = self._states.get(session_id)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._states[session_id]
+                return None
+            return entry[0]
+
+    def save(self, session_id, state):
+        with self._lock:
+            self._states[session_id] = (state, self._expires())
+
+    def touch(self, session_id):
+        with self._lock:
+            entry = self._states.get(session_id)
+            if entry is not None:
+                self._states[session_id] = (entry[0], self._expires())
+
+    def delete(self, session_id):
+        with self._lock:
+            self._states.pop(session_id, None)
+
+    def sweep(self):
+        now = time.time()
+        with self._lock:
+            expired = [sid for sid, (_, expires) in self._states.items() if expires <= now]
+            for sid in expired:
+                del self._states[sid]
+        return len(expired)
+
+
+class SQLiteBackend(SessionBackend):
+    """Yerel dosya üzerinde, süreçler arası paylaşılan SQLite arka ucu"""
+
+    def __init__(self, path='fhe_sessions.db', ttl=1800):
+        super().__init__(ttl)
+        self.path = path
+        self._local = threading.local()
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                'id TEXT PRIMARY KEY, state TEXT NOT NULL, expires REAL NOT NULL)'
+            )
+
+    def _connection(self):
+        # sqlite3 bağlantıları iş parçacıkları arasında paylaşılmaz
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def load(self, session_id):
+        row = self._connection().execute(
+            'SELECT state FROM sessions WHERE id = ? AND expires > ?',
+            (session_id, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def save(self, session_id, state):
+        with self._connection() as conn:
+            conn.execute(
+                'INSERT INTO sessions (id, state, expires) VALUES (?, ?, ?) '
+                'ON CONFLICT(id) DO UPDATE SET state = excluded.state, expires = excluded.expires',
+                (session_id, state, self._expires())
+            )
+
+    def touch(self, session_id):
+        with self._connection() as conn:
+            conn.execute('UPDATE sessions SET expires = ? WHERE id = ?',
+                         (self._expires(), session_id))
+
+    def delete(self, session_id):
+        with self._connection() as conn:
+            conn.execute('DELETE FROM sessions WHERE id = ?', (session_id,))
+
+    def sweep(self):
+        with self._connection() as conn:
+            return conn.execute('DELETE FROM sessions WHERE expires <= ?',
+                                (time.time(),)).rowcount
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RedisBackend(SessionBackend):
+    """RESP protokolü konuşan herhangi bir sunucuya (Redis, KeyDB, yerel taklit) bağlanır"""
+
+    def __init__(self, host='localhost', port=6379, db=0, password=None,
+                 ttl=1800, prefix='fhe-art:session:', timeout=5):
+        super().__init__(ttl)
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.prefix = prefix
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def load(self, session_id):
+        value = self._command('GET', self.prefix + session_id)
+        return value.decode('utf-8') if value is not None else None
+
+    def save(self, session_id, state):
+        if self.ttl:
+            self._command('SET', self.prefix + session_id, state, 'EX', self.ttl)
+        else:
+            self._command('SET', self.prefix + session_id, state)
+
+    def touch(self, session_id):
+        if self.ttl:
+            self._command('EXPIRE', self.prefix + session_id, self.ttl)
+
+    def delete(self, session_id):
+        self._command('DEL', self.prefix + session_id)
+
+    def sweep(self):
+        # Anahtarlar EX ile kendiliğinden düşer
+        return 0
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn[0].close()
+            self._local.conn = None
+
+    def _command(self, *args):
+        # Kopan bağlantı bir kez yeniden kurulur
+        for attempt in (0, 1):
+            sock, reader = self._connection()
+            try:
+                sock.sendall(self._encode(args))
+                return self._read_reply(reader)
+            except (ConnectionError, socket.timeout):
+                self.close()
+                if attempt:
+                    raise
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            conn = (sock, sock.makefile('rb'))
+            self._local.conn = conn
+            if self.password:
+                self._command('AUTH', self.password)
+            if self.db:
+                self._command('SELECT', self.db)
+        return conn
+
+    @staticmethod
+    def _encode(args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode('utf-8')
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        return b''.join(parts)
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b'+':
+            return payload.decode('utf-8')
+        if kind == b'-':
+            raise RuntimeError(f"Redis error: {payload.decode('utf-8')}")
+        if kind == b':':
+            return int(payload)
+        if kind == b'$':
+            length = int(payload)
+            if length < 0:
+                return None
+            data = reader.read(length + 2)
+            return data[:-2]
+        if kind == b'*':
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply(reader) for _ in range(length)]
+        raise RuntimeError(f"Unexpected Redis reply: {line!r}")
+
+
+def create_backend(url=None, ttl=1800):
+    """'memory://', 'sqlite:///yol.db' ya da 'redis://[:parola@]host:port/db' adresinden arka uç"""
+    if not url or url == 'memory://':
+        return MemoryBackend(ttl)
+
+    parsed = urlparse(url)
+    if parsed.scheme == 'sqlite':
+        path = unquote(parsed.netloc + parsed.path)
+        # sqlite:///goreli.db -> goreli.db, sqlite:////mutlak.db -> /mutlak.db
+        if path.startswith('/'):
+            path = path[1:]
+        return SQLiteBackend(path or 'fhe_sessions.db', ttl)
+    if parsed.scheme == 'redis':
+        db = int(parsed.path.strip('/') or 0)
+        return RedisBackend(parsed.hostname or 'localhost', parsed.port or 6379, db,
+                            unquote(parsed.password) if parsed.password else None, ttl)
+    raise ValueError(f"Unknown session backend: {url}")
@@ -0,0 +1,236 @@
+"""
+Web uygulaması için iş parçacığı güvenli, sınırlı session deposu.
+
+Her session kendi kilidini taşır. Depo en fazla max_sessions session ve
+max_bytes bellek tutar; boşta ttl saniyeden uzun kalan session'lar ve
+bütçe aşıldığında en uzun süredir kullanılmayanlar (LRU) çıkarılır.
+
+Asıl kayıt session_backend arka ucundaki kompakt durumdur; depo yalnızca bu
+süreçteki canlı nesnelerin önbelleğidir. Çıkarılan ya da başka bir worker'da
+değişen session, durumundan yeniden kurulur.
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from session_backend import MemoryBackend
+
+
+class Session:
+    """Tek bir istemcinin generator'ı, verisi ve kilidi"""
+
+    def __init__(self, session_id, generator, data):
+        self.id = session_id
+        self.generator = generator
+        self.data = data
+        # reveal_multiple gibi iç içe çağrılar için yeniden girilebilir kilit
+        self.lock = threading.RLock()
+        self.created = datetime.now()
+        self.last_access = time.monotonic()
+        self.nbytes = 0
+        # Arka uçtaki son bilinen durum ve revizyonu
+        self.state = None
+        self.revision = 0
+
+
+class SessionStore:
+    """TTL, adet ve bellek bütçeli LRU session deposu
+    
+    factory(session_id) -> (generator, data) boş bir session kurar,
+    dump(session) -> dict kompakt durumu üretir, restore(session, dict) onu
+    canlı session'a uygular.
+    """
+
+    def __init__(self, factory, dump, restore, sizeof=None, backend=None,
+                 max_sessions=1000, ttl=1800, max_bytes=1024 * 1024 * 1024,
+                 sweep_interval=60):
+        self.factory = factory
+        self.dump = dump
+        self.restore = restore
+        self.sizeof = sizeof or (lambda session: 0)
+        self.backend = backend or MemoryBackend(ttl)
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self._sessions = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Yükle-ya-da-oluştur adımını tek parça yapar; aynı id için iki session kurulmaz
+        self._create_lock = threading.Lock()
+        self._janitor = None
+        self.evictions = {'ttl': 0, 'count': 0, 'memory': 0}
+
+    def get(self, session_id):
+        """Var olan session'ı döndür (arka uçta yoksa ya da süresi dolmuşsa None)"""
+        self._ensure_janitor()
+        raw = self.backend.load(session_id)
+        if raw is None:
+            with self._lock:
+                session = self._sessions.get(session_id)
+                if session is not None and self._expired(session, time.monotonic()):
+                    self._drop(session_id, 'ttl')
+                elif session is not None and session.revision:
+                    # Kaydedilmişti ama arka uçtan silinmiş (başka bir worker'da remove)
+                    self._drop(session_id)
+            return None
+
+        session = self._live_session(session_id)
+        record = json.loads(raw)
+        if self._is_newer(session, record):
+            # Durum başka bir worker'da ilerlemiş ya da canlı nesne çıkarılmış
+            with session.lock:
+                if self._is_newer(session, record):
+                    self.restore(session, record['state'])
+                    session.state = record['state']
+                    session.revision = record['revision']
+        return session
+
+    def get_or_create(self, session_id):
+        session = self.get(session_id)
+        if session is not None:
+            return session
+        with self._create_lock:
+            # Kilidi beklerken başka bir iş parçacığı oluşturup kaydetmiş olabilir
+            session = self.get(session_id)
+            if session is None:
+                session = self._live_session(session_id)
+                self.touch(session)
+        return session
+
+    def touch(self, session):
+        """Session değiştikten sonra durumunu kaydet, boyutunu güncelle ve bütçeyi uygula"""
+        with session.lock:
+            state = self.dump(session)
+            if state != session.state:
+                # Revizyon kayıttan sonra artar; revision > 0 ise durum arka uçtadır
+                record = {'revision': session.revision + 1, 'state': state}
+                self.backend.save(session.id, json.dumps(record, separators=(',', ':')))
+                session.revision = record['revision']
+                session.state = state
+            else:
+                self.backend.touch(session.id)
+            nbytes = self.sizeof(session)
+
+        with self._lock:
+            if self._sessions.get(session.id) is not session:
+                return
+            self._bytes += nbytes - session.nbytes
+            session.nbytes = nbytes
+            self._mark_used(session)
+            self._enforce_limits(keep=session.id)
+
+    def remove(self, session_id):
+        self.backend.delete(session_id)
+        with self._lock:
+            return self._drop(session_id) is not None
+
+    def sweep(self):
+        """Süresi dolan session'ları çıkar"""
+        self.backend.sweep()
+        now = time.monotonic()
+        with self._lock:
+            expired = [sid for sid, session in self._sessions.items()
+                       if self._expired(session, now)]
+            for sid in expired:
+                self._drop(sid, 'ttl')
+        return len(expired)
+
+    @staticmethod
+    def _is_newer(session, record):
+        # Aynı revizyonu iki worker yazdıysa son yazan kazanır
+        return (record['revision'] > session.revision or
+                (record['revision'] == session.revision and record['state'] != session.state))
+
+    def _live_session(self, session_id):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is not None and self._expired(session, time.monotonic()):
+                self._drop(session_id, 'ttl')
+                session = None
+            if session is not None:
+                self._mark_used(session)
+                return session
+
+        generator, data = self.factory(session_id)
+        with self._lock:
+            # Bu arada başka bir iş parçacığı oluşturmuş olabilir
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = Session(session_id, generator, data)
+                self._sessions[session_id] = session
+            self._mark_used(session)
+            self._enforce_limits(keep=session_id)
+        return session
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'live_sessions': len(self._sessions),
+                'bytes_held': self._bytes,
+                'max_sessions': self.max_sessions,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl,
+                'backend': type(self.backend).__name__,
+                'evictions': dict(self.evictions),
+            }
+
+    def _mark_used(self, session):
+        session.last_access = time.monotonic()
+        self._sessions.move_to_end(session.id)
+
+    def _expired(self, session, now):
+        return self.ttl is not None and now - session.last_access > self.ttl
+
+    def _drop(self, session_id, reason=None):
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self._bytes -= session.nbytes
+            if reason:
+                self.evictions[reason] += 1
+        return session
+
+    def _enforce_limits(self, keep=None):
+        # En eski kullanılandan başla; az önce kullanılan session'a dokunma
+        while len(self._sessions) > self.max_sessions:
+            if not self._evict_oldest('count', keep):
+                break
+        # Bütçeyi tek başına aşan session komşularını çıkaramaz; kendisi bırakılır,
+        # sonraki istekte arka uçtaki durumundan yeniden kurulur
+        kept = self._sessions.get(keep)
+        if kept is not None and kept.nbytes > self.max_bytes:
+            self._drop(keep, 'memory')
+        while self._bytes > self.max_bytes:
+            if not self._evict_oldest('memory', keep):
+                break
+
+    def _evict_oldest(self, reason, keep):
+        for session_id in self._sessions:
+            if session_id != keep:
+                self._drop(session_id, reason)
+                return True
+        return False
+
+    def _ensure_janitor(self):
+        if self._janitor is not None or not self.sweep_interval:
+            return
+        with self._lock:
+            if self._janitor is None:
+                self._janitor = threading.Thread(target=self._janitor_loop,
+                                                 name='session-janitor', daemon=True)
+                self._janitor.start()
+
+    def _janitor_loop(self):
+        while True:
+            time.sleep(self.sweep_interval)
+            self.sweep()
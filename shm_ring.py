@@ -0,0 +1,133 @@
+"""
+Süreçler arası görüntü taşıma için paylaşımlı bellek halkası.
+
+Sahip süreç tek bir SharedMemory bölütünü sabit boyutlu yuvalara böler.
+Worker'a yalnızca (bölüt adı, ofset) adresi gönderilir; worker tuvali ya da
+parça dizisini doğrudan yuvaya yazar. Sahip taraf yuva üzerinde kopyasız
+NumPy görünümleri açar; her görünüm yuvanın referans sayısını artırır ve
+görünüm (ve ondan türeyen dilimler) çöp toplandığında yuva kendiliğinden
+serbest kalır. Böylece 800x800-4K kareler pickle edilip kopyalanmaz.
+"""
+
+import collections
+import threading
+import weakref
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Worker sürecinde açılan halka bölütleri (ad -> SharedMemory), süreç ömrünce açık
+_attached = {}
+
+
+def attach(name):
+    """Adı verilen halka bölütüne bu süreçte bir kez bağlan"""
+    shm = _attached.get(name)
+    if shm is None:
+        shm = _attached[name] = shared_memory.SharedMemory(name=name)
+    return shm
+
+
+def ring_view(address, shape, dtype=np.uint8, offset=0):
+    """Worker tarafı: (ad, ofset) adresindeki yuvaya yazılabilir görünüm"""
+    name, base = address
+    return np.ndarray(shape, dtype=dtype, buffer=attach(name).buf, offset=base + offset)
+
+
+class Slot:
+    """Halkadaki tek yuva; release çağrılana ve görünümler ölene kadar ayrılmış kalır"""
+
+    def __init__(self, ring, index):
+        self.ring = ring
+        self.index = index
+        self.offset = index * ring.slot_bytes
+        self.refs = 1
+
+    @property
+    def address(self):
+        """Worker'a gönderilecek (bölüt adı, ofset)"""
+        return self.ring.name, self.offset
+
+    @property
+    def capacity(self):
+        return self.ring.slot_bytes
+
+    def ndarray(self, shape, dtype=np.uint8, offset=0):
+        """Yuva üzerinde kopyasız görünüm; görünüm yaşadıkça yuva serbest kalmaz"""
+        dtype = np.dtype(dtype)
+        if offset + int(np.prod(shape)) * dtype.itemsize > self.capacity:
+            raise ValueError(f"View {shape} {dtype} does not fit in a {self.capacity} byte slot")
+        arr = np.ndarray(shape, dtype=dtype, buffer=self.ring.shm.buf,
+                         offset=self.offset + offset)
+        self.retain()
+        weakref.finalize(arr, self.release)
+        return arr
+
+    def retain(self):
+        self.ring._retain(self)
+
+    def release(self):
+        self.ring._release(self)
+
+
+class SharedRing:
+    """Sabit boyutlu, referans sayımlı yuvalardan oluşan paylaşımlı bellek halkası"""
+
+    def __init__(self, slots, slot_bytes):
+        if slots < 1 or slot_bytes < 1:
+            raise ValueError(f"Invalid ring geometry: {slots} x {slot_bytes} bytes")
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * slot_bytes)
+        self._free = collections.deque(range(slots))
+        self._lock = threading.Lock()
+        self._closed = False
+        self.acquired = 0
+        self.misses = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def acquire(self, nbytes=None):
+        """Boş bir yuva ayır; sığmıyorsa ya da halka doluysa None (çağıran kopyalamaya düşer)"""
+        with self._lock:
+            if self._closed or (nbytes or 0) > self.slot_bytes or not self._free:
+                self.misses += 1
+                return None
+            self.acquired += 1
+            return Slot(self, self._free.popleft())
+
+    def stats(self):
+        with self._lock:
+            return {
+                'slots': self.slots,
+                'slot_bytes': self.slot_bytes,
+                'in_use': self.slots - len(self._free),
+                'acquired': self.acquired,
+                'misses': self.misses,
+            }
+
+    def close(self):
+        """Bölütü kaldır; açık görünümler varsa eşleme süreç bitene kadar kalır"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+        try:
+            self.shm.close()
+        except BufferError:
+            pass
+        self.shm.unlink()
+
+    def _retain(self, slot):
+        with self._lock:
+            slot.refs += 1
+
+    def _release(self, slot):
+        with self._lock:
+            if slot.refs <= 0:
+                return
+            slot.refs -= 1
+            if slot.refs == 0 and not self._closed:
+                self._free.append(slot.index)
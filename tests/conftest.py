@@ -0,0 +1,8 @@
+"""Testler depo kökündeki modülleri paket kurulumu olmadan import eder."""
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,71 @@
+import os
+
+import numpy as np
+from PIL import Image
+
+from art_cache import ArtCache
+from fhe_art_engine import FHEArtGenerator
+
+
+def image(value, size=10):
+    return Image.new('RGB', (size, size), (value, value, value))
+
+
+def test_byte_budget_evicts_least_recently_used():
+    cache = ArtCache(max_bytes=3 * 300)
+    for key in 'abc':
+        cache.put(key, image(0))
+    cache.get('a')
+    cache.put('d', image(0))
+    assert cache.get('b') is None
+    assert all(cache.get(key) is not None for key in 'acd')
+    stats = cache.stats()
+    assert stats['bytes'] == 900
+    assert stats['evictions'] == 1
+
+
+def test_image_larger_than_budget_is_not_kept():
+    cache = ArtCache(max_bytes=100)
+    cache.put('big', image(0))
+    assert cache.stats()['entries'] == 0
+
+
+def test_disk_tier_survives_a_new_process_and_is_trimmed(tmp_path):
+    cache = ArtCache(disk_dir=str(tmp_path))
+    cache.put('a', image(7))
+    fresh = ArtCache(disk_dir=str(tmp_path))
+    assert np.asarray(fresh.get('a'))[0, 0].tolist() == [7, 7, 7]
+    assert fresh.stats()['disk_hits'] == 1
+
+    trimmed = ArtCache(disk_dir=str(tmp_path), disk_max_bytes=1)
+    trimmed.put('b', image(8, 50))
+    assert len(os.listdir(tmp_path)) <= 1
+
+
+def test_one_off_renders_stay_out_of_the_main_tier_and_disk(tmp_path):
+    cache = ArtCache(max_bytes=10 ** 6, disk_dir=str(tmp_path), one_off_max_bytes=2 * 300)
+    cache.put('theme', image(0))
+    for key in 'xyz':
+        cache.put(key, image(1), one_off=True)
+    stats = cache.stats()
+    assert stats['entries'] == 1
+    assert stats['one_off_entries'] == 2
+    assert os.listdir(tmp_path) == ['theme.png']
+    assert cache.get('x', one_off=True) is None
+    assert cache.get('z', one_off=True) is not None
+    assert cache.get('theme') is not None
+
+
+def test_generator_caches_fixed_themes_and_seeded_renders_separately():
+    cache = ArtCache()
+    generator = FHEArtGenerator(render_backend='raster', art_cache=cache)
+    first = generator.render_base_art('zama_classic', size=200)
+    assert generator.render_base_art('zama_classic', size=200) is first
+
+    seeded = generator.render_base_art('zama_vision', size=200, seed=5)
+    assert generator.render_base_art('zama_vision', size=200, seed=5) is seeded
+    generator.render_base_art('zama_vision', size=200)
+    stats = cache.stats()
+    assert stats['entries'] == 1
+    assert stats['one_off_entries'] == 1
+    assert stats['hits'] == 2
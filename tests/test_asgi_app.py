@@ -0,0 +1,137 @@
+import asyncio
+import base64
+import io
+import json
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from starlette.testclient import TestClient
+
+import asgi_app
+
+
+@pytest.fixture(scope='module')
+def client():
+    # Tek worker yeter; havuz ve ısınma lifespan ile gerçekten kurulur
+    workers = asgi_app.CPU_WORKERS
+    asgi_app.CPU_WORKERS = 1
+    try:
+        with TestClient(asgi_app.app) as client:
+            deadline = time.monotonic() + 120
+            while client.get('/api/ready').status_code == 503:
+                assert time.monotonic() < deadline, 'warm-up did not finish'
+                time.sleep(0.1)
+            yield client
+    finally:
+        asgi_app.CPU_WORKERS = workers
+
+
+@pytest.fixture
+def session(client, request):
+    headers = {'X-Session-ID': f'asgi-{request.node.name}'}
+    response = client.post('/api/generate_art', json={'grid': 4}, headers=headers)
+    assert response.status_code == 200
+    yield headers, response.json()
+    client.post('/api/reset_session', headers=headers)
+
+
+def decode_data_uri(uri):
+    assert uri.startswith('data:image/png;base64,')
+    return Image.open(io.BytesIO(base64.b64decode(uri.split(',', 1)[1]))).convert('RGB')
+
+
+def test_ready_and_worker_cache_stats(client):
+    assert client.get('/api/ready').json() == {'success': True, 'ready': True}
+    cache = client.get('/api/cache_stats').json()['cache']
+    assert cache['workers'] == 1
+    assert cache['entries'] >= 1
+
+
+def test_generate_and_reveal_match_the_image_endpoint(client, session):
+    headers, body = session
+    assert body['total_pieces'] == 16
+    frame = decode_data_uri(body['image'])
+
+    piece = client.post('/api/reveal_piece', json={'mode': 'delta', 'version': body['version']},
+                        headers=headers).json()
+    delta = piece['delta']
+    frame.paste(decode_data_uri(delta['image']), tuple(delta['box'][:2]))
+
+    multiple = client.post('/api/reveal_multiple',
+                           json={'count': 3, 'mode': 'delta', 'version': piece['version']},
+                           headers=headers).json()
+    assert multiple['stats']['revealed'] == 4
+    for delta in multiple['deltas']:
+        frame.paste(decode_data_uri(delta['image']), tuple(delta['box'][:2]))
+
+    expected = Image.open(io.BytesIO(client.get(multiple['image_url']).content)).convert('RGB')
+    np.testing.assert_array_equal(np.asarray(frame), np.asarray(expected))
+
+
+def test_full_frame_reveal(client, session):
+    headers, _ = session
+    response = client.post('/api/reveal_piece', json={}, headers=headers).json()
+    assert decode_data_uri(response['image']).size == (800, 800)
+
+
+def test_bad_requests(client, session):
+    headers, body = session
+    assert client.post('/api/generate_art', json={'grid': 'abc'}, headers=headers).status_code == 400
+    assert client.post('/api/reveal_multiple', json={'indices': [1.5]},
+                       headers=headers).status_code == 400
+    assert client.get(body['image_url'] + '?size=123').status_code == 400
+    assert client.get(f"/api/reveal_stream/{headers['X-Session-ID']}?interval=nan").status_code == 400
+    assert client.get('/api/image/asgi-missing/1').status_code == 404
+
+
+def test_download_art_headers(client, session):
+    headers, _ = session
+    response = client.get('/api/download_art?format=webp&size=400', headers=headers)
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'image/webp'
+    assert "filename*=UTF-8''fhe_art_zama_classic_0of16.webp" in response.headers['content-disposition']
+
+
+def test_reveal_stream(client):
+    headers = {'X-Session-ID': 'asgi-stream'}
+    body = client.post('/api/generate_art', json={'grid': 2, 'mode': 'url'}, headers=headers).json()
+    text = client.get(f"/api/reveal_stream/asgi-stream?interval=0&batch=4&version={body['version']}").text
+    events = [block for block in text.split('\n\n') if block.startswith('event: ')]
+    assert [block.split('\n')[0] for block in events] == ['event: reveal', 'event: end']
+    reveal = json.loads(events[0].split('data: ', 1)[1])
+    assert reveal['completed'] and len(reveal['deltas']) == 4
+    decode_data_uri(reveal['deltas'][0]['image'])
+    client.post('/api/reset_session', headers=headers)
+
+
+def test_sessions_do_not_hold_ring_slots(client):
+    # Yuva yalnızca aktarım süresince tutulur; canlı session'lar halkayı tüketmez
+    slots = asgi_app.shm_ring().slots
+    for index in range(slots + 2):
+        client.post('/api/generate_art', json={'grid': 2, 'mode': 'url'},
+                    headers={'X-Session-ID': f'asgi-ring-{index}'})
+    ring = client.get('/api/cache_stats').json()['shm_ring']
+    assert ring['in_use'] == 0
+    assert ring['misses'] == 0
+    for index in range(slots + 2):
+        client.post('/api/reset_session', headers={'X-Session-ID': f'asgi-ring-{index}'})
+
+
+async def broken_run_cpu(fn, *args):
+    raise RuntimeError('raster broken')
+
+
+def test_failed_warm_up_never_reports_ready(monkeypatch):
+    monkeypatch.setattr(asgi_app, 'run_cpu', broken_run_cpu)
+    monkeypatch.setattr(asgi_app, 'server_ready', asyncio.Event())
+    monkeypatch.setattr(asgi_app, 'warm_up_error', None)
+    monkeypatch.delenv('FHE_ANNOUNCE_READY', raising=False)
+
+    asyncio.run(asgi_app.warm_up())
+    response = asyncio.run(asgi_app.ready(None))
+    assert response.status_code == 503
+    assert json.loads(response.body) == {'success': False, 'ready': False, 'error': 'raster broken'}
+    assert not asgi_app.server_ready.is_set()
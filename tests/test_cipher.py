@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from fhe_art_engine import FHEArtGenerator, decrypt_pixels, encrypt_pixels
+
+ALL_BYTES = np.arange(256, dtype=np.uint8)
+
+
+@pytest.mark.parametrize('key', [0, 1, 255, 256, 1000, 4242, 9999])
+def test_matches_reference_formula_and_round_trips(key):
+    expected = ((ALL_BYTES.astype(np.int64) ^ key) + key) % 256
+    encrypted = encrypt_pixels(ALL_BYTES, key)
+    assert encrypted.dtype == np.uint8
+    np.testing.assert_array_equal(encrypted, expected)
+    np.testing.assert_array_equal(decrypt_pixels(encrypted, key), ALL_BYTES)
+
+
+def test_in_place_round_trip_on_tile_stack():
+    tiles = np.random.default_rng(0).integers(0, 256, (3, 4, 5, 6, 3), dtype=np.uint8)
+    work = tiles.copy()
+    assert encrypt_pixels(work, 4242, out=work) is work
+    assert not np.array_equal(work, tiles)
+    decrypt_pixels(work, 4242, out=work)
+    np.testing.assert_array_equal(work, tiles)
+
+
+def test_generator_encrypts_pieces_with_its_key():
+    generator = FHEArtGenerator(render_backend='raster')
+    generator.reset_encryption(1234)
+    image = np.random.default_rng(1).integers(0, 256, (40, 60, 3), dtype=np.uint8)
+    pieces = generator.encrypt_art_pieces(image, (2, 3))
+    np.testing.assert_array_equal(generator._decrypt_image_data(pieces.encrypted), pieces.tiles)
+    np.testing.assert_array_equal(pieces[4]['original_piece'], image[20:40, 20:40])
@@ -0,0 +1,92 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from generation_queue import GenerationQueue, QueueFull
+
+
+def run_together(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(index):
+        barrier.wait()
+        try:
+            results[index] = target(index)
+        except Exception as e:
+            results[index] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_identical_requests_share_one_run():
+    queue = GenerationQueue()
+    calls = []
+
+    def render():
+        calls.append(1)
+        time.sleep(0.2)
+        return object()
+
+    results = run_together(5, lambda _: queue.run('vision', render))
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    stats = queue.stats()
+    assert (stats['leaders'], stats['coalesced'], stats['in_flight']) == (1, 4, 0)
+
+
+def test_full_queue_is_rejected_with_retry_after():
+    queue = GenerationQueue(max_active=1, max_waiting=0)
+    started = threading.Event()
+
+    def slow():
+        started.set()
+        time.sleep(0.3)
+        return 'done'
+
+    leader = threading.Thread(target=queue.run, args=('a', slow))
+    leader.start()
+    started.wait()
+    with pytest.raises(QueueFull) as error:
+        queue.run('b', lambda: 'never')
+    assert error.value.retry_after >= 1
+    # Aynı anahtar kuyruğa girmeden liderin sonucunu bekler
+    assert queue.run('a', lambda: 'never') == 'done'
+    leader.join()
+    assert queue.stats()['rejected'] == 1
+    assert queue.run('b', lambda: 'b') == 'b'
+
+
+def test_leader_error_reaches_followers_and_frees_the_slot():
+    queue = GenerationQueue(max_active=1, max_waiting=0)
+
+    def broken():
+        time.sleep(0.2)
+        raise RuntimeError('render failed')
+
+    results = run_together(3, lambda _: queue.run('x', broken))
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert queue.run('y', lambda: 'ok') == 'ok'
+
+
+def test_run_async_coalesces():
+    queue = GenerationQueue()
+    calls = []
+
+    async def render():
+        calls.append(1)
+        await asyncio.sleep(0.1)
+        return 'art'
+
+    async def main():
+        return await asyncio.gather(*(queue.run_async('k', render) for _ in range(4)))
+
+    assert asyncio.run(main()) == ['art'] * 4
+    assert len(calls) == 1
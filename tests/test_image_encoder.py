@@ -0,0 +1,41 @@
+import pytest
+
+from image_encoder import negotiate
+
+
+@pytest.mark.parametrize('fmt, expected', [
+    ('png', 'png'),
+    ('WEBP', 'webp'),
+    ('jpg', 'jpeg'),
+    ('gif', None),
+])
+def test_format_parameter_wins_over_accept(fmt, expected):
+    assert negotiate('image/webp', fmt) == expected
+
+
+@pytest.mark.parametrize('accept, expected', [
+    (None, 'png'),
+    ('', 'png'),
+    ('*/*', 'png'),
+    ('image/webp,image/*;q=0.8', 'webp'),
+    ('image/jpeg;q=0.9, image/webp;q=0.5', 'jpeg'),
+    ('image/avif, image/webp, */*;q=0.1', 'webp'),
+    ('image/png;q=0, */*', 'webp'),
+    ('image/png;q=bogus, image/jpeg', 'jpeg'),
+    ('image/webp,*/*', 'webp'),
+    ('image/png;q=0.9, image/*', 'webp'),
+    ('text/html', None),
+    ('image/png;q=0', None),
+])
+def test_accept_header(accept, expected):
+    assert negotiate(accept) == expected
+
+
+# Chrome/Firefox'un <img> isteklerinde gönderdiği Accept başlıkları
+@pytest.mark.parametrize('accept', [
+    'image/avif,image/webp,image/apng,image/svg+xml,image/*,*/*;q=0.8',
+    'image/avif,image/webp,*/*',
+    'image/webp,*/*',
+])
+def test_browser_image_requests_get_webp(accept):
+    assert negotiate(accept) == 'webp'
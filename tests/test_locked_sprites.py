@@ -0,0 +1,23 @@
+import numpy as np
+
+import fhe_art_engine
+from fhe_art_engine import locked_tile_sprite, sprite_cache_stats
+
+
+def test_sprite_is_shared_and_labelled():
+    first = locked_tile_sprite((60, 40), 3)
+    assert locked_tile_sprite((60, 40), 3) is first
+    assert first.size == (60, 40)
+    assert not np.array_equal(np.asarray(first), np.asarray(locked_tile_sprite((60, 40), 4)))
+
+
+def test_sprite_cache_is_bounded_by_bytes(monkeypatch):
+    monkeypatch.setattr(fhe_art_engine, 'SPRITE_CACHE_BYTES', 200 * 200 * 3 * 4)
+    for size in range(150, 200, 5):
+        for piece_id in range(8):
+            locked_tile_sprite((size, size), piece_id)
+            assert sprite_cache_stats()['bytes'] <= fhe_art_engine.SPRITE_CACHE_BYTES
+
+    # Bütçeden çıkan sprite aynı içerikle yeniden çizilir
+    redrawn = np.asarray(locked_tile_sprite((150, 150), 0))
+    np.testing.assert_array_equal(redrawn, np.asarray(fhe_art_engine._draw_locked_tile((150, 150), 0)))
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from piece_set import PieceSet, revealed_mask
+
+
+def piece_set(rows=3, cols=4):
+    tiles = np.zeros((rows, cols, 2, 2, 3), dtype=np.uint8)
+    return PieceSet(tiles, tiles.copy(), rng=np.random.default_rng(0))
+
+
+def test_reveal_is_idempotent_and_bounds_checked():
+    pieces = piece_set()
+    assert pieces.reveal(5)
+    assert not pieces.reveal(5)
+    assert not pieces.reveal(-1)
+    assert not pieces.reveal(len(pieces))
+    assert pieces.revealed_count == 1
+    assert pieces.hidden_count == 11
+    assert pieces[5]['is_revealed']
+    assert pieces[5]['position'] == (1, 1)
+
+
+def test_reveal_many_returns_only_new_indices_in_first_seen_order():
+    pieces = piece_set()
+    pieces.reveal(2)
+    newly = pieces.reveal_many([7, 2, 0, 7, 3])
+    assert newly.tolist() == [7, 0, 3]
+    assert revealed_mask(pieces).nonzero()[0].tolist() == [0, 2, 3, 7]
+
+    with pytest.raises(IndexError):
+        pieces.reveal_many([12])
+
+
+def test_sample_hidden_never_returns_revealed_pieces():
+    pieces = piece_set()
+    pieces.reveal_many(range(10))
+    sample = pieces.sample_hidden(5)
+    assert sorted(sample.tolist()) == [10, 11]
+    assert pieces.random_hidden() in (10, 11)
+
+    pieces.reveal_many(sample)
+    assert pieces.is_complete
+    assert pieces.random_hidden() is None
+    assert pieces.sample_hidden(3).size == 0
+
+
+def test_set_revealed_restores_mask():
+    pieces = piece_set(2, 2)
+    pieces.set_revealed([True, False, False, True])
+    assert [piece['is_revealed'] for piece in pieces] == [True, False, False, True]
+    with pytest.raises(ValueError):
+        pieces.set_revealed([True])
@@ -0,0 +1,71 @@
+import random
+
+import numpy as np
+import pytest
+
+from fhe_art_engine import FHEArtGenerator
+from progress_compositor import ProgressCompositor
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return FHEArtGenerator(render_backend='raster')
+
+
+@pytest.fixture(scope='module')
+def base_art(generator):
+    return generator.render_base_art('zama_classic', size=300, seed=0)
+
+
+def assert_same_as_full_render(generator, pieces, compositor, size):
+    expected = np.asarray(generator.generate_progress_image(pieces, size))
+    np.testing.assert_array_equal(np.asarray(compositor.render(size)), expected)
+
+
+# Bölünmeyen boyutlarda ızgaranın altında imzanın üstüne düşen bir kenar boşluğu kalır
+@pytest.mark.parametrize('grid, size', [
+    ((4, 4), (800, 800)),
+    ((31, 31), (800, 800)),
+    ((32, 32), (600, 600)),
+    ((7, 5), (801, 613)),
+])
+def test_matches_generate_progress_image_while_revealing(generator, base_art, grid, size):
+    pieces = generator.encrypt_art_pieces(base_art, grid)
+    compositor = ProgressCompositor(generator, pieces, size=size)
+    order = list(range(len(pieces)))
+    random.Random(0).shuffle(order)
+
+    assert_same_as_full_render(generator, pieces, compositor, size)
+    for index in order[:40]:
+        generator.reveal_piece(pieces, index)
+        compositor.render(size)
+    assert_same_as_full_render(generator, pieces, compositor, size)
+
+
+def test_render_changes_reports_the_dirty_region(generator, base_art):
+    pieces = generator.encrypt_art_pieces(base_art, 16)
+    compositor = ProgressCompositor(generator, pieces, size=(400, 400))
+
+    assert compositor.render_changes()[1] == (0, 0, 400, 400)
+    assert compositor.render_changes()[1] is None
+
+    generator.reveal_piece(pieces, 5)
+    canvas, box = compositor.render_changes()
+    assert box == compositor.tile_box(5)
+    np.testing.assert_array_equal(
+        np.asarray(canvas), np.asarray(generator.generate_progress_image(pieces, (400, 400))))
+
+
+def test_keeps_only_recent_sizes(generator, base_art):
+    pieces = generator.encrypt_art_pieces(base_art, 16)
+    compositor = ProgressCompositor(generator, pieces, max_sizes=2)
+    generator.reveal_piece(pieces, 0)
+
+    compositor.render((200, 200))
+    compositor.render((400, 400))
+    held = compositor.nbytes()
+    compositor.render((600, 600))
+
+    assert list(compositor._frames) == [(400, 400), (600, 600)]
+    assert (50, 50) not in compositor._tile_cache
+    assert compositor.nbytes() < held + 600 * 600 * 3
@@ -0,0 +1,45 @@
+import random
+
+import numpy as np
+import pytest
+
+from fhe_art_engine import FHEArtGenerator
+from fhe_raster import THEME_LIMITS, ZamaRasterizer
+
+SIZE = 400
+
+
+@pytest.fixture(scope='module')
+def generator():
+    return FHEArtGenerator()
+
+
+@pytest.mark.parametrize('theme', sorted(THEME_LIMITS))
+def test_close_to_matplotlib_render(generator, theme):
+    raster = np.asarray(generator.render_base_art(theme, 'raster', size=SIZE, seed=3), dtype=float)
+    reference = np.asarray(generator.render_base_art(theme, 'matplotlib', size=SIZE, seed=3),
+                           dtype=float)
+    assert raster.shape == reference.shape == (SIZE, SIZE, 3)
+    # Yalnızca kenar yumuşatma farkları kalmalı
+    assert np.abs(raster - reference).mean() < 5
+    assert (np.abs(raster - reference).max(axis=2) > 64).mean() < 0.05
+
+
+def test_seeded_render_is_deterministic():
+    first = ZamaRasterizer(SIZE).render('zama_vision', random.Random(7))
+    second = ZamaRasterizer(SIZE).render('zama_vision', random.Random(7))
+    other = ZamaRasterizer(SIZE).render('zama_vision', random.Random(8))
+    assert first.mode == 'RGB'
+    np.testing.assert_array_equal(np.asarray(first), np.asarray(second))
+    assert not np.array_equal(np.asarray(first), np.asarray(other))
+
+
+def test_unknown_theme_falls_back_to_classic():
+    classic = ZamaRasterizer(SIZE).render('zama_classic')
+    np.testing.assert_array_equal(np.asarray(ZamaRasterizer(SIZE).render('nope')),
+                                  np.asarray(classic))
+
+
+def test_unknown_backend_is_rejected(generator):
+    with pytest.raises(ValueError):
+        generator.render_base_art('zama_classic', 'svg')
@@ -0,0 +1,73 @@
+import os
+import time
+
+import numpy as np
+import pytest
+
+from fhe_art_engine import FHEArtGenerator
+from render_farm import RenderFarm
+
+
+@pytest.fixture(scope='module')
+def farm():
+    farm = RenderFarm(workers=1).start(wait=True)
+    yield farm
+    farm.close()
+
+
+def test_render_matches_in_process_render(farm):
+    expected = FHEArtGenerator().render_base_art('zama_vision', 'raster', size=300, seed=4)
+    img = farm.render('zama_vision', 300, seed=4, backend='raster')
+    np.testing.assert_array_equal(np.asarray(img), np.asarray(expected))
+
+
+def test_render_larger_than_a_ring_slot(farm):
+    # Halka yuvasına sığmayan tuval tek seferlik paylaşımlı bellekten gelir
+    img = farm.render('zama_minimal', 1600, backend='raster')
+    assert img.size == (1600, 1600)
+
+
+def test_crashed_worker_is_replaced(farm):
+    restarts = farm.stats()['restarts']
+    farm._procs[0].process.kill()
+    deadline = time.monotonic() + 60
+    while farm.stats()['restarts'] == restarts:
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    assert farm.render('zama_classic', 100, backend='raster').size == (100, 100)
+
+
+def test_render_times_out_with_a_message(farm):
+    with pytest.raises(TimeoutError, match='did not finish'):
+        farm.render('zama_geometric', 1400, backend='raster', timeout=0.001)
+
+
+def failing_render(self, *args, **kwargs):
+    raise RuntimeError('raster broken')
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='needs fork to patch the worker')
+def test_failed_warm_up_breaks_the_farm_without_respawning(monkeypatch):
+    # fork ile worker yamalı generator'ı devralır; ısınma her seferinde başarısız olur
+    monkeypatch.setattr(FHEArtGenerator, 'render_base_art', failing_render)
+    farm = RenderFarm(workers=2, start_method='fork').start(wait=False)
+    try:
+        queued = farm.submit('zama_classic', 100, backend='raster')
+        with pytest.raises(RuntimeError, match='raster broken'):
+            queued.result(timeout=30)
+
+        time.sleep(0.5)
+        stats = farm.stats()
+        assert stats['restarts'] == 0
+        assert 'raster broken' in stats['startup_error']
+        with pytest.raises(RuntimeError, match='raster broken'):
+            farm.render('zama_classic', 100, backend='raster')
+    finally:
+        farm.close()
+
+    farm = RenderFarm(workers=1, start_method='fork')
+    try:
+        with pytest.raises(RuntimeError, match='raster broken'):
+            farm.start(wait=True)
+    finally:
+        farm.close()
@@ -0,0 +1,148 @@
+import socketserver
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from session_backend import (MemoryBackend, RedisBackend, SQLiteBackend, SessionBackend,
+                             create_backend, pack_bitmap, unpack_bitmap)
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    """Testler için GET/SET/EXPIRE/DEL/AUTH/SELECT konuşan küçük RESP sunucusu"""
+
+    def handle(self):
+        server = self.server
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            args = []
+            for _ in range(int(line[1:])):
+                length = int(self.rfile.readline()[1:])
+                args.append(self.rfile.read(length + 2)[:-2])
+            command = args[0].decode().upper()
+            server.commands.append(command)
+            if server.drop_next:
+                server.drop_next = False
+                return
+            if command == 'GET':
+                value = server.data.get(args[1])
+                reply = b'$-1\r\n' if value is None else b'$%d\r\n%s\r\n' % (len(value), value)
+            elif command == 'SET':
+                server.data[args[1]] = args[2]
+                if len(args) > 3:
+                    server.ttls[args[1]] = int(args[4])
+                reply = b'+OK\r\n'
+            elif command == 'EXPIRE':
+                server.ttls[args[1]] = int(args[2])
+                reply = b':1\r\n'
+            elif command == 'DEL':
+                reply = b':%d\r\n' % (server.data.pop(args[1], None) is not None)
+            elif command == 'AUTH' and args[1] != b'secret':
+                reply = b'-WRONGPASS invalid password\r\n'
+            else:
+                reply = b'+OK\r\n'
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def resp_server():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), RespHandler)
+    server.daemon_threads = True
+    server.data, server.ttls, server.commands = {}, {}, []
+    server.drop_next = False
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=['memory', 'sqlite', 'redis'])
+def backend(request, tmp_path):
+    if request.param == 'memory':
+        backend = MemoryBackend(ttl=60)
+    elif request.param == 'sqlite':
+        backend = SQLiteBackend(str(tmp_path / 'sessions.db'), ttl=60)
+    else:
+        server = request.getfixturevalue('resp_server')
+        backend = RedisBackend('127.0.0.1', server.server_address[1], ttl=60)
+    yield backend
+    backend.close()
+
+
+def test_save_load_touch_delete(backend):
+    assert backend.load('a') is None
+    backend.save('a', '{"revision":1}')
+    backend.save('a', '{"revision":2}')
+    assert backend.load('a') == '{"revision":2}'
+    backend.touch('a')
+    assert backend.load('a') == '{"revision":2}'
+    backend.delete('a')
+    backend.delete('a')
+    assert backend.load('a') is None
+
+
+@pytest.mark.parametrize('make', [
+    lambda tmp_path: MemoryBackend(ttl=0.05),
+    lambda tmp_path: SQLiteBackend(str(tmp_path / 'sessions.db'), ttl=0.05),
+])
+def test_records_expire_and_are_swept(make, tmp_path):
+    backend = make(tmp_path)
+    backend.save('a', 'x')
+    backend.save('b', 'y')
+    time.sleep(0.1)
+    assert backend.load('a') is None
+    assert backend.sweep() >= 1
+    assert backend.load('b') is None
+
+
+def test_sqlite_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / 'sessions.db')
+    first, second = SQLiteBackend(path), SQLiteBackend(path)
+    first.save('a', 'x')
+    assert second.load('a') == 'x'
+
+
+def test_redis_sets_ttl_and_authenticates(resp_server):
+    port = resp_server.server_address[1]
+    backend = create_backend(f'redis://:secret@127.0.0.1:{port}/2', ttl=30)
+    backend.save('a', 'x')
+    backend.touch('a')
+    assert resp_server.commands[:2] == ['AUTH', 'SELECT']
+    assert resp_server.ttls[b'fhe-art:session:a'] == 30
+    assert backend.sweep() == 0
+
+    with pytest.raises(RuntimeError):
+        create_backend(f'redis://:wrong@127.0.0.1:{port}', ttl=30).load('a')
+
+
+def test_redis_reconnects_after_dropped_connection(resp_server):
+    backend = RedisBackend('127.0.0.1', resp_server.server_address[1])
+    backend.save('a', 'x')
+    resp_server.drop_next = True
+    assert backend.load('a') == 'x'
+    assert resp_server.commands == ['SET', 'GET', 'GET']
+
+
+def test_create_backend_urls(tmp_path):
+    assert isinstance(create_backend(None), MemoryBackend)
+    assert isinstance(create_backend('memory://'), MemoryBackend)
+    sqlite = create_backend(f'sqlite:///{tmp_path}/s.db')
+    assert isinstance(sqlite, SQLiteBackend)
+    assert sqlite.path == f'{tmp_path}/s.db'
+    redis = create_backend('redis://cache:6380/3')
+    assert (redis.host, redis.port, redis.db) == ('cache', 6380, 3)
+    with pytest.raises(ValueError):
+        create_backend('mongodb://x')
+
+
+def test_backend_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        SessionBackend()
+
+
+def test_bitmap_round_trip():
+    flags = np.random.default_rng(0).random(37) < 0.5
+    np.testing.assert_array_equal(unpack_bitmap(pack_bitmap(flags), 37), flags)
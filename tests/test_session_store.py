@@ -0,0 +1,119 @@
+import threading
+import time
+
+from session_backend import MemoryBackend
+from session_store import SessionStore
+
+
+class SlowBackend(MemoryBackend):
+    """Kaydetmeyi yavaşlatarak oluşturma ile ilk kayıt arasındaki pencereyi açar"""
+
+    def save(self, session_id, state):
+        time.sleep(0.001)
+        super().save(session_id, state)
+
+
+def counter_store(**kwargs):
+    def factory(session_id):
+        return None, {'n': 0}
+
+    def dump(session):
+        return {'n': session.data['n']}
+
+    def restore(session, state):
+        session.data['n'] = state['n']
+
+    kwargs.setdefault('sweep_interval', 0)
+    return SessionStore(factory, dump, restore, **kwargs)
+
+
+def test_concurrent_get_or_create_builds_one_session_without_evictions():
+    store = counter_store(backend=SlowBackend())
+    seen = {}
+    seen_lock = threading.Lock()
+    barrier = threading.Barrier(40)
+
+    def worker(index):
+        barrier.wait()
+        for step in range(30):
+            session_id = f's{step % 5}'
+            if (index + step) % 3:
+                session = store.get_or_create(session_id)
+            else:
+                session = store.get(session_id)
+                if session is None:
+                    continue
+            with session.lock:
+                session.data['n'] += 1
+            store.touch(session)
+            with seen_lock:
+                seen.setdefault(session_id, set()).add(id(session))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert store.evictions == {'ttl': 0, 'count': 0, 'memory': 0}
+    assert all(len(objects) == 1 for objects in seen.values())
+
+
+def test_get_drops_only_expired_sessions():
+    store = counter_store(ttl=60)
+    store.get_or_create('a')
+    store.backend.delete('a')
+    assert store.get('a') is None
+    assert 'a' not in store._sessions
+    assert store.evictions['ttl'] == 0
+
+    session = store.get_or_create('b')
+    session.last_access -= 120
+    store.backend.delete('b')
+    assert store.get('b') is None
+    assert store.evictions['ttl'] == 1
+
+
+def sized_store(sizes, **kwargs):
+    return counter_store(sizeof=lambda session: sizes.get(session.id, 0), **kwargs)
+
+
+def test_count_limit_evicts_least_recently_used():
+    store = counter_store(max_sessions=2)
+    store.get_or_create('a')
+    store.get_or_create('b')
+    store.get('a')
+    store.get_or_create('c')
+    assert sorted(store._sessions) == ['a', 'c']
+    assert store.evictions['count'] == 1
+    # Çıkarılan session arka uçtaki durumundan yeniden kurulur
+    assert store.get('b') is not None
+
+
+def test_memory_budget_evicts_oldest_neighbours():
+    sizes = {'a': 40, 'b': 40, 'c': 40}
+    store = sized_store(sizes, max_bytes=100)
+    for session_id in 'abc':
+        store.get_or_create(session_id)
+    assert sorted(store._sessions) == ['b', 'c']
+    assert store.stats()['bytes_held'] == 80
+    assert store.evictions['memory'] == 1
+
+
+def test_session_over_budget_is_dropped_instead_of_its_neighbours():
+    sizes = {'a': 40, 'big': 500}
+    store = sized_store(sizes, max_bytes=100)
+    store.get_or_create('a')
+    store.get_or_create('big')
+    assert sorted(store._sessions) == ['a']
+    assert store.stats()['bytes_held'] == 40
+    assert store.evictions['memory'] == 1
+
+
+def test_sweep_drops_idle_sessions():
+    store = counter_store(ttl=60)
+    store.get_or_create('a').last_access -= 120
+    store.get_or_create('b')
+    assert store.sweep() == 1
+    assert sorted(store._sessions) == ['b']
+    assert store.evictions['ttl'] == 1
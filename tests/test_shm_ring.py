@@ -0,0 +1,63 @@
+import gc
+
+import pytest
+
+from shm_ring import SharedRing, ring_view
+
+
+@pytest.fixture
+def ring():
+    ring = SharedRing(2, 64)
+    yield ring
+    ring.close()
+
+
+def test_acquire_until_full_then_miss(ring):
+    first, second = ring.acquire(), ring.acquire()
+    assert ring.acquire() is None
+    assert ring.acquire(65) is None
+    first.release()
+    assert ring.acquire() is not None
+    second.release()
+    stats = ring.stats()
+    assert (stats['acquired'], stats['misses'], stats['in_use']) == (3, 2, 1)
+
+
+def test_views_keep_the_slot_until_collected(ring):
+    slot = ring.acquire()
+    ring_view(slot.address, (4, 4))[...] = 7
+    view = slot.ndarray((4, 4))
+    part = view[1:3]
+    slot.release()
+    assert ring.stats()['in_use'] == 1
+    assert part.sum() == 7 * 8
+
+    del view
+    gc.collect()
+    # Dilim hâlâ yuvaya bakıyor
+    assert ring.stats()['in_use'] == 1
+    del part
+    gc.collect()
+    assert ring.stats()['in_use'] == 0
+
+
+def test_view_larger_than_slot_is_rejected(ring):
+    slot = ring.acquire()
+    with pytest.raises(ValueError):
+        slot.ndarray((8, 9))
+    slot.release()
+    assert ring.stats()['in_use'] == 0
+
+
+def test_double_release_does_not_free_twice(ring):
+    slot = ring.acquire()
+    slot.release()
+    slot.release()
+    assert ring.stats()['in_use'] == 0
+    assert ring.acquire() is not None and ring.acquire() is not None
+    assert ring.acquire() is None
+
+
+def test_invalid_geometry():
+    with pytest.raises(ValueError):
+        SharedRing(0, 64)
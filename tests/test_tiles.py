@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+
+from fhe_art_engine import FHEArtGenerator
+
+
+def test_split_tiles_is_a_view_in_grid_order():
+    arr = np.arange(7 * 9 * 3, dtype=np.uint8).reshape(7, 9, 3)
+    tiles = FHEArtGenerator.split_tiles(arr, 3, 4)
+    assert tiles.shape == (3, 4, 2, 2, 3)
+    assert np.shares_memory(tiles, arr)
+    # Kalan kenar satır/sütunları atılır
+    np.testing.assert_array_equal(tiles[2, 3], arr[4:6, 6:8])
+
+
+def test_split_tiles_rejects_too_fine_grid():
+    with pytest.raises(ValueError):
+        FHEArtGenerator.split_tiles(np.zeros((4, 4, 3), dtype=np.uint8), 5, 1)
+
+
+@pytest.mark.parametrize('pieces, grid', [(16, (4, 4)), ((2, 5), (2, 5)), ([3, 1], (3, 1))])
+def test_encrypt_art_pieces_grid(pieces, grid):
+    image = np.zeros((30, 40, 3), dtype=np.uint8)
+    result = FHEArtGenerator(render_backend='raster').encrypt_art_pieces(image, pieces)
+    assert result.grid == grid
+    assert len(result) == grid[0] * grid[1]
+
+
+@pytest.mark.parametrize('pieces', [15, (0, 3), (2, -1)])
+def test_encrypt_art_pieces_rejects_bad_grid(pieces):
+    with pytest.raises(ValueError):
+        FHEArtGenerator(render_backend='raster').encrypt_art_pieces(
+            np.zeros((30, 40, 3), dtype=np.uint8), pieces)
@@ -0,0 +1,325 @@
+import base64
+import io
+import json
+import threading
+import time
+
+import numpy as np
+import pytest
+from PIL import Image
+
+import web_art_generator as web
+
+
+@pytest.fixture
+def client():
+    return web.app.test_client()
+
+
+@pytest.fixture
+def session(client, request):
+    headers = {'X-Session-ID': f'test-{request.node.name}'}
+    response = client.post('/api/generate_art', json={'theme': 'zama_classic', 'grid': 4},
+                           headers=headers)
+    assert response.status_code == 200
+    yield headers, response.get_json()
+    client.post('/api/reset_session', headers=headers)
+
+
+def decode_data_uri(uri):
+    assert uri.startswith('data:image/png;base64,')
+    return Image.open(io.BytesIO(base64.b64decode(uri.split(',', 1)[1])))
+
+
+def test_generate_art(session):
+    _, body = session
+    assert body['success']
+    assert body['total_pieces'] == 16
+    assert body['stats']['revealed'] == 0
+    assert decode_data_uri(body['image']).size == (800, 800)
+
+
+def test_generate_art_with_rectangular_grid(client):
+    headers = {'X-Session-ID': 'test-rectangular-grid'}
+    response = client.post('/api/generate_art', json={'grid': [3, 5]}, headers=headers)
+    assert response.get_json()['total_pieces'] == 15
+    assert response.get_json()['stats']['grid'] == [3, 5]
+    client.post('/api/reset_session', headers=headers)
+
+
+@pytest.mark.parametrize('grid', [0, 65, 'abc', [2], [1, 2, 3], 2.5, None, {'rows': 2}])
+def test_generate_art_rejects_bad_grid(client, grid):
+    response = client.post('/api/generate_art', json={'grid': grid},
+                           headers={'X-Session-ID': 'test-bad-grid'})
+    assert response.status_code == 400
+    assert not response.get_json()['success']
+
+
+def test_reveal_piece_delta_patches_previous_frame(client, session):
+    headers, body = session
+    frame = decode_data_uri(body['image']).convert('RGB')
+    response = client.post('/api/reveal_piece', json={'mode': 'delta', 'version': body['version']},
+                           headers=headers).get_json()
+    assert 'image' not in response
+    delta = response['delta']
+    assert delta['size'] == [800, 800]
+    frame.paste(decode_data_uri(delta['image']), tuple(delta['box'][:2]))
+
+    expected = Image.open(io.BytesIO(client.get(response['image_url']).data)).convert('RGB')
+    np.testing.assert_array_equal(np.asarray(frame), np.asarray(expected))
+
+
+def test_reveal_piece_delta_with_stale_version_sends_only_url(client, session):
+    headers, body = session
+    response = client.post('/api/reveal_piece', json={'mode': 'delta', 'version': body['version'] - 1},
+                           headers=headers).get_json()
+    assert response['success']
+    assert 'delta' not in response and 'image' not in response
+    assert response['image_url'].endswith(f"/{response['version']}")
+
+
+def test_image_etag_and_formats(client, session):
+    _, body = session
+    response = client.get(body['image_url'])
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert response.headers['Cache-Control'] == 'private, no-cache'
+    assert Image.open(io.BytesIO(response.data)).size == (800, 800)
+
+    cached = client.get(body['image_url'], headers={'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+
+    webp = client.get(body['image_url'] + '?size=400', headers={'Accept': 'image/webp'})
+    assert webp.mimetype == 'image/webp'
+    assert webp.headers['ETag'] != response.headers['ETag']
+    assert Image.open(io.BytesIO(webp.data)).size == (400, 400)
+
+    assert client.get(body['image_url'] + '?size=123').status_code == 400
+    assert client.get(body['image_url'] + '?format=gif').status_code == 400
+    assert client.get(body['image_url'], headers={'Accept': 'text/html'}).status_code == 406
+
+
+def test_image_for_old_version_or_missing_session(client, session):
+    headers, body = session
+    client.post('/api/reveal_piece', json={'mode': 'url'}, headers=headers)
+    stale = client.get(body['image_url'])
+    assert stale.status_code == 404
+    assert stale.get_json()['image_url'].endswith(f"/{body['version'] + 1}")
+    assert client.get('/api/image/test-missing/1').status_code == 404
+
+
+
+def test_download_art(client, session):
+    headers, _ = session
+    response = client.get('/api/download_art?format=jpeg&size=400', headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'image/jpeg'
+    assert Image.open(io.BytesIO(response.data)).size == (400, 400)
+    disposition = response.headers['Content-Disposition']
+    assert disposition.startswith('attachment; filename="fhe_art_zama_classic_0of16.jpeg"')
+    assert "filename*=UTF-8''fhe_art_zama_classic_0of16.jpeg" in disposition
+
+    # Aynı ilerleme tekrar indirilirken yeniden kodlanmaz
+    cached = client.get('/api/download_art?format=jpeg&size=400',
+                        headers={**headers, 'If-None-Match': response.headers['ETag']})
+    assert cached.status_code == 304
+    assert cached.headers['ETag'] == response.headers['ETag']
+
+    assert client.get('/api/download_art?format=gif', headers=headers).status_code == 400
+    assert client.get('/api/download_art', headers={**headers, 'Accept': 'text/html'}).status_code == 406
+
+
+def test_download_art_without_session(client):
+    assert client.get('/api/download_art', headers={'X-Session-ID': 'test-missing'}).status_code == 400
+
+
+def test_content_disposition_with_non_ascii_theme():
+    disposition = web.content_disposition('fhe_art_çiçek "ağaç"\\_0of16.png')
+    assert disposition.startswith('attachment; filename="fhe_art_cicek _agac___0of16.png";')
+    assert disposition.endswith("filename*=UTF-8''fhe_art_%C3%A7i%C3%A7ek%20%22a%C4%9Fa%C3%A7%22%5C_0of16.png")
+    disposition.encode('latin-1')
+
+def test_reveal_piece_and_multiple(client, session):
+    headers, body = session
+    response = client.post('/api/reveal_piece', json={}, headers=headers)
+    assert response.status_code == 200
+    piece = response.get_json()
+    assert piece['stats']['revealed'] == 1
+    assert piece['version'] == body['version'] + 1
+
+    response = client.post('/api/reveal_multiple', json={'count': 3}, headers=headers)
+    multiple = response.get_json()
+    assert multiple['stats']['revealed'] == 4
+    assert multiple['base_version'] == piece['version']
+    ids = [p['id'] for p in multiple['revealed_pieces']]
+    assert len(set(ids)) == 3
+    assert piece['revealed_piece']['id'] not in ids
+
+    stats = client.get('/api/get_stats', headers=headers).get_json()
+    assert stats['stats']['revealed'] == 4
+
+
+def test_reveal_multiple_by_indices(client, session):
+    headers, _ = session
+    response = client.post('/api/reveal_multiple', json={'indices': [3, 1, 3]},
+                           headers=headers).get_json()
+    assert [p['id'] for p in response['revealed_pieces']] == [3, 1]
+    again = client.post('/api/reveal_multiple', json={'indices': [1]}, headers=headers)
+    assert not again.get_json()['success']
+
+
+@pytest.mark.parametrize('data', [
+    {'indices': [1.7]},
+    {'indices': ['1']},
+    {'indices': [True]},
+    {'indices': 3},
+    {'indices': [16]},
+    {'count': 0},
+])
+def test_reveal_multiple_rejects_bad_selection(client, session, data):
+    headers, _ = session
+    response = client.post('/api/reveal_multiple', json=data, headers=headers)
+    assert response.status_code == 400
+    assert client.get('/api/get_stats', headers=headers).get_json()['stats']['revealed'] == 0
+
+
+def parse_sse(text):
+    events = []
+    for block in text.strip().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            events.append((fields['event'], json.loads(fields['data'])))
+    return events
+
+
+def test_reveal_stream_sends_deltas_until_completed(client):
+    headers = {'X-Session-ID': 'test-stream'}
+    body = client.post('/api/generate_art', json={'grid': 2}, headers=headers).get_json()
+    response = client.get(f"/api/reveal_stream/test-stream?interval=0&batch=2&version={body['version']}")
+    assert response.mimetype == 'text/event-stream'
+    events = parse_sse(response.get_data(as_text=True))
+    assert [name for name, _ in events] == ['reveal', 'reveal', 'end']
+    assert all(len(payload['deltas']) == 2 for _, payload in events[:2])
+    assert events[1][1]['completed']
+    assert events[2][1] == {'reason': 'completed'}
+    client.post('/api/reset_session', headers=headers)
+
+
+def test_reveal_stream_schedules_next_tick_after_slow_reader(client):
+    headers = {'X-Session-ID': 'test-stream-slow'}
+    client.post('/api/generate_art', json={'grid': 2}, headers=headers)
+    response = client.get('/api/reveal_stream/test-stream-slow?interval=0.2', buffered=False)
+    chunks = response.response
+    assert next(chunks).startswith(b'retry: 200')
+    assert next(chunks).startswith(b'event: reveal')
+    time.sleep(0.5)
+    started = time.monotonic()
+    assert next(chunks).startswith(b'event: reveal')
+    # Okuma gecikse de bir sonraki tik, önceki olay yazıldıktan bir aralık sonra gelir
+    assert time.monotonic() - started >= 0.15
+    response.close()
+    client.post('/api/reset_session', headers=headers)
+
+
+@pytest.mark.parametrize('query', ['interval=nan', 'interval=inf', 'interval=-inf'])
+def test_reveal_stream_rejects_non_finite_interval(client, session, query):
+    response = client.get(f"/api/reveal_stream/{session[0]['X-Session-ID']}?{query}")
+    assert response.status_code == 400
+
+
+def test_reveal_stream_without_session(client):
+    assert client.get('/api/reveal_stream/test-missing').status_code == 404
+
+
+def test_generate_art_render_timeout_is_503_and_frees_the_queue(client, monkeypatch):
+    def slow_render(self, *args, **kwargs):
+        raise TimeoutError('Render did not finish within 60s')
+
+    monkeypatch.setattr(web.FHEArtGenerator, 'render_base_art', slow_render)
+    response = client.post('/api/generate_art', json={'theme': 'zama_minimal'},
+                           headers={'X-Session-ID': 'test-render-timeout'})
+    assert response.status_code == 503
+    assert response.headers['Retry-After']
+    assert 'did not finish' in response.get_json()['error']
+    assert web.generation_queue.stats()['in_flight'] == 0
+
+
+def test_concurrent_random_theme_generations_coalesce(client, monkeypatch):
+    render = web.FHEArtGenerator.render_base_art
+
+    def slow_render(self, *args, **kwargs):
+        time.sleep(0.3)
+        return render(self, *args, **kwargs)
+
+    monkeypatch.setattr(web.FHEArtGenerator, 'render_base_art', slow_render)
+    coalesced = web.generation_queue.stats()['coalesced']
+    session_ids = [f'test-vision-{index}' for index in range(3)]
+    barrier = threading.Barrier(len(session_ids))
+
+    def generate(session_id):
+        barrier.wait()
+        web.app.test_client().post('/api/generate_art', json={'theme': 'zama_vision'},
+                                   headers={'X-Session-ID': session_id})
+
+    threads = [threading.Thread(target=generate, args=(sid,)) for sid in session_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert web.generation_queue.stats()['coalesced'] - coalesced == 2
+    seeds = {web.sessions.get(sid).data['art']['seed'] for sid in session_ids}
+    assert len(seeds) == 1 and None not in seeds
+    for sid in session_ids:
+        client.post('/api/reset_session', headers={'X-Session-ID': sid})
+
+
+def test_ready_after_warm_up(client):
+    deadline = time.monotonic() + 60
+    response = client.get('/api/ready')
+    while response.status_code == 503 and time.monotonic() < deadline:
+        assert response.headers['Retry-After'] == '1'
+        time.sleep(0.1)
+        response = client.get('/api/ready')
+    assert response.status_code == 200
+    assert response.get_json() == {'success': True, 'ready': True}
+
+
+def broken_warm_up():
+    raise RuntimeError('raster broken')
+
+
+def test_failed_warm_up_never_reports_ready(client, monkeypatch):
+    # Isınma durumu taze kurulur; yoklama ısınmayı başlatır
+    monkeypatch.setattr(web, 'warm_up', broken_warm_up)
+    monkeypatch.setattr(web, 'server_ready', threading.Event())
+    monkeypatch.setattr(web, 'warm_up_done', threading.Event())
+    monkeypatch.setattr(web, 'warm_up_error', None)
+    monkeypatch.setattr(web, '_warm_up_started', threading.Lock())
+
+    assert client.get('/api/ready').status_code == 503
+    assert web.warm_up_done.wait(10)
+    for _ in range(2):
+        response = client.get('/api/ready')
+        assert response.status_code == 503
+        assert response.get_json() == {'success': False, 'ready': False, 'error': 'raster broken'}
+        assert 'Retry-After' not in response.headers
+    assert not web.server_ready.is_set()
+
+
+def exit_now(code):
+    raise SystemExit(code)
+
+
+def test_announce_ready_exits_after_failed_warm_up(monkeypatch, capsys):
+    monkeypatch.setattr(web, 'warm_up_error', 'raster broken')
+    monkeypatch.setattr(web, 'warm_up_done', threading.Event())
+    monkeypatch.setattr(web, '_warm_up_started', threading.Lock())
+    web._warm_up_started.acquire()
+    web.warm_up_done.set()
+    monkeypatch.setattr(web.os, '_exit', exit_now)
+
+    with pytest.raises(SystemExit) as exited:
+        web.announce_ready(0, timeout=1)
+    assert exited.value.code == web.WARMUP_FAILED_EXIT
+    assert web.READY_MARKER not in capsys.readouterr().out
@@ -1,35 +1,545 @@
-from flask import Flask, render_template, jsonify, request, send_file
-import base64
-from io import BytesIO
+from flask import Flask, Response, render_template, jsonify, request
+import hashlib
 import json
+import math
 import os
+import uuid
+from collections import OrderedDict
 import threading
 import time
+import unicodedata
+import urllib.parse
+import urllib.request
 from datetime import datetime
-from fhe_art_engine import FHEArtGenerator
+import random
+from fhe_art_engine import FHEArtGenerator, RANDOMIZED_THEMES, BASE_ART_SIZE, sprite_cache_stats
+from art_cache import ArtCache
+from piece_set import revealed_mask
+from progress_compositor import ProgressCompositor
+from render_farm import RenderFarm
+from generation_queue import GenerationQueue, QueueFull
+import image_encoder
+from image_encoder import IMAGE_FORMATS, image_to_data_uri, negotiate
+from session_backend import create_backend, pack_bitmap, unpack_bitmap
+from session_store import SessionStore
 
 # Flask uygulaması
 app = Flask(__name__)
 app.secret_key = 'fhe-crypto-art-zama-2024'
 
-# Global değişkenler
-art_generators = {}  # Session bazlı art generator'lar
-session_data = {}    # Session verileri
+# Izgara sınırı (satır/sütun başına en fazla parça)
+MAX_GRID = 64
+
+# /api/image uç noktasının sunabildiği biçimler
+FRAME_SIZE = 800
+# ?size= için izin verilen kenar uzunlukları; kompozitör boyut başına tuval tutar
+FRAME_SIZES = (256, 400, 600, 800, 1200, 1600, 2400)
+DOWNLOAD_SIZE = 1200
+ENCODED_FRAMES_PER_SESSION = 8
+# Toplu çözmede bundan fazla parça değiştiyse delta yerine tam kare gönderilir
+MAX_DELTA_TILES = 64
+
+# Otomatik çözme akışı: tik aralığı sınırları (saniye) ve boşta canlı tutma sıklığı
+STREAM_MIN_INTERVAL = 0.2
+STREAM_MAX_INTERVAL = 60.0
+STREAM_HEARTBEAT = 15.0
+
+# Tüm session'ların paylaştığı temel sanat önbelleği
+art_cache = ArtCache(
+    max_bytes=int(os.environ.get('FHE_ART_CACHE_MB', '256')) * 1024 * 1024,
+    disk_dir=os.environ.get('FHE_ART_CACHE_DIR') or None,
+    disk_max_bytes=int(os.environ.get('FHE_ART_CACHE_DISK_MB', '0')) * 1024 * 1024 or None
+)
+
+# Temel sanat çizimi için ısınmış worker süreçleri (0 -> istek iş parçacığında çiz)
+RENDER_WORKERS = int(os.environ.get('FHE_RENDER_WORKERS', '0'))
+render_farm = RenderFarm(RENDER_WORKERS) if RENDER_WORKERS > 0 else None
+
+# Aynı anda çizilen temel sanat sayısı ve sırada bekleyebilecek üretim sayısı;
+# aşılırsa /api/generate_art 429 + Retry-After döner
+generation_queue = GenerationQueue(
+    max_active=int(os.environ.get('FHE_GEN_ACTIVE', '4')),
+    max_waiting=int(os.environ.get('FHE_GEN_QUEUE', '16'))
+)
+
+# Hazır olma protokolü: sunan süreç dinlemeye başlayıp önbellekleri ısıttığında
+# stdout'a bu işaretle başlayan tek satır yazar (demo_launcher bu satırı bekler)
+READY_MARKER = 'FHE_READY'
+PORT = int(os.environ.get('FHE_PORT', '5000'))
+# Açılışta temel sanatı önceden çizilip önbelleğe alınan temalar
+WARMUP_THEMES = ('zama_classic',)
+# Başarısız ısınmada çıkış kodu; launcher süreç kapanınca hatayı gösterir
+WARMUP_FAILED_EXIT = 1
+server_ready = threading.Event()
+warm_up_done = threading.Event()
+warm_up_error = None
+_warm_up_started = threading.Lock()
+
+def warm_up():
+    """Worker'ları başlat ve varsayılan temayı çiz: pyplot, yazı tipleri, önbellek ısınır"""
+    if render_farm is not None:
+        render_farm.start(wait=True)
+    art_gen = FHEArtGenerator(art_cache=art_cache, render_farm=render_farm)
+    for theme in WARMUP_THEMES:
+        art_gen.render_base_art(theme)
+
+def start_warm_up():
+    """Isınmayı bir kez arka planda başlat
+    
+    Başarılıysa server_ready kurulur; başarısızsa hata warm_up_error'da kalır
+    ve /api/ready 503 dönmeye devam eder.
+    """
+    if not _warm_up_started.acquire(blocking=False):
+        return
+    
+    def run():
+        global warm_up_error
+        try:
+            warm_up()
+            server_ready.set()
+        except Exception as e:
+            warm_up_error = str(e) or type(e).__name__
+            print(f"❌ Isınma başarısız: {warm_up_error}")
+        finally:
+            warm_up_done.set()
+    
+    threading.Thread(target=run, name='warm-up', daemon=True).start()
+
+def announce_ready(port, timeout=120):
+    """Isınma bitip /api/ready 200 dönünce hazır satırını yaz"""
+    started = time.monotonic()
+    start_warm_up()
+    warm_up_done.wait(timeout)
+    if warm_up_error is not None:
+        exit_after_failed_warm_up()
+    announce_listening(port, started, timeout)
+
+def exit_after_failed_warm_up():
+    """Hazır satırı yazılmaz; süreç sıfır olmayan kodla kapanır
+    
+    Doğrudan başlatılan sunucu hizmet veremeyecekken açık kalmaz; launcher
+    süreç kapanınca günlüğün sonunu gösterir. os._exit, yeniden yükleyicinin
+    izleyici sürecine de aynı kodu iletir.
+    """
+    print(f"❌ Sunucu ısınamadı, kapanıyor (kod {WARMUP_FAILED_EXIT})", flush=True)
+    os._exit(WARMUP_FAILED_EXIT)
+
+def announce_listening(port, started, timeout=120):
+    """/api/ready 200 dönene kadar yokla, sonra hazır satırını yaz
+    
+    Yoklama sunucunun gerçekten dinlediğini ve istek işlediğini doğrular;
+    ASGI sürümü de aynı satırı bununla yazar.
+    """
+    url = f"http://127.0.0.1:{port}"
+    while time.monotonic() - started < timeout:
+        try:
+            with urllib.request.urlopen(f"{url}/api/ready", timeout=1):
+                break
+        except OSError:
+            # Soket henüz dinlemiyor
+            time.sleep(0.05)
+    else:
+        print(f"❌ Sunucu {timeout} saniyede hazır olmadı")
+        return
+    print(f"{READY_MARKER} http://localhost:{port} {time.monotonic() - started:.2f}s", flush=True)
+
+def generation_key(theme, backend):
+    """Uçuştaki aynı üretimleri birleştirmek için (tema, arka uç, boyut)
+    
+    Rastgele temaların tohumu anahtarda yoktur: tohumu lider çeker, aynı anda
+    gelen istekler onun eserini (ve tohumunu) paylaşır.
+    """
+    return theme, backend, BASE_ART_SIZE
+
+def draw_seed(theme):
+    """Rastgele temalar için yeni tohum; diğer temalarda None"""
+    return random.getrandbits(32) if theme in RANDOMIZED_THEMES else None
+
+def queue_full_response(error):
+    response = jsonify({
+        'success': False,
+        'error': f'Sunucu yoğun, {error.retry_after} saniye sonra tekrar deneyin!',
+        'retry_after': error.retry_after
+    })
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
 
 def get_session_id():
     """Basit session ID oluştur"""
     return request.headers.get('X-Session-ID', 'default-session')
 
-def get_art_generator(session_id):
-    """Session için art generator al/oluştur"""
-    if session_id not in art_generators:
-        art_generators[session_id] = FHEArtGenerator()
-        session_data[session_id] = {
-            'created': datetime.now(),
-            'encrypted_pieces': [],
-            'stats': {'revealed': 0, 'total': 0}
+def new_session(session_id):
+    """Yeni session için art generator ve boş session verisi"""
+    art_gen = FHEArtGenerator(art_cache=art_cache, render_farm=render_farm)
+    data = {
+        'created': datetime.now(),
+        'encrypted_pieces': [],
+        'pieces_bytes': 0,
+        'compositor': ProgressCompositor(art_gen, []),
+        'version': 0,
+        'art_id': uuid.uuid4().hex,
+        'art': None,
+        'encoded_frames': OrderedDict(),
+        'stats': {'revealed': 0, 'total': 0}
+    }
+    return art_gen, data
+
+def session_nbytes(session):
+    """Session'ın tuttuğu parça, tuval ve kodlanmış kare baytları"""
+    data = session.data
+    encoded = sum(len(frame) for frame in data['encoded_frames'].values())
+    return data['pieces_bytes'] + data['compositor'].nbytes() + encoded
+
+def pieces_nbytes(pieces):
+    # Henüz eser yoksa parça listesi boştur
+    return getattr(pieces, 'nbytes', 0)
+
+def session_state(session):
+    """Arka uca yazılan kompakt durum: eser parametreleri + açılma bit haritası"""
+    data = session.data
+    return {
+        'created': data['created'].isoformat(),
+        'art_id': data['art_id'],
+        'art': data['art'],
+        'version': data['version'],
+        'revealed': pack_bitmap(revealed_mask(data['encrypted_pieces'])),
+        'stats': data['stats']
+    }
+
+def restore_session(session, state):
+    """Kompakt durumu canlı session'a uygula; eser değiştiyse parçaları yeniden kur"""
+    data = session.data
+    art_gen = session.generator
+    art = state['art']
+    
+    if data['art_id'] != state['art_id']:
+        pieces = []
+        if art:
+            # Aynı tema/tohum önbellekten, aynı anahtar aynı şifreli parçaları verir
+            art_gen.encryption_key = art['key']
+            art_img = art_gen.render_base_art(art['theme'], seed=art['seed'])
+            pieces = art_gen.encrypt_art_pieces(art_img, tuple(art['grid']))
+        data['encrypted_pieces'] = pieces
+        data['pieces_bytes'] = pieces_nbytes(pieces)
+        data['compositor'] = ProgressCompositor(art_gen, pieces)
+        data['art_id'] = state['art_id']
+        data['art'] = art
+        data['encoded_frames'].clear()
+    
+    pieces = data['encrypted_pieces']
+    if len(pieces):
+        pieces.set_revealed(unpack_bitmap(state['revealed'], len(pieces)))
+    data['created'] = datetime.fromisoformat(state['created'])
+    data['version'] = state['version']
+    data['stats'] = state['stats']
+
+# Session bazlı generator + veri; boşta kalanlar ve bütçeyi aşanlar çıkarılır.
+# FHE_SESSION_BACKEND: memory:// (varsayılan), sqlite:///yol.db, redis://host:6379/0
+SESSION_TTL = int(os.environ.get('FHE_SESSION_TTL', '1800'))
+sessions = SessionStore(
+    new_session,
+    dump=session_state,
+    restore=restore_session,
+    sizeof=session_nbytes,
+    backend=create_backend(os.environ.get('FHE_SESSION_BACKEND'), SESSION_TTL),
+    max_sessions=int(os.environ.get('FHE_MAX_SESSIONS', '200')),
+    ttl=SESSION_TTL,
+    max_bytes=int(os.environ.get('FHE_SESSION_MB', '1024')) * 1024 * 1024
+)
+
+def parse_grid(grid):
+    """4 -> (4, 4), [satır, sütun] -> (satır, sütun); geçersiz ya da sınır dışıysa None"""
+    try:
+        rows, cols = grid if isinstance(grid, list) else (grid, grid)
+        # 2.7 gibi değerler sessizce kırpılmasın
+        if isinstance(rows, (bool, float)) or isinstance(cols, (bool, float)):
+            return None
+        rows, cols = int(rows), int(cols)
+    except (TypeError, ValueError):
+        return None
+    if not (1 <= rows <= MAX_GRID and 1 <= cols <= MAX_GRID):
+        return None
+    return rows, cols
+
+def frame_args_error(fmt, size):
+    """/api/image biçim/boyut parametreleri geçersizse hata yükü
+    
+    fmt, negotiate() sonucudur; None ise istenen biçim desteklenmiyordur.
+    """
+    if fmt not in IMAGE_FORMATS:
+        return {
+            'success': False,
+            'error': f"Desteklenen biçimler: {', '.join(IMAGE_FORMATS)}"
+        }
+    if size not in FRAME_SIZES:
+        return {
+            'success': False,
+            'error': f"Desteklenen boyutlar: {', '.join(map(str, FRAME_SIZES))}"
+        }
+    return None
+
+def store_encoded_frame(session_info, etag, data):
+    encoded_frames = session_info['encoded_frames']
+    encoded_frames[etag] = data
+    while len(encoded_frames) > ENCODED_FRAMES_PER_SESSION:
+        encoded_frames.popitem(last=False)
+
+def install_art(session_id, session, theme, seed, grid, encrypted_pieces, key):
+    """Yeni parça setini session'a yerleştir ve generate_art yanıtını hazırla
+    
+    Session kilidi altında çağrılır.
+    """
+    art_gen = session.generator
+    session_info = session.data
+    rows, cols = grid
+    art_gen.encryption_key = key
+    
+    session_info['encrypted_pieces'] = encrypted_pieces
+    session_info['pieces_bytes'] = pieces_nbytes(encrypted_pieces)
+    session_info['compositor'] = ProgressCompositor(art_gen, encrypted_pieces)
+    session_info['version'] += 1
+    session_info['art_id'] = uuid.uuid4().hex
+    session_info['art'] = {
+        'theme': theme,
+        'seed': seed,
+        'grid': [rows, cols],
+        'key': key
+    }
+    session_info['encoded_frames'].clear()
+    session_info['stats'] = {
+        'revealed': 0,
+        'total': len(encrypted_pieces),
+        'theme': theme,
+        'encryption_key': key,
+        'grid': [rows, cols]
+    }
+    
+    # Tema ismi düzelt
+    theme_display = theme.replace('_', ' ').title()
+    if 'Zama' in theme_display:
+        theme_display = theme_display.replace('Zama', 'Zama')
+    
+    return {
+        'success': True,
+        'message': f'{theme_display} temalı sanat eseri oluşturuldu!',
+        'image_url': image_url(session_id, session_info),
+        'stats': session_info['stats'],
+        'total_pieces': len(encrypted_pieces),
+        'version': session_info['version']
+    }
+
+def download_name(stats, fmt):
+    return f"fhe_art_{stats.get('theme', 'unknown')}_{stats['revealed']}of{stats['total']}.{fmt}"
+
+def content_disposition(filename):
+    """attachment başlığı: ASCII yedek filename + RFC 5987 filename*
+    
+    Tema adı kullanıcıdan gelir. Yedek adda aksanlar atılır, ASCII'ye
+    indirgenemeyen karakterler düşer, tırnak/ters eğik çizgi/kontrol
+    karakterleri '_' olur; asıl ad UTF-8 yüzde kodlamasıyla gider.
+    """
+    ascii_name = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
+    fallback = ''.join(c if ' ' <= c <= '~' and c not in '"\\' else '_' for c in ascii_name)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{urllib.parse.quote(filename, safe='')}"
+
+def image_url(session_id, session):
+    """Session'ın güncel karesi için /api/image adresi"""
+    return f"/api/image/{session_id}/{session['version']}"
+
+def frame_etag(session, version, size, fmt, profile='interactive'):
+    # Aynı (eser, sürüm, boyut, biçim, profil) her zaman aynı baytları üretir -> güçlü ETag
+    raw = f"{session['art_id']}|{version}|{size}|{fmt}|{profile}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+def reveal_batch(session_id, session, selection, mode='full', client_version=None,
+                 encode=image_to_data_uri):
+    """Parçaları tek adımda aç, sürümü bir kez artır ve yanıtı hazırla
+    
+    Session kilidi altında çağrılır; hiçbir parça açılmadıysa None döner.
+    Görüntüler encode(img) ile yanıta konur (ASGI kodlamayı sonra havuzda yapar).
+    """
+    art_gen = session.generator
+    session_info = session.data
+    encrypted_pieces = session_info['encrypted_pieces']
+    stats = session_info['stats']
+    
+    revealed = art_gen.reveal_many(encrypted_pieces, selection)
+    if not len(revealed):
+        return None
+    
+    stats['revealed'] += len(revealed)
+    base_version = session_info['version']
+    session_info['version'] += 1
+    
+    revealed_pieces = [{
+        'id': int(index),
+        'position': encrypted_pieces.position(index)
+    } for index in revealed]
+    
+    response = {
+        'success': True,
+        'message': f"{len(revealed)} parça çözüldü!",
+        'stats': stats,
+        'revealed_piece': revealed_pieces[-1],
+        'revealed_pieces': revealed_pieces,
+        'completed': stats['revealed'] >= stats['total'],
+        'base_version': base_version,
+        'version': session_info['version'],
+        'image_url': image_url(session_id, session_info)
+    }
+    
+    # Kare bir kez güncellenir; az sayıda parça değiştiyse yalnızca onlar gönderilir
+    compositor = session_info['compositor']
+    if (mode == 'delta' and client_version == base_version
+            and len(revealed) <= MAX_DELTA_TILES):
+        response['deltas'] = [{
+            'box': list(box),
+            'size': list(compositor.size),
+            'image': encode(tile_img)
+        } for _, box, tile_img in compositor.render_delta(revealed.tolist())]
+    elif mode in ('url', 'delta'):
+        # Tam kare yalnızca image_url üzerinden alınır
+        pass
+    else:
+        response['image'] = encode(compositor.render())
+    return response
+
+def reveal_piece_payload(session_id, data, encode=image_to_data_uri):
+    """Rastgele bir parça çöz; (yanıt, durum kodu) döndürür"""
+    session = sessions.get(session_id)
+    
+    if session is None:
+        return {
+            'success': False,
+            'error': 'Önce bir sanat eseri oluşturun!'
+        }, 400
+    
+    with session.lock:
+        art_gen = session.generator
+        session_info = session.data
+        encrypted_pieces = session_info['encrypted_pieces']
+        stats = session_info['stats']
+        
+        # Rastgele bir çözülmemiş parça seç (vektörel)
+        piece_index = encrypted_pieces.random_hidden() if len(encrypted_pieces) else None
+        
+        if piece_index is None:
+            return {
+                'success': False,
+                'error': 'Tüm parçalar zaten çözülmüş!',
+                'completed': True
+            }, 200
+        
+        # Parçayı çöz
+        success = art_gen.reveal_piece(encrypted_pieces, piece_index)
+        
+        if not success:
+            return {
+                'success': False,
+                'error': 'Parça çözülemedi!'
+            }, 200
+        
+        stats['revealed'] += 1
+        base_version = session_info['version']
+        session_info['version'] += 1
+        
+        # Parça bilgisi
+        revealed_piece = encrypted_pieces[piece_index]
+        
+        response = {
+            'success': True,
+            'message': f"Parça #{revealed_piece['piece_id']:02d} çözüldü!",
+            'stats': stats,
+            'revealed_piece': {
+                'id': revealed_piece['piece_id'],
+                'position': revealed_piece['position']
+            },
+            'completed': stats['revealed'] >= stats['total'],
+            'version': session_info['version'],
+            'image_url': image_url(session_id, session_info)
         }
-    return art_generators[session_id]
+        
+        # Delta modu: istemcinin karesi bir önceki sürümdeyse yalnızca
+        # değişen parçayı gönder, aksi halde tam kareye düş
+        compositor = session_info['compositor']
+        mode = data.get('mode', 'full')
+        if mode == 'delta' and data.get('version') == base_version:
+            _, box, tile_img = compositor.render_delta([piece_index])[0]
+            response['delta'] = {
+                'box': list(box),
+                'size': list(compositor.size),
+                'image': encode(tile_img)
+            }
+        elif mode in ('url', 'delta'):
+            # Tam kare yalnızca image_url üzerinden alınır
+            pass
+        else:
+            # Güncel görüntü (yalnızca değişen parça yeniden çizilir)
+            response['image'] = encode(compositor.render())
+    
+    sessions.touch(session)
+    return response, 200
+
+def reveal_multiple_payload(session_id, data, encode=image_to_data_uri):
+    """Birden fazla parçayı tek adımda çöz; (yanıt, durum kodu) döndürür"""
+    session = sessions.get(session_id)
+    
+    if session is None:
+        return {
+            'success': False,
+            'error': 'Önce bir sanat eseri oluşturun!'
+        }, 400
+    
+    indices = data.get('indices')
+    # 1.7 gibi değerler sessizce bir parça indeksine kırpılmasın
+    if indices is not None and not (
+            isinstance(indices, list) and
+            all(isinstance(i, int) and not isinstance(i, bool) for i in indices)):
+        return {
+            'success': False,
+            'error': 'indices bir tam sayı listesi olmalı!'
+        }, 400
+    try:
+        count = int(data.get('count', 5))
+    except (TypeError, ValueError):
+        count = 0
+    if indices is None and count < 1:
+        return {
+            'success': False,
+            'error': 'count en az 1 olmalı!'
+        }, 400
+    
+    with session.lock:
+        encrypted_pieces = session.data['encrypted_pieces']
+        if not len(encrypted_pieces) or encrypted_pieces.is_complete:
+            return {
+                'success': False,
+                'error': 'Tüm parçalar zaten çözülmüş!',
+                'completed': True
+            }, 200
+        
+        try:
+            response = reveal_batch(session_id, session,
+                                    indices if indices is not None else count,
+                                    data.get('mode', 'full'), data.get('version'), encode)
+        except (IndexError, ValueError) as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }, 400
+        
+        if response is None:
+            return {
+                'success': False,
+                'error': 'Hiçbir parça çözülemedi!'
+            }, 200
+    
+    sessions.touch(session)
+    return response, 200
+
+def sse_event(event, payload):
+    """Server-Sent Events biçiminde tek olay"""
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
 
 # Templates oluştur (uygulama başlarken)
 def create_templates():
@@ -401,7 +911,7 @@ def create_templates():
                     <p>Sanat eseri oluşturuluyor...</p>
                 </div>
                 <div class="art-display">
-                    <img id="artImage" class="art-image" src="data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNjAwIiBoZWlnaHQ9IjYwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwJSIgaGVpZ2h0PSIxMDAlIiBmaWxsPSIjMmMzZTUwIi8+PHRleHQgeD0iNTAlIiB5PSI1MCUiIGZvbnQtZmFtaWx5PSJBcmlhbCIgZm9udC1zaXplPSIyNCIgZmlsbD0iIzk1YTVhNiIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZHk9Ii4zZW0iPvCfkZMgU2FuYXQgZXNlcmluaXogYnVyYWRhIGfDtnJ1bnTDvGxlbmVjZWs8L3RleHQ+PC9zdmc+" alt="Sanat Eseri">
+                    <canvas id="artCanvas" class="art-image" width="600" height="600" aria-label="Sanat Eseri"></canvas>
                 </div>
                 <div id="themeInfo">
                     <p><strong>Tema:</strong> <span id="currentTheme">Henüz seçilmedi</span></p>
@@ -493,8 +1003,12 @@ def create_templates():
     <script>
         // Global değişkenler
         let selectedTheme = 'zama_classic';
-        let autoRevealInterval = null;
+        let autoRevealStream = null;  // Otomatik çözme için SSE bağlantısı
+        let streamQueue = Promise.resolve();  // Akış olayları sırayla uygulanır
+        const AUTO_REVEAL_INTERVAL = 3;  // saniye
         let sessionId = 'session-' + Date.now();
+        let artVersion = null;  // Tuvalde gösterilen karenin sunucu sürümü
+        const PLACEHOLDER_IMAGE = 'data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNjAwIiBoZWlnaHQ9IjYwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwJSIgaGVpZ2h0PSIxMDAlIiBmaWxsPSIjMmMzZTUwIi8+PHRleHQgeD0iNTAlIiB5PSI1MCUiIGZvbnQtZmFtaWx5PSJBcmlhbCIgZm9udC1zaXplPSIyNCIgZmlsbD0iIzk1YTVhNiIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZHk9Ii4zZW0iPvCfkZMgU2FuYXQgZXNlcmluaXogYnVyYWRhIGfDtnJ1bnTDvGxlbmVjZWs8L3RleHQ+PC9zdmc+';
         
         // API çağrısı yap
         async function apiCall(endpoint, method = 'GET', data = null) {
@@ -556,8 +1070,33 @@ def create_templates():
                 `🔐 ${message}<br><br>Timestamp: ${new Date().toLocaleTimeString()}`;
         }
         
-        function updateArtImage(imageData) {
-            document.getElementById('artImage').src = imageData;
+        function loadImage(src) {
+            return new Promise((resolve, reject) => {
+                const img = new Image();
+                img.onload = () => resolve(img);
+                img.onerror = reject;
+                img.src = src;
+            });
+        }
+        
+        // Tam kareyi tuvale çiz
+        async function updateArtImage(imageData) {
+            const img = await loadImage(imageData);
+            const canvas = document.getElementById('artCanvas');
+            canvas.width = img.naturalWidth || canvas.width;
+            canvas.height = img.naturalHeight || canvas.height;
+            canvas.getContext('2d').drawImage(img, 0, 0, canvas.width, canvas.height);
+        }
+        
+        // Yalnızca değişen parçayı tuvalde yerinde güncelle
+        async function patchArtImage(delta) {
+            const tile = await loadImage(delta.image);
+            const canvas = document.getElementById('artCanvas');
+            const [left, upper, right, lower] = delta.box;
+            const scaleX = canvas.width / delta.size[0];
+            const scaleY = canvas.height / delta.size[1];
+            canvas.getContext('2d').drawImage(tile, left * scaleX, upper * scaleY,
+                                              (right - left) * scaleX, (lower - upper) * scaleY);
         }
         
         function triggerZamaEffects() {
@@ -585,11 +1124,12 @@ def create_templates():
             showLoading(true);
             updateFHEInfo('Yeni sanat eseri oluşturuluyor...');
             
-            const result = await apiCall('generate_art', 'POST', { theme: selectedTheme });
+            const result = await apiCall('generate_art', 'POST', { theme: selectedTheme, mode: 'url' });
             showLoading(false);
             
             if (result.success) {
-                updateArtImage(result.image);
+                await updateArtImage(result.image_url);
+                artVersion = result.version;
                 updateStats(result.stats);
                 if (selectedTheme.startsWith('zama_')) {
                     updateFHEInfo(`🌟 ${result.stats.theme.replace('_', ' ').toUpperCase()} sanat eseri oluşturuldu! Zama FHE şifreleme aktif.`);
@@ -605,10 +1145,15 @@ def create_templates():
         
         async function revealOnePiece() {
             updateFHEInfo('FHE ile parça şifresi çözülüyor...');
-            const result = await apiCall('reveal_piece', 'POST');
+            const result = await apiCall('reveal_piece', 'POST', { mode: 'delta', version: artVersion });
             
             if (result.success) {
-                updateArtImage(result.image);
+                if (result.delta) {
+                    await patchArtImage(result.delta);
+                } else {
+                    await updateArtImage(result.image || result.image_url);
+                }
+                artVersion = result.version;
                 updateStats(result.stats);
                 updateFHEInfo(`Parça #${result.revealed_piece.id} şifresi çözüldü! Pozisyon: (${result.revealed_piece.position[0]}, ${result.revealed_piece.position[1]})`);
                 showMessage(result.message, 'success');
@@ -628,10 +1173,15 @@ def create_templates():
         
         async function revealMultiplePieces() {
             updateFHEInfo('⚡ Toplu FHE işlemi başlatılıyor...');
-            const result = await apiCall('reveal_multiple', 'POST', { count: 5 });
+            const result = await apiCall('reveal_multiple', 'POST', { count: 5, mode: 'delta', version: artVersion });
             
             if (result.success) {
-                updateArtImage(result.image);
+                if (result.deltas) {
+                    for (const delta of result.deltas) await patchArtImage(delta);
+                } else {
+                    await updateArtImage(result.image || result.image_url);
+                }
+                artVersion = result.version;
                 updateStats(result.stats);
                 updateFHEInfo('⚡ Toplu FHE işlemi tamamlandı!');
                 showMessage(result.message, 'success');
@@ -641,20 +1191,61 @@ def create_templates():
             }
         }
         
-        function toggleAutoReveal() {
-            const btn = document.getElementById('autoRevealBtn');
-            if (autoRevealInterval) {
-                clearInterval(autoRevealInterval);
-                autoRevealInterval = null;
-                btn.textContent = '🤖 Otomatik Çözme';
-                btn.classList.remove('active');
-                updateFHEInfo('⏸️ Otomatik FHE çözme durduruldu.');
+        // Akıştan gelen çözme olayını tuvale uygula
+        async function applyStreamReveal(result) {
+            if (result.deltas && result.base_version === artVersion) {
+                for (const delta of result.deltas) await patchArtImage(delta);
             } else {
-                autoRevealInterval = setInterval(revealOnePiece, 3000);
-                btn.textContent = '⏸️ Durdur';
-                btn.classList.add('active');
-                updateFHEInfo('🤖 Otomatik FHE çözme başlatıldı! Her 3 saniyede bir parça...');
+                await updateArtImage(result.image_url);
+            }
+            artVersion = result.version;
+            updateStats(result.stats);
+            updateFHEInfo(`Parça #${result.revealed_piece.id} şifresi çözüldü! Pozisyon: (${result.revealed_piece.position[0]}, ${result.revealed_piece.position[1]})`);
+            if (result.completed) {
+                showMessage('🎉 Tebrikler! Tüm parçaların şifresi çözüldü!', 'success');
+                updateFHEInfo('✅ FHE işlemi tamamlandı! Tüm parçalar çözüldü.');
+            }
+        }
+        
+        function stopAutoReveal(message) {
+            if (autoRevealStream) {
+                autoRevealStream.close();
+                autoRevealStream = null;
+            }
+            const btn = document.getElementById('autoRevealBtn');
+            btn.textContent = '🤖 Otomatik Çözme';
+            btn.classList.remove('active');
+            if (message) updateFHEInfo(message);
+        }
+        
+        function toggleAutoReveal() {
+            if (autoRevealStream) {
+                stopAutoReveal('⏸️ Otomatik FHE çözme durduruldu.');
+                return;
             }
+            
+            // Sunucu parçaları kendi zamanlamasıyla tek bağlantı üzerinden iter
+            const params = new URLSearchParams({ interval: AUTO_REVEAL_INTERVAL });
+            if (artVersion !== null) params.set('version', artVersion);
+            autoRevealStream = new EventSource(`/api/reveal_stream/${encodeURIComponent(sessionId)}?${params}`);
+            autoRevealStream.addEventListener('reveal', event => {
+                const result = JSON.parse(event.data);
+                streamQueue = streamQueue.then(() => applyStreamReveal(result));
+            });
+            autoRevealStream.addEventListener('end', () => {
+                streamQueue = streamQueue.then(() => stopAutoReveal());
+            });
+            autoRevealStream.onerror = () => {
+                // 404 vb. durumlarda tarayıcı yeniden bağlanmaz
+                if (autoRevealStream && autoRevealStream.readyState === EventSource.CLOSED) {
+                    stopAutoReveal('⚠️ Otomatik çözme bağlantısı kapandı. Önce bir sanat eseri oluşturun.');
+                }
+            };
+            
+            const btn = document.getElementById('autoRevealBtn');
+            btn.textContent = '⏸️ Durdur';
+            btn.classList.add('active');
+            updateFHEInfo(`🤖 Otomatik FHE çözme başlatıldı! Her ${AUTO_REVEAL_INTERVAL} saniyede bir parça...`);
         }
         
         async function downloadArt() {
@@ -684,15 +1275,12 @@ def create_templates():
         
         async function resetSession() {
             if (confirm('🔄 Session sıfırlanacak ve tüm veriler silinecek. Emin misiniz?')) {
-                if (autoRevealInterval) {
-                    clearInterval(autoRevealInterval);
-                    autoRevealInterval = null;
-                    document.getElementById('autoRevealBtn').textContent = '🤖 Otomatik Çözme';
-                }
+                stopAutoReveal();
                 
                 const result = await apiCall('reset_session', 'POST');
                 if (result.success) {
-                    updateArtImage('data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iNjAwIiBoZWlnaHQ9IjYwMCIgeG1sbnM9Imh0dHA6Ly93d3cudzMub3JnLzIwMDAvc3ZnIj48cmVjdCB3aWR0aD0iMTAwJSIgaGVpZ2h0PSIxMDAlIiBmaWxsPSIjMmMzZTUwIi8+PHRleHQgeD0iNTAlIiB5PSI1MCUiIGZvbnQtZmFtaWx5PSJBcmlhbCIgZm9udC1zaXplPSIyNCIgZmlsbD0iIzk1YTVhNiIgdGV4dC1hbmNob3I9Im1pZGRsZSIgZHk9Ii4zZW0iPvCfkZMgU2FuYXQgZXNlcmluaXogYnVyYWRhIGfDtnJ1bnTDvGxlbmVjZWs8L3RleHQ+PC9zdmc+');
+                    await updateArtImage(PLACEHOLDER_IMAGE);
+                    artVersion = null;
                     updateStats({ total: 0, revealed: 0, encryption_key: '-' });
                     updateFHEInfo('🔄 Session sıfırlandı. Yeni sanat eseri oluşturabilirsiniz.');
                     document.getElementById('currentTheme').textContent = 'Henüz seçilmedi';
@@ -736,6 +1324,9 @@ def create_templates():
             document.getElementById('downloadBtn').addEventListener('click', downloadArt);
             document.getElementById('resetBtn').addEventListener('click', resetSession);
             
+            // Başlangıç görseli
+            updateArtImage(PLACEHOLDER_IMAGE);
+            
             // Başlangıç mesajı
             updateFHEInfo('Zama FHE teknolojisi hazır! Bir tema seçip sanat eserinizi oluşturun.');
         });
@@ -757,48 +1348,58 @@ def generate_art():
     """Yeni sanat eseri oluştur"""
     try:
         session_id = get_session_id()
-        art_gen = get_art_generator(session_id)
+        session = sessions.get_or_create(session_id)
         
         data = request.get_json()
         theme = data.get('theme', 'zama_classic')
         
-        # Sanat oluştur
-        art_gen.reset_encryption()
-        art_path = art_gen.generate_base_art(theme)
-        
-        # Parçalara ayır
-        encrypted_pieces = art_gen.encrypt_art_pieces(art_path)
-        
-        # Session data güncelle
-        session_data[session_id]['encrypted_pieces'] = encrypted_pieces
-        session_data[session_id]['stats'] = {
-            'revealed': 0,
-            'total': len(encrypted_pieces),
-            'theme': theme,
-            'encryption_key': art_gen.encryption_key
-        }
+        # Izgara: 4 -> 4x4, [satır, sütun] -> satır x sütun
+        grid = parse_grid(data.get('grid', 4))
+        if grid is None:
+            return jsonify({
+                'success': False,
+                'error': f'Izgara 1-{MAX_GRID} aralığında olmalı!'
+            }), 400
         
-        # İlk progress görüntüsü
-        progress_img = art_gen.generate_progress_image(encrypted_pieces)
+        # Sanat oluştur; rastgele temalar için tohum saklanır ki başka bir
+        # worker aynı eseri yeniden kurabilsin. Aynı eserin uçuştaki çizimi
+        # paylaşılır, session kilidi çizim süresince tutulmaz.
+        art_gen = session.generator
         
-        # Base64'e çevir
-        img_buffer = BytesIO()
-        progress_img.save(img_buffer, format='PNG')
-        img_data = base64.b64encode(img_buffer.getvalue()).decode()
+        def render():
+            seed = draw_seed(theme)
+            return art_gen.render_base_art(theme, seed=seed), seed
         
-        # Tema ismi düzelt
-        theme_display = theme.replace('_', ' ').title()
-        if 'Zama' in theme_display:
-            theme_display = theme_display.replace('Zama', 'Zama')
+        art_img, seed = generation_queue.run(generation_key(theme, art_gen.render_backend),
+                                             render)
         
-        return jsonify({
-            'success': True,
-            'message': f'{theme_display} temalı sanat eseri oluşturuldu!',
-            'image': f"data:image/png;base64,{img_data}",
-            'stats': session_data[session_id]['stats'],
-            'total_pieces': len(encrypted_pieces)
+        with session.lock:
+            art_gen.reset_encryption()
+            
+            # Parçalara ayır (disk üzerinden geçmeden)
+            encrypted_pieces = art_gen.encrypt_art_pieces(art_img, grid)
+            
+            response = install_art(session_id, session, theme, seed, grid,
+                                   encrypted_pieces, art_gen.encryption_key)
+            
+            # mode='url' istemcileri görüntüyü /api/image üzerinden ham bayt olarak alır
+            if data.get('mode') != 'url':
+                progress_img = session.data['compositor'].render()
+                response['image'] = image_to_data_uri(progress_img)
+        
+        sessions.touch(session)
+        return jsonify(response)
+        
+    except QueueFull as e:
+        return queue_full_response(e)
+    except TimeoutError as e:
+        # Render farm çizimi zamanında bitiremedi; kuyruk yuvası bırakıldı
+        response = jsonify({
+            'success': False,
+            'error': str(e)
         })
-        
+        response.headers['Retry-After'] = '5'
+        return response, 503
     except Exception as e:
         return jsonify({
             'success': False,
@@ -809,59 +1410,9 @@ def generate_art():
 def reveal_piece():
     """Rastgele bir parça çöz"""
     try:
-        session_id = get_session_id()
-        
-        if session_id not in session_data:
-            return jsonify({
-                'success': False,
-                'error': 'Önce bir sanat eseri oluşturun!'
-            }), 400
-        
-        art_gen = art_generators[session_id]
-        encrypted_pieces = session_data[session_id]['encrypted_pieces']
-        stats = session_data[session_id]['stats']
-        
-        # Çözülmemiş parça bul
-        hidden_pieces = [i for i, p in enumerate(encrypted_pieces) 
-                        if not p['is_revealed']]
-        
-        if not hidden_pieces:
-            return jsonify({
-                'success': False,
-                'error': 'Tüm parçalar zaten çözülmüş!',
-                'completed': True
-            })
-        
-        # Rastgele parça seç ve çöz
-        import random
-        piece_index = random.choice(hidden_pieces)
-        success = art_gen.reveal_piece(encrypted_pieces, piece_index)
-        
-        if success:
-            stats['revealed'] += 1
-            
-            # Güncel görüntü oluştur
-            progress_img = art_gen.generate_progress_image(encrypted_pieces)
-            
-            # Base64'e çevir
-            img_buffer = BytesIO()
-            progress_img.save(img_buffer, format='PNG')
-            img_data = base64.b64encode(img_buffer.getvalue()).decode()
-            
-            # Parça bilgisi
-            revealed_piece = encrypted_pieces[piece_index]
-            
-            return jsonify({
-                'success': True,
-                'message': f"Parça #{revealed_piece['piece_id']:02d} çözüldü!",
-                'image': f"data:image/png;base64,{img_data}",
-                'stats': stats,
-                'revealed_piece': {
-                    'id': revealed_piece['piece_id'],
-                    'position': revealed_piece['position']
-                },
-                'completed': stats['revealed'] >= stats['total']
-            })
+        payload, status = reveal_piece_payload(get_session_id(),
+                                               request.get_json(silent=True) or {})
+        return jsonify(payload), status
         
     except Exception as e:
         return jsonify({
@@ -869,34 +1420,65 @@ def reveal_piece():
             'error': str(e)
         }), 500
 
+@app.route('/api/image/<session_id>/<int:version>', methods=['GET'])
+def get_image(session_id, version):
+    """Kareyi ham PNG/WebP baytları olarak sun (güçlü ETag + 304)"""
+    session = sessions.get(session_id)
+    if session is None:
+        return jsonify({
+            'success': False,
+            'error': 'Aktif session bulunamadı!'
+        }), 404
+    
+    # ?format= yoksa biçim Accept başlığından seçilir
+    fmt = negotiate(request.headers.get('Accept'), request.args.get('format'))
+    size = request.args.get('size', FRAME_SIZE, type=int)
+    error = frame_args_error(fmt, size)
+    if error:
+        return jsonify(error), 400 if fmt or 'format' in request.args else 406
+    
+    with session.lock:
+        session_info = session.data
+        etag = frame_etag(session_info, version, size, fmt)
+        
+        # İstemcideki kopya güncelse hiç çizmeden/kodlamadan 304 dön
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            data = session_info['encoded_frames'].get(etag)
+            if data is None:
+                if version != session_info['version']:
+                    return jsonify({
+                        'success': False,
+                        'error': 'Bu sürüm artık mevcut değil!',
+                        'image_url': image_url(session_id, session_info)
+                    }), 404
+                started = time.perf_counter()
+                data = image_encoder.encode(session_info['compositor'].render((size, size)),
+                                            fmt, 'interactive')
+                store_encoded_frame(session_info, etag, data)
+                frame_ms = (time.perf_counter() - started) * 1000
+            else:
+                frame_ms = None
+            response = Response(data, mimetype=IMAGE_FORMATS[fmt])
+            if frame_ms is not None:
+                # Kare çizim + kodlama süresi tarayıcı geliştirici araçlarında görünür
+                response.headers['Server-Timing'] = f'frame;dur={frame_ms:.1f}'
+    
+    sessions.touch(session)
+    response.set_etag(etag)
+    response.vary.add('Accept')
+    # Tarayıcı saklayabilir ama her kullanımda doğrulamalı (reset sonrası aynı URL)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
 @app.route('/api/reveal_multiple', methods=['POST'])
 def reveal_multiple():
-    """Birden fazla parça çöz"""
+    """Birden fazla parçayı tek adımda çöz ve tek kare çiz"""
     try:
-        session_id = get_session_id()
-        data = request.get_json()
-        count = min(data.get('count', 5), 10)
-        
-        results = []
-        for i in range(count):
-            result = reveal_piece()
-            if result[1] == 200:
-                result_data = json.loads(result[0].data)
-                if not result_data['success']:
-                    break
-                results.append(result_data)
-            else:
-                break
-        
-        if results:
-            final_result = results[-1]
-            final_result['message'] = f"{len(results)} parça çözüldü!"
-            return jsonify(final_result)
-        else:
-            return jsonify({
-                'success': False,
-                'error': 'Hiçbir parça çözülemedi!'
-            })
+        payload, status = reveal_multiple_payload(get_session_id(),
+                                                  request.get_json(silent=True) or {})
+        return jsonify(payload), status
             
     except Exception as e:
         return jsonify({
@@ -904,19 +1486,81 @@ def reveal_multiple():
             'error': str(e)
         }), 500
 
+@app.route('/api/reveal_stream/<session_id>', methods=['GET'])
+def reveal_stream(session_id):
+    """Otomatik çözme: parça deltalarını sunucu zamanlamasıyla SSE üzerinden it"""
+    if sessions.get(session_id) is None:
+        return jsonify({
+            'success': False,
+            'error': 'Aktif session bulunamadı!'
+        }), 404
+    
+    interval = request.args.get('interval', 3.0, type=float)
+    # nan sınırlamadan geçer (karşılaştırmalar False döner)
+    if not math.isfinite(interval):
+        return jsonify({
+            'success': False,
+            'error': 'Geçersiz akış parametresi!'
+        }), 400
+    interval = min(max(interval, STREAM_MIN_INTERVAL), STREAM_MAX_INTERVAL)
+    batch = min(max(request.args.get('batch', 1, type=int), 1), MAX_DELTA_TILES)
+    client_version = request.args.get('version', type=int)
+    
+    def stream():
+        version = client_version
+        yield f"retry: {int(interval * 1000)}\n\n"
+        
+        while True:
+            # Geri basınç: bir sonraki tik ancak önceki olay istemciye yazıldıktan
+            # (yield döndükten) sonra planlanır; yavaş istemci için kaçan tikler
+            # biriktirilmez
+            next_tick = time.monotonic() + interval
+            while (wait := next_tick - time.monotonic()) > 0:
+                time.sleep(min(wait, STREAM_HEARTBEAT))
+                if next_tick > time.monotonic():
+                    yield ": keep-alive\n\n"
+            
+            session = sessions.get(session_id)
+            if session is None:
+                yield sse_event('end', {'reason': 'session_closed'})
+                return
+            with session.lock:
+                encrypted_pieces = session.data['encrypted_pieces']
+                if len(encrypted_pieces) and not encrypted_pieces.is_complete:
+                    response = reveal_batch(session_id, session, batch, 'delta', version)
+                else:
+                    response = None
+            if response is None:
+                yield sse_event('end', {'reason': 'completed'})
+                return
+            
+            sessions.touch(session)
+            version = response['version']
+            yield sse_event('reveal', response)
+            if response['completed']:
+                yield sse_event('end', {'reason': 'completed'})
+                return
+    
+    return Response(stream(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @app.route('/api/get_stats', methods=['GET'])
 def get_stats():
     """Mevcut istatistikleri al"""
     try:
         session_id = get_session_id()
+        session = sessions.get(session_id)
         
-        if session_id not in session_data:
+        if session is None:
             return jsonify({
                 'success': False,
                 'error': 'Aktif session bulunamadı!'
             })
         
-        stats = session_data[session_id]['stats']
+        with session.lock:
+            stats = dict(session.data['stats'])
         return jsonify({
             'success': True,
             'stats': stats
@@ -928,38 +1572,94 @@ def get_stats():
             'error': str(e)
         }), 500
 
+@app.route('/api/ready', methods=['GET'])
+def ready():
+    """Hazır olma yoklaması; ısınma bitene kadar 503 + Retry-After
+    
+    Isınma başarısız olduysa 503 hatayla birlikte kalıcı olarak döner.
+    """
+    if warm_up_error is not None:
+        return jsonify({'success': False, 'ready': False, 'error': warm_up_error}), 503
+    if not server_ready.is_set():
+        # gunicorn gibi __main__ dışı sunucularda ısınma ilk yoklamayla başlar
+        start_warm_up()
+        response = jsonify({'success': False, 'ready': False})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    return jsonify({'success': True, 'ready': True})
+
+@app.route('/api/cache_stats', methods=['GET'])
+def cache_stats():
+    """Sanat önbelleği isabet/ıska sayaçları"""
+    return jsonify({
+        'success': True,
+        'cache': art_cache.stats(),
+        'render_farm': render_farm.stats() if render_farm else None,
+        'generation': generation_queue.stats(),
+        'sprites': sprite_cache_stats()
+    })
+
+@app.route('/api/encoder_stats', methods=['GET'])
+def encoder_stats():
+    """Profil/biçim başına kodlama süresi ve çıktı boyutu"""
+    return jsonify({
+        'success': True,
+        'encoders': image_encoder.stats()
+    })
+
+@app.route('/api/session_stats', methods=['GET'])
+def session_stats():
+    """Canlı session sayısı, tutulan bayt ve tahliye sayaçları"""
+    return jsonify({
+        'success': True,
+        'sessions': sessions.stats()
+    })
+
 @app.route('/api/download_art', methods=['GET'])
 def download_art():
     """Sanat eserini indir"""
     try:
         session_id = get_session_id()
+        session = sessions.get(session_id)
         
-        if session_id not in session_data:
+        if session is None:
             return jsonify({
                 'success': False,
                 'error': 'Aktif session bulunamadı!'
             }), 400
         
-        art_gen = art_generators[session_id]
-        encrypted_pieces = session_data[session_id]['encrypted_pieces']
-        stats = session_data[session_id]['stats']
-        
-        # Yüksek çözünürlüklü görüntü oluştur
-        progress_img = art_gen.generate_progress_image(encrypted_pieces, (1200, 1200))
-        
-        # Temporary file oluştur
-        temp_filename = f"fhe_art_{stats.get('theme', 'unknown')}_{stats['revealed']}of{stats['total']}.png"
-        temp_path = os.path.join('temp', temp_filename)
-        
-        # Temp klasörü oluştur
-        os.makedirs('temp', exist_ok=True)
-        
-        progress_img.save(temp_path)
-        
-        return send_file(temp_path, 
-                        as_attachment=True, 
-                        download_name=temp_filename,
-                        mimetype='image/png')
+        fmt = negotiate(request.headers.get('Accept'), request.args.get('format'))
+        size = request.args.get('size', DOWNLOAD_SIZE, type=int)
+        error = frame_args_error(fmt, size)
+        if error:
+            return jsonify(error), 400 if fmt or 'format' in request.args else 406
+        
+        # Dosya sistemi kullanılmaz: kodlanmış baytlar (sürüm, boyut, biçim)
+        # başına session'da saklanır, aynı ilerlemenin tekrar indirilmesi kodlamaz
+        with session.lock:
+            session_info = session.data
+            stats = dict(session_info['stats'])
+            etag = frame_etag(session_info, session_info['version'], size, fmt, 'download')
+            if request.if_none_match.contains(etag):
+                data = None
+            else:
+                data = session_info['encoded_frames'].get(etag)
+                if data is None:
+                    # İndirmeler hız yerine boyut için kodlanır
+                    data = image_encoder.encode(session_info['compositor'].render((size, size)),
+                                                fmt, 'download')
+                    store_encoded_frame(session_info, etag, data)
+        sessions.touch(session)
+        
+        if data is None:
+            response = Response(status=304)
+        else:
+            response = Response(data, mimetype=IMAGE_FORMATS[fmt])
+        response.set_etag(etag)
+        response.vary.add('Accept')
+        response.headers['Cache-Control'] = 'private, no-cache'
+        response.headers['Content-Disposition'] = content_disposition(download_name(stats, fmt))
+        return response
         
     except Exception as e:
         return jsonify({
@@ -973,10 +1673,7 @@ def reset_session():
     try:
         session_id = get_session_id()
         
-        if session_id in art_generators:
-            del art_generators[session_id]
-        if session_id in session_data:
-            del session_data[session_id]
+        sessions.remove(session_id)
         
         return jsonify({
             'success': True,
@@ -989,30 +1686,22 @@ def reset_session():
             'error': str(e)
         }), 500
 
-# Cleanup fonksiyonu
-def cleanup_temp_files():
-    """Geçici dosyaları temizle"""
-    import glob
-    temp_files = glob.glob('temp/*.png') + glob.glob('*.png')
-    for file in temp_files:
-        try:
-            if os.path.exists(file) and file != 'icon.png':
-                os.remove(file)
-        except:
-            pass
-
 # Uygulama başlatma
 if __name__ == '__main__':
-    import atexit
-    atexit.register(cleanup_temp_files)
-    
     # Templates oluştur
     create_templates()
     
     print("🎨 FHE Sanat Web Uygulaması Başlatılıyor...")
-    print("📱 Tarayıcınızda http://localhost:5000 adresini açın")
+    print(f"📱 Tarayıcınızda http://localhost:{PORT} adresini açın")
     print("🔐 Zama Creator Program | FHE Şifreli Sanat Galerisi")
     print("🌟 Varsayılan tema: Zama Classic")
     
+    if render_farm is not None:
+        print(f"⚙️ Temel sanat {render_farm.workers} worker sürecinde çizilecek")
+    
+    # Yeniden yükleyicinin izleyici süreci ısınmaz; sunan süreç ısınıp hazır satırını yazar
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        threading.Thread(target=announce_ready, args=(PORT,), daemon=True).start()
+    
     # Debug modda çalıştır
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=True, host='0.0.0.0', port=PORT)
\ No newline at end of file